@@ -0,0 +1,51 @@
+import { fetchBundles, getRouteBundleUrls, matchRoute, pickRouteMessages } from '@/lib/i18n-bundles'
+
+jest.mock('@/lib/generated/i18n-bundles.json', () => ({
+  version: 1,
+  bundles: {
+    zh: {
+      Navigation: '/i18n/zh/Navigation.aaaa.json',
+      PricingPage: '/i18n/zh/PricingPage.bbbb.json',
+      TextTranslatePage: '/i18n/zh/TextTranslatePage.cccc.json',
+    },
+  },
+  routes: {
+    '/[locale]': ['Navigation'],
+    '/[locale]/pricing': ['Navigation', 'PricingPage'],
+    '/[locale]/[direction]': ['Navigation', 'TextTranslatePage'],
+  },
+}))
+
+describe('i18n bundles', () => {
+  it('matches request paths to manifest routes, static segments first', () => {
+    expect(matchRoute('/zh')).toBe('/[locale]')
+    expect(matchRoute('/zh/pricing')).toBe('/[locale]/pricing')
+    expect(matchRoute('/zh/lao-to-english')).toBe('/[locale]/[direction]')
+    expect(matchRoute('/zh/pricing/extra')).toBeNull()
+  })
+
+  it('returns only the bundles that are not loaded yet', () => {
+    expect(getRouteBundleUrls('zh', '/[locale]/pricing')).toEqual([
+      '/i18n/zh/Navigation.aaaa.json',
+      '/i18n/zh/PricingPage.bbbb.json',
+    ])
+    expect(getRouteBundleUrls('zh', '/[locale]/pricing', ['Navigation'])).toEqual(['/i18n/zh/PricingPage.bbbb.json'])
+  })
+
+  it('picks the route namespaces from the full catalog', () => {
+    const messages = { Navigation: { home: '首页' }, PricingPage: { title: '价格' }, Admin: { title: '管理' } }
+    expect(pickRouteMessages(messages, '/[locale]')).toEqual({ Navigation: { home: '首页' } })
+    expect(pickRouteMessages(messages, '/[locale]/unknown')).toBe(messages)
+  })
+
+  it('merges fetched bundles', async () => {
+    global.fetch = jest.fn(async (url: string) => ({
+      ok: true,
+      json: async () => ({ [url.split('/')[3].split('.')[0]]: { loaded: true } }),
+    })) as unknown as typeof fetch
+    await expect(fetchBundles(['/i18n/zh/Navigation.aaaa.json', '/i18n/zh/PricingPage.bbbb.json'])).resolves.toEqual({
+      Navigation: { loaded: true },
+      PricingPage: { loaded: true },
+    })
+  })
+})
@@ -1,13 +1,15 @@
 import '@/lib/regenerator-polyfill'
 import type { Metadata } from 'next'
-import { NextIntlClientProvider, createTranslator } from 'next-intl';
+import { createTranslator } from 'next-intl';
 import { getMessages } from 'next-intl/server';
 import { Providers } from '../providers';
 import { Navigation, Footer } from '@/components/navigation';
 import { Toaster } from '@/components/ui/toaster';
 // import { UserOnboarding } from '@/components/onboarding/user-onboarding'; // Temporarily disabled
 import { FloatingFeedback } from '@/components/feedback/feedback-widget-multilingual';
-import { locales, type Locale } from '@/lib/navigation';
+import { RouteMessagesProvider } from '@/components/i18n/route-messages-provider';
+import { matchRoute, pickRouteMessages } from '@/lib/i18n-bundles';
+import { locales, PATHNAME_HEADER, type Locale } from '@/lib/navigation';
 import { headers } from 'next/headers';
 
 // Generate metadata with proper hreflang and canonical URLs
@@ -70,11 +72,14 @@ export default async function LocaleLayout({
   console.log(`[Layout] Rendering for locale: ${locale}`);
 
   const messages = await getMessages({ locale });
+  // 只下发当前路由用到的命名空间；识别不出路由时下发整份消息
+  const route = matchRoute(headers().get(PATHNAME_HEADER) ?? '');
+  const routeMessages = route ? pickRouteMessages(messages, route) : messages;
 
   return (
     <html lang={locale}>
       <body>
-        <NextIntlClientProvider locale={locale} messages={messages}>
+        <RouteMessagesProvider locale={locale} messages={routeMessages}>
           <Providers>
             <div className="relative flex min-h-screen flex-col">
               <Navigation />
@@ -85,7 +90,7 @@ export default async function LocaleLayout({
             {/* <UserOnboarding /> */} {/* Temporarily disabled - users go directly to homepage after signup */}
             <FloatingFeedback />
           </Providers>
-        </NextIntlClientProvider>
+        </RouteMessagesProvider>
       </body>
     </html>
   )
@@ -18,6 +18,10 @@ export default function robots(): MetadataRoute.Robots {
         ],
       },
     ],
-    sitemap: 'https://loretrans.com/sitemap.xml',
+    sitemap: [
+      'https://loretrans.com/sitemap.xml',
+      // 翻译页面 sitemap 由 update_all_translation_pages.py 生成（分片 + hreflang）
+      'https://loretrans.com/sitemaps/translation-pages.xml',
+    ],
   }
 }
\ No newline at end of file
@@ -70,76 +70,8 @@ export default function sitemap(): MetadataRoute.Sitemap {
     })
   })
   
-  // 翻译页面（主要语言）
-  const translationPages: MetadataRoute.Sitemap = []
-  
-  // 所有翻译页面列表
-  const allTranslationPages = [
-    'amharic-to-english',
-    'arabic-to-english',
-    'burmese-to-english',
-    'chinese-to-english',
-    'creole-to-english',
-    'english-to-amharic',
-    'english-to-arabic',
-    'english-to-burmese',
-    'english-to-chinese',
-    'english-to-creole',
-    'english-to-french',
-    'english-to-hausa',
-    'english-to-hindi',
-    'english-to-igbo',
-    'english-to-khmer',
-    'english-to-kyrgyz',
-    'english-to-lao',
-    'english-to-malagasy',
-    'english-to-mongolian',
-    'english-to-nepali',
-    'english-to-pashto',
-    'english-to-portuguese',
-    'english-to-sindhi',
-    'english-to-sinhala',
-    'english-to-spanish',
-    'english-to-swahili',
-    'english-to-tajik',
-    'english-to-telugu',
-    'english-to-xhosa',
-    'english-to-yoruba',
-    'english-to-zulu',
-    'french-to-english',
-    'hausa-to-english',
-    'hindi-to-english',
-    'igbo-to-english',
-    'khmer-to-english',
-    'kyrgyz-to-english',
-    'lao-to-english',
-    'malagasy-to-english',
-    'mongolian-to-english',
-    'nepali-to-english',
-    'pashto-to-english',
-    'portuguese-to-english',
-    'sindhi-to-english',
-    'sinhala-to-english',
-    'spanish-to-english',
-    'swahili-to-english',
-    'tajik-to-english',
-    'telugu-to-english',
-    'xhosa-to-english',
-    'yoruba-to-english',
-    'zulu-to-english',
-  ]
-  
-  // 为主要语言添加翻译页面
-  majorLanguages.forEach(locale => {
-    allTranslationPages.forEach(page => {
-      translationPages.push({
-        url: `${baseUrl}/${locale}/${page}`,
-        lastModified,
-        changeFrequency: 'weekly',
-        priority: locale === 'en' ? 0.8 : 0.7, // 英语优先级稍高
-      })
-    })
-  })
+  // 翻译页面（<source>-to-<target>）不在这里列出：
+  // update_all_translation_pages.py 按 language_map 生成 public/sitemaps/ 下的分片 sitemap（含 hreflang）
   
   // 功能页面（主要语言）
   const functionalPages: MetadataRoute.Sitemap = []
@@ -166,7 +98,6 @@ export default function sitemap(): MetadataRoute.Sitemap {
   return [
     ...basePages,
     ...localePages,
-    ...translationPages,
     ...functionalPages,
   ]
 }
\ No newline at end of file
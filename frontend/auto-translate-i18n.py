@@ -5,11 +5,19 @@
 使用我们自己的 Hugging Face Space API 来翻译所有未翻译的界面文案
 """
 
-import json
+import argparse
+import asyncio
 import os
-import time
-import requests
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+from i18n_tools.cache import TranslationCache, translate_with_cache
+from i18n_tools.catalog import Catalog, CatalogStore
+from i18n_tools.consistency import check_catalogs
+from i18n_tools.http_client import AsyncTranslationClient, TranslationRequestError
+from i18n_tools.journal import CheckpointedLanguageFile, journal_path, replay_journal
+from i18n_tools.local_backend import LocalNLLBBackend
+from i18n_tools.packing import pack_texts, translate_in_batches, unpack_texts
+from i18n_tools.plan import PlanProgress, TranslationPlan
 
 # 语言映射配置
 LANGUAGE_MAPPING = {
@@ -26,19 +34,34 @@ LANGUAGE_MAPPING = {
     'te': 'tel_Telu',  # 泰卢固语
 }
 
-# Hugging Face Space API 配置
-HF_SPACE_URL = "https://wane0528-my-nllb-api.hf.space/api/v4/translator"
+# Hugging Face Space API 配置（HF_SPACE_URL 可指向 i18n_tools.stub_server 等替身服务）
+HF_SPACE_URL = os.getenv("HF_SPACE_URL", "https://wane0528-my-nllb-api.hf.space/api/v4/translator")
 SOURCE_LANG = "eng_Latn"  # 英语
 
 class TranslationService:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Content-Type': 'application/json',
-            'User-Agent': 'Transly-AutoTranslate/1.0'
-        })
+    def __init__(self, max_concurrency: int = 4, rate: float = 2.0, max_retries: int = 3,
+                 batch_chars: int = 800, batch_size: int = 16, cache: Optional[TranslationCache] = None,
+                 local_backend: Optional[LocalNLLBBackend] = None):
+        # 本地进程内 NLLB 后端，设置后不再请求 Space 接口
+        self.local_backend = local_backend
+        # 跨运行的本地翻译缓存，None 表示不使用
+        self.cache = cache
+        # 打包预算：每次请求最多的字符数和文本条数
+        self.batch_chars = batch_chars
+        self.batch_size = batch_size
+        # 异步客户端：并发上限 + 令牌桶限速，遇到 429/5xx 自动降低并发
+        self.client = AsyncTranslationClient(
+            HF_SPACE_URL,
+            headers={
+                'Content-Type': 'application/json',
+                'User-Agent': 'Transly-AutoTranslate/1.0'
+            },
+            max_concurrency=max_concurrency,
+            rate=rate,
+            max_retries=max_retries
+        )
     
-    def translate_text(self, text: str, target_lang: str, max_retries: int = 3) -> str:
+    async def translate_text(self, text: str, target_lang: str) -> str:
         """翻译单个文本"""
         if not text or not text.strip():
             return text
@@ -49,44 +72,97 @@ class TranslationService:
             "target": target_lang
         }
         
-        for attempt in range(max_retries):
-            try:
-                print(f"  翻译: {text[:50]}{'...' if len(text) > 50 else ''}")
-                response = self.session.post(HF_SPACE_URL, json=payload, timeout=30)
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    if 'result' in result:
-                        translated = result['result'].strip()
-                        print(f"  结果: {translated[:50]}{'...' if len(translated) > 50 else ''}")
-                        return translated
-                    else:
-                        print(f"  ⚠️ API响应格式异常: {result}")
-                else:
-                    print(f"  ❌ API错误 {response.status_code}: {response.text}")
-                    
-            except requests.exceptions.RequestException as e:
-                print(f"  ❌ 网络错误 (尝试 {attempt + 1}/{max_retries}): {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)  # 指数退避
+        try:
+            print(f"  翻译: {text[:50]}{'...' if len(text) > 50 else ''}")
+            result = await self.client.post_json(payload)
+            if 'result' in result:
+                translated = result['result'].strip()
+                print(f"  结果: {translated[:50]}{'...' if len(translated) > 50 else ''}")
+                return translated
+            else:
+                print(f"  ⚠️ API响应格式异常: {result}")
+        except TranslationRequestError as e:
+            print(f"  ❌ {e}")
                     
         print(f"  ❌ 翻译失败，保持原文: {text}")
         return text
     
-    def translate_batch(self, texts: List[str], target_lang: str) -> List[str]:
-        """批量翻译文本"""
-        results = []
-        for i, text in enumerate(texts):
-            print(f"  进度: {i + 1}/{len(texts)}")
-            translated = self.translate_text(text, target_lang)
-            results.append(translated)
-            # 避免API限流
-            time.sleep(0.5)
+    async def _translate_packed(self, texts: List[str], target_lang: str) -> Optional[List[str]]:
+        """一次请求翻译多条文本：Space 接口没有批量端点，用编号标记打包后拆包"""
+        payload = {
+            "text": texts[0] if len(texts) == 1 else pack_texts(texts),
+            "source": SOURCE_LANG,
+            "target": target_lang
+        }
+        result = await self.client.post_json(payload)
+        if not isinstance(result, dict) or 'result' not in result:
+            print(f"  ⚠️ API响应格式异常: {result}")
+            return None
+        if len(texts) == 1:
+            return [result['result'].strip()]
+        
+        parts = unpack_texts(result['result'], len(texts))
+        if parts is None:
+            print(f"  ⚠️ 打包结果数量不一致，拆分重试 ({len(texts)} 条)")
+        return parts
+    
+    async def translate_batch(self, texts: List[str], target_lang: str,
+                              on_progress: Optional[Callable[[int], None]] = None,
+                              on_translated: Optional[Callable[[str, str], None]] = None) -> List[str]:
+        """
+        打包并发翻译文本，结果顺序与输入一致，失败的保持原文
+        on_translated 在每条网络/模型译文完成时立即回调 (原文, 译文)
+        """
+        pending = [i for i, text in enumerate(texts) if text and text.strip()]
+        reported = 0
+        
+        def progress(count: int) -> None:
+            nonlocal reported
+            reported += count
+            if on_progress:
+                on_progress(count)
+        
+        async def translate_missing(missing: List[str]) -> List[Optional[str]]:
+            if self.local_backend:
+                return await self.local_backend.translate_texts(missing, target_lang, on_progress=progress,
+                                                                on_result=on_translated)
+            return await translate_in_batches(
+                missing,
+                lambda batch: self._translate_packed(batch, target_lang),
+                max_chars=self.batch_chars,
+                max_items=self.batch_size,
+                on_progress=progress,
+                on_result=on_translated
+            )
+        
+        # 先查本地缓存，只翻译未命中的去重文本
+        translated = await translate_with_cache(
+            self.cache, [texts[i] for i in pending], target_lang, translate_missing
+        )
+        # 缓存命中的条目也计入进度
+        remaining = len({texts[i] for i in pending}) - reported
+        if on_progress and remaining > 0:
+            on_progress(remaining)
+        
+        results = list(texts)
+        for index, value in zip(pending, translated):
+            if value is None:
+                print(f"  ❌ 翻译失败，保持原文: {texts[index]}")
+            else:
+                results[index] = value
         return results
+    
+    def close(self) -> None:
+        stats = self.client.stats
+        print(f"📡 请求统计: {stats['requests']} 次请求, {stats['retries']} 次重试, "
+              f"{stats['throttled']} 次限流/服务端错误, {stats['failures']} 次失败")
+        self.client.close()
+        if self.cache:
+            self.cache.report()
+            self.cache.close()
 
-def find_untranslated_content(obj: Dict[str, Any], lang_code: str, prefix: str = '') -> List[Tuple[str, str]]:
+def find_untranslated_content(catalog: Catalog, lang_code: str) -> List[Tuple[str, str]]:
     """查找未翻译的内容"""
-    untranslated = []
     untranslated_markers = {
         'zh': '待翻译',
         'ar': 'يحتاج ترجمة', 
@@ -95,98 +171,72 @@ def find_untranslated_content(obj: Dict[str, Any], lang_code: str, prefix: str =
     }
     
     marker = untranslated_markers.get(lang_code, '待翻译')
-    
-    if isinstance(obj, dict):
-        for key, value in obj.items():
-            current_key = f'{prefix}.{key}' if prefix else key
-            if isinstance(value, dict):
-                untranslated.extend(find_untranslated_content(value, lang_code, current_key))
-            elif isinstance(value, str) and marker in value:
-                untranslated.append((current_key, value))
-    
-    return untranslated
-
-def update_translation_in_dict(obj: Dict[str, Any], key_path: str, new_value: str) -> None:
-    """更新字典中的翻译值"""
-    keys = key_path.split('.')
-    current = obj
-    
-    for key in keys[:-1]:
-        if key not in current:
-            current[key] = {}
-        current = current[key]
-    
-    current[keys[-1]] = new_value
+    return [(key_path, value) for key_path, value in catalog.items()
+            if isinstance(value, str) and marker in value]
 
-def translate_language_file(lang_code: str, en_data: Dict[str, Any], translator: TranslationService) -> Dict[str, Any]:
-    """翻译整个语言文件"""
-    print(f"\n🌍 开始翻译 {lang_code.upper()} 语言文件")
-    print("=" * 50)
+def plan_language_file(lang_code: str, store: CatalogStore, plan: TranslationPlan) -> Catalog:
+    """加载语言文件，把未翻译的键加入翻译计划，返回语言文件"""
+    en_catalog = store['en']
+    lang_catalog = store[lang_code]
     
-    # 加载现有的语言文件
-    lang_file = f'messages/{lang_code}.json'
-    if os.path.exists(lang_file):
-        with open(lang_file, 'r', encoding='utf-8') as f:
-            lang_data = json.load(f)
-    else:
-        lang_data = {}
+    # 回放上次中断时未写回的译文日志
+    replayed = replay_journal(lang_catalog, source_of=en_catalog.get)
+    if replayed:
+        print(f"♻️  {lang_code.upper()}: 从日志恢复 {replayed} 条译文")
     
     # 查找未翻译的内容
-    untranslated = find_untranslated_content(lang_data, lang_code)
+    untranslated = find_untranslated_content(lang_catalog, lang_code)
     
     if not untranslated:
-        print("✅ 该语言文件已完全翻译")
-        return lang_data
+        print(f"✅ {lang_code.upper()}: 已完全翻译")
+        return lang_catalog
     
-    print(f"📝 发现 {len(untranslated)} 个未翻译项目")
+    print(f"📝 {lang_code.upper()}: 发现 {len(untranslated)} 个未翻译项目")
     
     # 获取对应的英文原文
-    target_lang = LANGUAGE_MAPPING.get(lang_code)
-    if not target_lang:
-        print(f"❌ 不支持的语言代码: {lang_code}")
-        return lang_data
+    for key_path, current_value in untranslated:
+        en_text = en_catalog.get(key_path)
+        
+        if not en_text or not isinstance(en_text, str):
+            print(f"  ⚠️ 跳过 {key_path}: 找不到英文原文")
+            continue
+        
+        plan.add(lang_code, key_path, en_text)
     
-    translated_count = 0
+    return lang_catalog
+
+async def execute_plan(plan: TranslationPlan, translator: TranslationService,
+                       checkpoints: Dict[str, CheckpointedLanguageFile]) -> Dict[str, Dict[str, str]]:
+    """
+    所有语言并行翻译计划中的去重原文，返回 语言 -> 原文 -> 译文
+    每条译文完成后立即写入对应语言的检查点（日志 + 定期原子写回）
+    """
+    progress = PlanProgress(plan)
     
-    for key_path, current_value in untranslated:
-        try:
-            # 获取英文原文
-            keys = key_path.split('.')
-            en_text = en_data
-            for key in keys:
-                if isinstance(en_text, dict) and key in en_text:
-                    en_text = en_text[key]
-                else:
-                    en_text = None
-                    break
-            
-            if not en_text or not isinstance(en_text, str):
-                print(f"  ⚠️ 跳过 {key_path}: 找不到英文原文")
-                continue
-            
-            print(f"\n📍 翻译键值: {key_path}")
-            print(f"  英文原文: {en_text}")
-            
-            # 翻译文本
-            translated_text = translator.translate_text(en_text, target_lang)
-            
-            if translated_text and translated_text != en_text:
-                # 更新翻译
-                update_translation_in_dict(lang_data, key_path, translated_text)
-                translated_count += 1
-                print(f"  ✅ 翻译完成")
-            else:
-                print(f"  ⚠️ 翻译失败或无变化")
-                
-        except Exception as e:
-            print(f"  ❌ 处理错误 {key_path}: {e}")
+    async def run(lang_code: str) -> Dict[str, str]:
+        texts = plan.texts(lang_code)
+        checkpoint = checkpoints[lang_code]
+        
+        def record(en_text: str, translated: str) -> None:
+            if translated == en_text:
+                return
+            for key_path in plan.work[lang_code][en_text]:
+                checkpoint.record(key_path, en_text, translated)
+        
+        translations = await translator.translate_batch(
+            texts, LANGUAGE_MAPPING[lang_code],
+            on_progress=lambda count: progress.advance(lang_code, count),
+            on_translated=record
+        )
+        return dict(zip(texts, translations))
     
-    print(f"\n📊 翻译统计: {translated_count}/{len(untranslated)} 项成功翻译")
-    return lang_data
+    languages = plan.languages()
+    results = await asyncio.gather(*(run(lang_code) for lang_code in languages))
+    return dict(zip(languages, results))
 
-def main():
+async def main(args: argparse.Namespace):
     print("🚀 自动翻译多语言界面文案")
-    print("使用 Hugging Face Space API")
+    print("使用本地 NLLB 模型" if args.backend == 'local' else "使用 Hugging Face Space API")
     print("=" * 60)
     
     # 检查消息目录
@@ -194,63 +244,145 @@ def main():
         print("❌ 找不到 messages 目录")
         return
     
-    # 加载英文基准文件
+    # 加载英文基准文件（各语言文件在本次运行中只解析一次）
+    store = CatalogStore('messages')
     try:
-        with open('messages/en.json', 'r', encoding='utf-8') as f:
-            en_data = json.load(f)
-        print(f"✅ 加载英文基准文件: {len(en_data)} 个顶级键")
+        if not store.path('en').exists():
+            raise FileNotFoundError(store.path('en'))
+        en_catalog = store['en']
+        print(f"✅ 加载英文基准文件: {len(en_catalog.data)} 个顶级键")
     except Exception as e:
         print(f"❌ 加载英文文件失败: {e}")
         return
     
     # 初始化翻译服务
-    translator = TranslationService()
+    local_backend = None
+    if args.backend == 'local':
+        try:
+            local_backend = LocalNLLBBackend(batch_size=args.local_batch_size)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return
+        if not local_backend.load():
+            print("❌ 本地模型加载失败，请先运行 microservices/nllb-local/scripts/download_model.py")
+            return
+    
+    model_id = local_backend.model_id if local_backend else HF_SPACE_URL
+    translator = TranslationService(
+        max_concurrency=args.concurrency,
+        rate=args.rate,
+        max_retries=args.max_retries,
+        batch_chars=args.batch_chars,
+        batch_size=args.batch_size,
+        cache=None if args.no_cache else TranslationCache(model_id),
+        local_backend=local_backend
+    )
     
     # 测试API连接
-    print("\n🔍 测试翻译API连接...")
-    test_result = translator.translate_text("Hello", LANGUAGE_MAPPING['zh'])
-    if test_result and test_result != "Hello":
-        print("✅ API连接正常")
+    if not local_backend:
+        print("\n🔍 测试翻译API连接...")
+        test_result = await translator.translate_text("Hello", LANGUAGE_MAPPING['zh'])
+        if test_result and test_result != "Hello":
+            print("✅ API连接正常")
+        else:
+            print("❌ API连接失败，请检查网络和服务状态")
+            translator.close()
+            return
+    
+    # 需要翻译的语言：默认 messages/ 下所有支持的语言文件
+    if args.languages:
+        languages_to_translate = args.languages
     else:
-        print("❌ API连接失败，请检查网络和服务状态")
-        return
+        languages_to_translate = [lang for lang in store.languages() if lang in LANGUAGE_MAPPING]
     
-    # 需要翻译的语言（有未翻译内容的）
-    languages_to_translate = ['zh', 'ar', 'hi', 'ht']
+    unsupported = [lang for lang in languages_to_translate if lang not in LANGUAGE_MAPPING]
+    for lang_code in unsupported:
+        print(f"❌ 不支持的语言代码: {lang_code}")
+    languages_to_translate = [lang for lang in languages_to_translate if lang in LANGUAGE_MAPPING]
     
     print(f"\n📋 计划翻译语言: {', '.join(languages_to_translate)}")
     
-    # 逐个处理语言文件
+    # 有上次中断留下的日志的语言：即使回放后已经没有要翻译的键，也要写回回放的译文并删除日志
+    recovering = [lang for lang in languages_to_translate if journal_path(store.path(lang)).exists()]
+    
+    # 规划：收集所有语言需要的 (英文原文, 目标语言) 并去重
+    plan = TranslationPlan()
     for lang_code in languages_to_translate:
         try:
-            translated_data = translate_language_file(lang_code, en_data, translator)
-            
-            # 保存翻译结果
-            output_file = f'messages/{lang_code}.json'
-            backup_file = f'messages/{lang_code}.json.backup'
-            
-            # 创建备份
-            if os.path.exists(output_file):
-                with open(output_file, 'r', encoding='utf-8') as f:
-                    backup_data = f.read()
-                with open(backup_file, 'w', encoding='utf-8') as f:
-                    f.write(backup_data)
-                print(f"💾 创建备份: {backup_file}")
-            
-            # 保存翻译结果
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(translated_data, f, ensure_ascii=False, indent=2)
-            
-            print(f"✅ 保存翻译结果: {output_file}")
-            
+            plan_language_file(lang_code, store, plan)
         except Exception as e:
-            print(f"❌ 处理 {lang_code} 语言时出错: {e}")
+            print(f"❌ 加载 {lang_code} 语言文件时出错: {e}")
+    
+    print(f"\n🗺️  翻译计划: {plan.summary()}")
     
+    # 执行：所有语言并行翻译，译文边完成边写入检查点
+    checkpoints = {
+        lang_code: CheckpointedLanguageFile(
+            store[lang_code], interval=args.checkpoint_interval, every=args.checkpoint_every
+        )
+        for lang_code in dict.fromkeys([*plan.languages(), *recovering])
+        if store.is_loaded(lang_code)
+    }
+    try:
+        results = await execute_plan(plan, translator, checkpoints)
+        
+        # 写回每个引用该原文的键（包括缓存命中的译文）
+        for lang_code in plan.languages():
+            translated_count = plan.apply(lang_code, results[lang_code], store[lang_code].set)
+            print(f"\n📊 {lang_code.upper()} 翻译统计: {translated_count} 个键成功翻译")
+    finally:
+        # 正常结束或中断时都把已完成的译文原子写回
+        for lang_code, checkpoint in checkpoints.items():
+            try:
+                changed = checkpoint.catalog.dirty
+                checkpoint.close()
+                if changed:
+                    print(f"✅ 保存翻译结果: messages/{lang_code}.json")
+            except Exception as e:
+                print(f"❌ 保存 {lang_code} 语言时出错: {e}")
+    
+    translator.close()
     print("\n🎉 自动翻译完成！")
+    
+    if args.check:
+        # 复用本次已加载的语言文件，不再重新解析
+        report = check_catalogs(store)
+        print("\n🔍 一致性检查:")
+        for lang_code, result in report['languages'].items():
+            print(f"  {lang_code.upper()}: 缺失 {len(result['missingKeys'])} 个, "
+                  f"多余 {len(result['extraKeys'])} 个, 未翻译 {len(result['untranslated'])} 个")
     print("\n💡 建议:")
     print("1. 检查翻译质量并进行人工校对")
     print("2. 测试界面显示效果")
     print("3. 如有问题可恢复备份文件")
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="自动翻译多语言界面文案")
+    parser.add_argument("--backend", choices=["space", "local"], default="space",
+                        help="翻译后端: space=Hugging Face Space 接口, local=进程内本地 NLLB 模型 (默认: space)")
+    parser.add_argument("--local-batch-size", type=int, default=32,
+                        help="本地后端每次 generate 的文本条数 (默认: 32)")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="最大并发请求数，遇到限流会自动降低 (默认: 4)")
+    parser.add_argument("--rate", type=float, default=2.0,
+                        help="每秒最多发出的请求数 (默认: 2.0)")
+    parser.add_argument("--max-retries", type=int, default=3,
+                        help="单个请求的最大尝试次数 (默认: 3)")
+    parser.add_argument("--batch-chars", type=int, default=800,
+                        help="每次请求打包的最大字符数 (默认: 800)")
+    parser.add_argument("--batch-size", type=int, default=16,
+                        help="每次请求打包的最大文本条数 (默认: 16)")
+    parser.add_argument("--languages", nargs="+",
+                        help="只翻译这些语言 (默认: messages/ 下所有支持的语言)")
+    parser.add_argument("--checkpoint-interval", type=float, default=30.0,
+                        help="两次写回语言文件之间的最长秒数 (默认: 30)")
+    parser.add_argument("--checkpoint-every", type=int, default=50,
+                        help="累计多少条译文后写回语言文件 (默认: 50)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="不使用本地翻译缓存 (.i18n-cache/)")
+    parser.add_argument("--check", action="store_true",
+                        help="翻译完成后对所有语言文件做一致性检查（复用已加载的语言文件）")
+    return parser.parse_args()
+
 if __name__ == '__main__':
-    main()
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多语言工具链性能基准
+生成指定规模的合成语言文件和源码目录，分阶段计时 check-i18n.py、check-hardcoded-chinese.py
+和自动翻译规划用到的各个步骤，并记录每个阶段的峰值内存；完全离线运行
+峰值内存用 tracemalloc 测量，只能看到当前进程，并行阶段测内存的那一次改为单进程运行
+
+python benchmark-i18n.py                      # 当前规模（约 1000 个键、12 种语言、330 个源文件）
+python benchmark-i18n.py --scale 10           # 10 倍规模
+python benchmark-i18n.py --save-baseline      # 保存为基线，之后的运行与之对比
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from i18n_tools.catalog import CatalogStore, flatten
+from i18n_tools.consistency import check_catalogs
+from i18n_tools.key_scanner import find_unused_keys, scan_keys
+from i18n_tools.manifest import build_manifest, diff_manifest
+from i18n_tools.plan import TranslationPlan
+from i18n_tools.translatable import is_translatable
+
+FRONTEND_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = FRONTEND_DIR / '.i18n-cache' / 'benchmark-baseline.json'
+
+# 峰值内存的测量方式，随结果一起输出
+MEMORY_METHOD = 'tracemalloc, workers=1'
+
+# 与当前仓库规模相当的默认参数
+DEFAULT_KEYS = 1000
+DEFAULT_DEPTH = 3
+DEFAULT_LOCALES = 12
+DEFAULT_FILES = 330
+DEFAULT_CALLS_PER_FILE = 8
+
+# 合成语言文件中的缺陷比例
+MISSING_RATIO = 0.02
+EXTRA_RATIO = 0.01
+UNTRANSLATED_RATIO = 0.03
+
+WORDS = ['translate', 'document', 'language', 'upload', 'credits', 'free', 'account', 'history',
+         'download', 'settings', 'quality', 'text', 'result', 'error', 'retry', 'page']
+
+
+def load_script(name: str):
+    """按文件名导入带连字符的脚本；注册到 sys.modules，进程池才能 pickle 其中的函数"""
+    spec = importlib.util.spec_from_file_location(name.replace('-', '_'), FRONTEND_DIR / f'{name}.py')
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def key_paths(count: int, depth: int) -> list:
+    """生成 count 个互不相同、深度为 depth 的点分键路径（最后一段 key_<i> 保证唯一）"""
+    if depth < 1:
+        raise ValueError(f"键路径深度至少为 1: {depth}")
+    sections = max(1, int(count ** 0.5) // 2)
+    paths = []
+    for i in range(count):
+        parts = [f'Section{i % sections}'] if depth > 1 else []
+        for level in range(1, depth - 1):
+            parts.append(f'group{(i // (sections * level)) % 4}')
+        parts.append(f'key_{i}')
+        paths.append('.'.join(parts))
+    return paths
+
+
+def english_text(rng: random.Random, index: int) -> str:
+    if index % 40 == 0:
+        return f'${rng.randint(1, 99)}.99'
+    words = rng.choices(WORDS, k=rng.randint(1, 12))
+    return ' '.join(words).capitalize() + (' {count}' if index % 7 == 0 else '')
+
+
+def generate_fixture(root: Path, keys: int, depth: int, locales: int, files: int,
+                     calls_per_file: int, seed: int = 0) -> dict:
+    """在 root 下生成 messages/ 和 app/、components/、lib/ 源码目录，返回实际规模"""
+    rng = random.Random(seed)
+    paths = key_paths(keys, depth)
+    en_rows = {path: english_text(rng, i) for i, path in enumerate(paths)}
+
+    messages = root / 'messages'
+    messages.mkdir(parents=True)
+    store = CatalogStore(messages)
+    store['en'].update(en_rows)
+    store['en'].save()
+
+    for n in range(locales - 1):
+        lang = f'l{n:02d}'
+        rows = {}
+        for path, text in en_rows.items():
+            roll = rng.random()
+            if roll < MISSING_RATIO:
+                continue
+            if roll < MISSING_RATIO + UNTRANSLATED_RATIO:
+                rows[path] = f'待翻译: {text}'
+            else:
+                rows[path] = f'[{lang}] {text}'
+        for i in range(int(keys * EXTRA_RATIO)):
+            rows[f'Legacy.removed_{i}'] = f'[{lang}] old'
+        store[lang].update(rows)
+        store[lang].save()
+
+    roots = ['app', 'components', 'lib']
+    for i in range(files):
+        directory = root / roots[i % 3] / f'feature{i % 25}' / ('nested' if i % 2 else '')
+        directory.mkdir(parents=True, exist_ok=True)
+        lines = ["import { useTranslations } from 'next-intl'", '']
+        lines.append(f"export function Component{i}() {{")
+        lines.append(f"  const t = useTranslations('{rng.choice(paths).split('.')[0]}')")
+        for _ in range(calls_per_file):
+            lines.append(f"  const label{_} = t('{rng.choice(paths)}')")
+            lines.extend(f'  const value{j} = compute({j}, props.items[{j}])' for j in range(4))
+        if i % 10 == 0:
+            lines.append("  const hint = '请先登录'")
+        lines.append('  // 注释中的中文')
+        lines.append('  return null')
+        lines.append('}')
+        (directory / f'component{i}.tsx').write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+    # 被剪枝的目录，不应计入扫描耗时
+    vendor = root / 'node_modules' / 'pkg'
+    vendor.mkdir(parents=True)
+    for i in range(files // 2):
+        (vendor / f'vendor{i}.js').write_text("const s = '中文';\n" * 50, encoding='utf-8')
+
+    return {'keys': len(en_rows), 'depth': depth, 'locales': locales, 'files': files,
+            'calls': files * calls_per_file}
+
+
+class Phase:
+    """
+    一个计时阶段：setup 不计时，run(setup 的返回值)
+    memory_run 为测峰值内存时运行的版本，并行阶段传单进程的版本（tracemalloc 看不到子进程的分配）
+    """
+
+    def __init__(self, name: str, run, setup=None, memory_run=None):
+        self.name = name
+        self.run = run
+        self.setup = setup or (lambda: None)
+        self.memory_run = memory_run or run
+
+
+def measure(phase: Phase, repeat: int) -> dict:
+    """取多次运行的中位数耗时；另跑一次 memory_run 用 tracemalloc 记录峰值内存（该次不计时）"""
+    times = []
+    for _ in range(repeat):
+        state = phase.setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            phase.run(state)
+            times.append(time.perf_counter() - start)
+
+    state = phase.setup()
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        phase.memory_run(state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'ms': round(statistics.median(times) * 1000, 2), 'peak_kb': round(peak / 1024, 1)}
+
+
+def build_phases(root: Path, workers: int) -> list:
+    messages = root / 'messages'
+    scan_cache = root / '.i18n-cache' / 'key-scan.json'
+    chinese = load_script('check-hardcoded-chinese')
+    auto_translate = load_script('auto-translate-i18n')
+
+    def read_raw():
+        return [path.read_text(encoding='utf-8') for path in sorted(messages.glob('*.json'))]
+
+    def loaded_store():
+        store = CatalogStore(messages)
+        for lang in store.languages():
+            store.get(lang)
+        return store
+
+    def parsed():
+        return [json.loads(raw) for raw in read_raw()]
+
+    def cold_scan():
+        scan_cache.unlink(missing_ok=True)
+
+    def scanned():
+        return loaded_store()['en'].rows, scan_keys(root, cache_path=None, workers=1).keys
+
+    def scan_cjk(n):
+        return chinese.scan_files([str(root / path) for path in chinese.iter_source_files(str(root))], n)
+
+    def plan_auto_translate(store):
+        plan = TranslationPlan()
+        for lang in store.languages():
+            if lang != 'en':
+                auto_translate.plan_language_file(lang, store, plan)
+        return plan
+
+    def plan_sync(store):
+        en_rows = store['en'].rows
+        # 模拟上次同步后改动了 5% 的英文键
+        previous = {path: value if i % 20 else f'{value} (old)' for i, (path, value) in enumerate(en_rows.items())}
+        added, modified, removed = diff_manifest(en_rows, build_manifest(previous))
+        changed = added + modified
+        pending = {}
+        for lang in store.languages():
+            catalog = store[lang]
+            paths = dict.fromkeys(changed + [path for path in en_rows if path not in catalog])
+            pending[lang] = [path for path in paths
+                             if isinstance(en_rows[path], str) and is_translatable(en_rows[path])]
+        return pending
+
+    return [
+        Phase('catalog.read', lambda _: read_raw()),
+        Phase('catalog.parse', lambda raws: [json.loads(raw) for raw in raws], read_raw),
+        Phase('catalog.flatten', lambda datas: [flatten(data) for data in datas], parsed),
+        Phase('catalog.load', lambda _: loaded_store()),
+        Phase('check.compare', lambda store: check_catalogs(store, workers=1), loaded_store),
+        Phase(f'check.full[workers={workers}]', lambda _: check_catalogs(CatalogStore(messages), workers=workers),
+              memory_run=lambda _: check_catalogs(CatalogStore(messages), workers=1)),
+        Phase('scan.keys_cold', lambda _: scan_keys(root, cache_path=scan_cache, workers=workers), cold_scan,
+              memory_run=lambda _: scan_keys(root, cache_path=scan_cache, workers=1)),
+        Phase('scan.keys_warm', lambda _: scan_keys(root, cache_path=scan_cache, workers=workers),
+              memory_run=lambda _: scan_keys(root, cache_path=scan_cache, workers=1)),
+        Phase('scan.unused', lambda state: find_unused_keys(*state), scanned),
+        Phase('scan.cjk', lambda _: scan_cjk(workers), memory_run=lambda _: scan_cjk(1)),
+        Phase('plan.auto_translate', plan_auto_translate, loaded_store),
+        Phase('plan.sync', plan_sync, loaded_store),
+    ]
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """返回耗时或峰值内存超出基线 tolerance 的阶段"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for metric in ('ms', 'peak_kb'):
+            if base[metric] and result[metric] > base[metric] * (1 + tolerance):
+                regressions.append((name, metric, base[metric], result[metric]))
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="多语言工具链性能基准（离线）")
+    parser.add_argument('--scale', type=float, default=1.0, help="键数量和源文件数量的倍数 (默认: 1)")
+    parser.add_argument('--keys', type=int, help=f"英文键数量 (默认: {DEFAULT_KEYS} × scale)")
+    parser.add_argument('--depth', type=int, default=DEFAULT_DEPTH, help=f"键路径深度 (默认: {DEFAULT_DEPTH})")
+    parser.add_argument('--locales', type=int, default=DEFAULT_LOCALES,
+                        help=f"语言数量，含英文 (默认: {DEFAULT_LOCALES})")
+    parser.add_argument('--files', type=int, help=f"源文件数量 (默认: {DEFAULT_FILES} × scale)")
+    parser.add_argument('--calls-per-file', type=int, default=DEFAULT_CALLS_PER_FILE,
+                        help=f"每个源文件中的翻译调用数 (默认: {DEFAULT_CALLS_PER_FILE})")
+    parser.add_argument('--repeat', type=int, default=3, help="每个阶段的计时次数，取中位数 (默认: 3)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="并行阶段使用的进程数")
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE, help="基线文件路径")
+    parser.add_argument('--save-baseline', action='store_true', help="把本次结果保存为基线")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="超出基线多少比例视为退化 (默认: 0.25)")
+    parser.add_argument('--json', action='store_true', help="输出 JSON 结果")
+    return parser.parse_args()
+
+
+def main(args):
+    keys = args.keys or int(DEFAULT_KEYS * args.scale)
+    files = args.files or int(DEFAULT_FILES * args.scale)
+
+    root = Path(tempfile.mkdtemp(prefix='i18n-bench-'))
+    try:
+        size = generate_fixture(root, keys, args.depth, args.locales, files, args.calls_per_file)
+        size['catalog_bytes'] = sum(path.stat().st_size for path in (root / 'messages').glob('*.json'))
+        results = {phase.name: measure(phase, args.repeat) for phase in build_phases(root, args.workers)}
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    # 基线按规模区分，不同规模的结果不能直接比较
+    size_id = f"k{size['keys']}-d{size['depth']}-l{size['locales']}-f{size['files']}-c{args.calls_per_file}"
+    baselines = {}
+    if args.baseline.exists():
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baselines = json.load(f)
+    baseline = baselines.get(size_id, {}).get('results', {})
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.json:
+        print(json.dumps({'size': size, 'memory_method': MEMORY_METHOD, 'results': results, 'baseline': baseline,
+                          'regressions': [dict(zip(('phase', 'metric', 'baseline', 'current'), r))
+                                          for r in regressions]}, ensure_ascii=False, indent=2))
+    else:
+        print("📏 多语言工具链性能基准")
+        print("=" * 60)
+        print(f"规模: {size['keys']} 个键, 深度 {size['depth']}, {size['locales']} 种语言 "
+              f"({size['catalog_bytes'] / 1024:.0f} KB), {size['files']} 个源文件, {size['calls']} 处翻译调用")
+        print()
+        print(f"{'阶段':<28}{'耗时(ms)':>12}{'基线':>10}{'峰值内存(KB)':>16}{'基线':>10}")
+        print("-" * 76)
+        for name, result in results.items():
+            base = baseline.get(name, {})
+            print(f"{name:<30}{result['ms']:>12.2f}{base.get('ms', '-'):>10}"
+                  f"{result['peak_kb']:>14.1f}{base.get('peak_kb', '-'):>12}")
+        print(f"峰值内存: {MEMORY_METHOD}（并行阶段测内存时单进程运行）")
+        print()
+        if not baseline:
+            print("ℹ️  没有该规模的基线，使用 --save-baseline 保存")
+        elif regressions:
+            print(f"❌ 超出基线 {args.tolerance:.0%} 的阶段:")
+            for name, metric, base, current in regressions:
+                print(f"   {name} {metric}: {base} -> {current}")
+        else:
+            print(f"✅ 所有阶段都在基线 {args.tolerance:.0%} 以内")
+
+    if args.save_baseline:
+        baselines[size_id] = {
+            'size': size,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'saved_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'memory_method': MEMORY_METHOD,
+            'results': results,
+        }
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, ensure_ascii=False, indent=2)
+        if not args.json:
+            print(f"💾 已保存基线: {args.baseline}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main(parse_args()))
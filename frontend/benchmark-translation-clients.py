@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+翻译客户端负载基准
+启动本地替身翻译服务（i18n_tools.stub_server），在临时目录生成合成语言文件，
+用 auto-translate-i18n.py（Space 接口）和 translate-new-keys.py sync（推理 API）分别跑完整翻译，
+报告端到端耗时、每条文案的请求数和重试开销；完全离线运行
+
+python benchmark-translation-clients.py                           # 所有预设场景
+python benchmark-translation-clients.py --scenario throttled     # 只跑限流场景
+python benchmark-translation-clients.py --scenario custom --latency uniform:0.1,0.4 --error-rate 0.2
+"""
+
+import argparse
+import asyncio
+import contextlib
+import dataclasses
+import importlib.util
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from i18n_tools.catalog import CatalogStore
+from i18n_tools.stub_server import StubConfig, StubTranslationServer, add_config_arguments, config_from_args
+
+FRONTEND_DIR = Path(__file__).resolve().parent
+
+# 预设场景：替身服务的行为
+SCENARIOS = {
+    'clean': StubConfig(latency='lognormal:0.15,0.4'),
+    'throttled': StubConfig(latency='lognormal:0.15,0.4', throttle_rate=0.2, retry_after=0.5),
+    'flaky': StubConfig(latency='lognormal:0.15,0.4', error_rate=0.15),
+    'overloaded': StubConfig(latency='lognormal:0.15,0.4', max_concurrency=2, retry_after=0.5),
+}
+
+# 未翻译标记为“待翻译”的语言（auto-translate-i18n.py 对 ar/hi/ht 使用其他标记）
+LANGUAGES = ['zh', 'es', 'fr', 'pt', 'sw', 'te', 'my', 'lo']
+
+WORDS = ['translate', 'document', 'language', 'upload', 'credits', 'free', 'account', 'history',
+         'download', 'settings', 'quality', 'text', 'result', 'error', 'retry', 'page']
+
+CLIENTS = ['auto-translate', 'translate-new-keys']
+
+
+def load_script(name: str):
+    """按文件名导入带连字符的脚本"""
+    spec = importlib.util.spec_from_file_location(name.replace('-', '_'), FRONTEND_DIR / f'{name}.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def english_rows(keys: int, seed: int = 0) -> dict:
+    """keys 个互不相同的英文文案"""
+    rng = random.Random(seed)
+    sections = max(1, keys // 20)
+    return {f'Section{i % sections}.key_{i}': f"{' '.join(rng.choices(WORDS, k=rng.randint(1, 10))).capitalize()} {i}"
+            for i in range(keys)}
+
+
+def prepare_messages(root: Path, client: str, en_rows: dict, languages: list) -> int:
+    """
+    在 root/messages 下生成该客户端要处理的语言文件，返回需要翻译的 (文案, 语言) 数
+    auto-translate: 各语言文件中全部为“待翻译”；translate-new-keys sync: 只有 en.json，所有语言的键都缺失
+    """
+    messages = root / 'messages'
+    shutil.rmtree(messages, ignore_errors=True)
+    messages.mkdir(parents=True)
+    store = CatalogStore(messages)
+    store['en'].update(en_rows)
+    store['en'].save()
+    if client == 'auto-translate':
+        for lang in languages:
+            store[lang].update({path: f'待翻译: {text}' for path, text in en_rows.items()})
+            store[lang].save()
+    return len(set(en_rows.values())) * len(languages)
+
+
+def count_translated(root: Path, en_rows: dict, languages: list) -> int:
+    """替身服务的译文以 <目标语言> 开头，统计已写回的键数"""
+    store = CatalogStore(root / 'messages')
+    return sum(1 for lang in languages for path in en_rows
+               if str(store[lang].get(path) or '').startswith('<'))
+
+
+def run_client(client: str, root: Path, url: str, args: argparse.Namespace, languages: list) -> float:
+    """在 root 下运行一次客户端，返回端到端秒数；客户端输出不显示"""
+    if client == 'auto-translate':
+        module = load_script('auto-translate-i18n')
+        module.HF_SPACE_URL = url
+        argv = ['--no-cache', '--languages', *languages, '--max-retries', str(args.max_retries)]
+    else:
+        module = load_script('translate-new-keys')
+        module.HF_API_URL = url
+        argv = ['sync', '--no-cache']
+    argv += ['--concurrency', str(args.concurrency), '--rate', str(args.rate)]
+
+    saved_argv, saved_cwd = sys.argv, os.getcwd()
+    sys.argv = [client, *argv]
+    try:
+        client_args = module.parse_args()
+        os.chdir(root)
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            asyncio.run(module.main(client_args))
+            return time.perf_counter() - start
+    finally:
+        sys.argv = saved_argv
+        os.chdir(saved_cwd)
+
+
+def benchmark(scenario: str, config: StubConfig, client: str, root: Path, en_rows: dict,
+              args: argparse.Namespace) -> dict:
+    # translate-new-keys sync 总是同步它支持的所有语言
+    languages = args.languages if client == 'auto-translate' else list(load_script('translate-new-keys').LANGUAGE_CODES)
+    strings = prepare_messages(root, client, en_rows, languages)
+
+    server = StubTranslationServer(('127.0.0.1', 0), config)
+    server.start()
+    try:
+        wall = run_client(client, root, server.url, args, languages)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    stats = server.stats.snapshot()
+    status = {int(code): count for code, count in stats['status'].items()}
+    ok = status.get(200, 0)
+    return {
+        'scenario': scenario,
+        'client': client,
+        'strings': strings,
+        'translated': count_translated(root, en_rows, languages),
+        'wallSeconds': round(wall, 3),
+        'requests': stats['requests'],
+        'requestsPerString': round(stats['requests'] / strings, 4) if strings else 0.0,
+        # 成功响应中重复发送的文案（打包拆分重试等）
+        'sentPerString': round(stats['strings'] / strings, 4) if strings else 0.0,
+        'throttled': status.get(429, 0),
+        'serverErrors': sum(count for code, count in status.items() if code >= 500),
+        'retryRatio': round((stats['requests'] - ok) / stats['requests'], 4) if stats['requests'] else 0.0,
+        'peakConcurrency': stats['peakConcurrency'],
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="翻译客户端负载基准（本地替身服务，离线）")
+    parser.add_argument('--scenario', nargs='+', choices=[*SCENARIOS, 'custom'], default=list(SCENARIOS),
+                        help="要运行的场景，custom 使用下面的替身服务参数 (默认: 所有预设场景)")
+    parser.add_argument('--client', nargs='+', choices=CLIENTS, default=CLIENTS, help="要测量的客户端 (默认: 全部)")
+    parser.add_argument('--keys', type=int, default=100, help="英文键数量 (默认: 100)")
+    parser.add_argument('--languages', nargs='+', choices=LANGUAGES, default=['zh', 'es', 'fr'],
+                        help="auto-translate 翻译的语言 (默认: zh es fr)")
+    parser.add_argument('--concurrency', type=int, default=4, help="客户端最大并发请求数 (默认: 4)")
+    parser.add_argument('--rate', type=float, default=10.0,
+                        help="客户端每秒最多发出的请求数 (默认: 10，客户端自身默认为 2)")
+    parser.add_argument('--max-retries', type=int, default=3, help="auto-translate 单个请求的最大尝试次数 (默认: 3)")
+    parser.add_argument('--json', action='store_true', help="输出 JSON 结果")
+    stub = parser.add_argument_group('替身服务参数（--scenario custom）')
+    add_config_arguments(stub)
+    parser.set_defaults(seed=0)
+    return parser.parse_args()
+
+
+def main(args):
+    scenarios = {name: dataclasses.replace(SCENARIOS.get(name) or config_from_args(args), seed=args.seed)
+                 for name in args.scenario}
+    en_rows = english_rows(args.keys)
+
+    root = Path(tempfile.mkdtemp(prefix='i18n-client-bench-'))
+    results = []
+    try:
+        for name, config in scenarios.items():
+            for client in args.client:
+                results.append(benchmark(name, config, client, root, en_rows, args))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    # 重试开销：与同一客户端在 clean 场景下的耗时相比
+    clean = {result['client']: result['wallSeconds'] for result in results if result['scenario'] == 'clean'}
+    for result in results:
+        base = clean.get(result['client'])
+        result['wallOverhead'] = round(result['wallSeconds'] / base - 1, 4) if base else None
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return 1 if any(result['translated'] < result['strings'] for result in results) else 0
+
+    print("📡 翻译客户端负载基准（本地替身服务）")
+    print("=" * 100)
+    print(f"{args.keys} 个英文键，客户端并发 {args.concurrency}，限速 {args.rate:g} 请求/秒")
+    print()
+    print(f"{'场景':<12}{'客户端':<20}{'耗时(s)':>9}{'开销':>8}{'请求':>7}{'请求/条':>9}{'发送/条':>9}"
+          f"{'429':>6}{'5xx':>6}{'重试比例':>9}{'已翻译':>12}")
+    print("-" * 100)
+    for r in results:
+        overhead = f"{r['wallOverhead']:+.0%}" if r['wallOverhead'] is not None else '-'
+        print(f"{r['scenario']:<14}{r['client']:<21}{r['wallSeconds']:>9.2f}{overhead:>8}{r['requests']:>7}"
+              f"{r['requestsPerString']:>10.3f}{r['sentPerString']:>10.2f}{r['throttled']:>6}{r['serverErrors']:>6}"
+              f"{r['retryRatio']:>10.1%}{r['translated']:>8}/{r['strings']}")
+
+    failed = [r for r in results if r['translated'] < r['strings']]
+    print()
+    if failed:
+        print("⚠️  有文案没有翻译成功（重试耗尽后保持原文）: "
+              + ', '.join(f"{r['scenario']}/{r['client']}" for r in failed))
+        return 1
+    print("✅ 所有场景的文案都已翻译")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main(parse_args()))
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+按命名空间构建消息包
+把 messages/<lang>.json 拆成按顶层命名空间的压缩消息包（public/i18n/<lang>/<命名空间>.<哈希>.json 及 .gz），
+根据代码扫描结果和 import 图确定每个路由需要的命名空间，写出 lib/generated/i18n-bundles.json 清单
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from i18n_tools.bundles import (DEFAULT_BUNDLE_DIR, DEFAULT_BUNDLE_MANIFEST, build_bundles, route_namespaces,
+                                route_payloads, write_bundles)
+from i18n_tools.catalog import CatalogStore
+from i18n_tools.key_scanner import DEFAULT_SCAN_CACHE, scan_keys
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="按命名空间构建消息包和路由清单")
+    parser.add_argument('--output', type=Path, default=DEFAULT_BUNDLE_DIR,
+                        help=f"消息包输出目录（默认 {DEFAULT_BUNDLE_DIR}）")
+    parser.add_argument('--manifest', type=Path, default=DEFAULT_BUNDLE_MANIFEST,
+                        help=f"路由 -> 消息包清单路径（默认 {DEFAULT_BUNDLE_MANIFEST}）")
+    parser.add_argument('--include', nargs='+', default=[], metavar='NAMESPACE',
+                        help="所有路由都加载的命名空间（用于代码中动态拼接、扫描不到的键）")
+    parser.add_argument('--workers', type=int, default=None, help="并行扫描的进程数，1 为顺序扫描")
+    parser.add_argument('--no-scan-cache', action='store_true', help="不读写代码扫描缓存")
+    parser.add_argument('--check', action='store_true', help="不写入文件，有过期输出时退出码为 1")
+    parser.add_argument('--json', action='store_true', help="输出机器可读的 JSON 报告")
+    return parser.parse_args()
+
+def main(args):
+    store = CatalogStore('messages')
+    if 'en' not in store.languages():
+        print("❌ 找不到英文基准文件 (en.json)")
+        return 2
+
+    scan = scan_keys(cache_path=None if args.no_scan_cache else DEFAULT_SCAN_CACHE, workers=args.workers)
+    for file_path, error in scan.errors.items():
+        print(f"读取文件错误 {file_path}: {error}")
+
+    top_level = set(store['en'].data)
+    unknown = sorted(set(args.include) - top_level)
+    if unknown:
+        print(f"❌ en.json 中没有这些命名空间: {', '.join(unknown)}")
+        return 2
+
+    routes = route_namespaces(Path('.'), scan, top_level, args.include)
+    bundles = build_bundles(store, routes)
+    stats = write_bundles(bundles, routes, args.output, args.manifest, args.check)
+    outdated = stats['written'] + stats['removed'] + stats['manifest']
+
+    # 与整份语言文件相比每个路由需要加载的字节数（以英文为准）
+    full = store.path('en').read_bytes()
+    full_size = len(json.dumps(store['en'].data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    payloads = route_payloads(bundles['en'], routes)
+
+    if args.json:
+        print(json.dumps({
+            'routes': {route: {'namespaces': routes[route], **payloads[route]} for route in routes},
+            'fullCatalogBytes': full_size,
+            'stats': stats,
+        }, ensure_ascii=False, indent=2))
+        return 1 if args.check and outdated else 0
+
+    unused = sorted(top_level - {ns for namespaces in routes.values() for ns in namespaces})
+    print("📦 按命名空间构建消息包")
+    print("=" * 50)
+    print(f"语言: {len(bundles)} 个，命名空间: {len(top_level)} 个，路由: {len(routes)} 个")
+    print(f"代码中使用的翻译键: {len(scan.locations)} 个（{scan.files} 个文件，重新扫描 {scan.scanned} 个）")
+    if unused:
+        print(f"🗑️  没有路由用到的命名空间（不输出）: {', '.join(unused)}")
+    print()
+
+    print(f"{'路由':<48} {'命名空间':>8} {'字节':>8} {'gzip':>8}")
+    for route in sorted(routes):
+        payload = payloads[route]
+        print(f"{route:<48} {len(routes[route]):>8} {payload['bytes']:>8} {payload['gzip']:>8}")
+    print()
+
+    sizes = [payload['bytes'] for payload in payloads.values()]
+    if sizes:
+        average = sum(sizes) / len(sizes)
+        print(f"en.json 整份加载: {len(full)} 字节（压缩后 {full_size} 字节）")
+        print(f"按路由加载: 平均 {average:.0f} 字节（{average / full_size:.0%}），最大 {max(sizes)} 字节")
+
+    if args.check:
+        if outdated:
+            print(f"❌ 消息包已过期（{stats['written']} 个待写入，{stats['removed']} 个待删除，"
+                  f"清单{'需要' if stats['manifest'] else '无需'}更新），请运行 build-i18n-bundles.py")
+            return 1
+        print("✅ 消息包是最新的")
+        return 0
+
+    print(f"✅ 写入 {stats['written']} 个文件，删除 {stats['removed']} 个旧文件，"
+          f"清单{'已更新' if stats['manifest'] else '无变化'}: {args.manifest}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(parse_args()))
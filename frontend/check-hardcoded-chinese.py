@@ -3,66 +3,129 @@
 检查前端代码中的硬编码中文文案
 """
 
+import argparse
 import os
 import re
-from pathlib import Path
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# 要检查的文件扩展名
+EXTENSIONS = ('.tsx', '.ts', '.jsx', '.js')
+
+# 路径中包含这些片段的目录和文件都跳过，目录在遍历时直接剪枝
+SKIP_PARTS = ['node_modules', '.next', 'dist', 'build']
+
+# U+4E00-U+9FFF 的 UTF-8 编码首字节都在 0xE4-0xE9 之间，先按字节粗筛再解码确认
+CJK_LEAD_BYTES = re.compile(rb'[\xe4-\xe9][\x80-\xbf]{2}')
+
+# 待检查文件少于该数量时不启动进程池
+PARALLEL_THRESHOLD = 64
 
 def contains_chinese(text):
     """检查文本是否包含中文字符"""
     return bool(re.search(r'[\u4e00-\u9fff]', text))
 
+def is_skipped(path):
+    path = str(path)
+    return any(skip in path for skip in SKIP_PARTS)
+
 def check_file(file_path):
     """检查单个文件中的硬编码中文"""
+    # 排除一些特殊情况
+    if 'messages/' in str(file_path) or '.json' in str(file_path):  # 翻译文件 / JSON文件
+        return []
+
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        issues = []
-        for line_num, line in enumerate(lines, 1):
-            # 跳过注释行
-            if line.strip().startswith('//') or line.strip().startswith('/*'):
-                continue
-            
-            # 检查是否包含中文
-            if contains_chinese(line):
-                # 排除一些特殊情况
-                if 'messages/' in str(file_path):  # 翻译文件
-                    continue
-                if '.json' in str(file_path):  # JSON文件
-                    continue
-                if 'node_modules' in str(file_path):  # 依赖包
-                    continue
-                
-                issues.append({
-                    'line': line_num,
-                    'content': line.strip(),
-                    'file': str(file_path)
-                })
-        
-        return issues
+        with open(file_path, 'rb') as f:
+            data = f.read()
     except Exception as e:
         print(f"检查文件 {file_path} 时出错: {e}")
         return []
 
-def main():
+    issues = []
+    line_num = 1
+    # pos 总是某一行的开头，每一行只解码一次：命中后直接跳到下一行，长行上的扫描仍是线性的
+    pos = 0
+    while True:
+        match = CJK_LEAD_BYTES.search(data, pos)
+        if not match:
+            break
+        line_start = max(data.rfind(b'\n', pos, match.start()) + 1, pos)
+        line_num += data.count(b'\n', pos, line_start)
+
+        line_end = data.find(b'\n', match.end())
+        if line_end == -1:
+            line_end = len(data)
+        line = data[line_start:line_end].decode('utf-8', errors='replace')
+        current_line = line_num
+        line_num += 1
+        pos = line_end + 1
+
+        # 跳过注释行
+        if line.strip().startswith('//') or line.strip().startswith('/*'):
+            continue
+
+        # 检查是否包含中文
+        if contains_chinese(line):
+            issues.append({
+                'line': current_line,
+                'content': line.strip(),
+                'file': str(file_path)
+            })
+
+    return issues
+
+def iter_source_files(root):
+    """单次遍历，不进入被排除的目录"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not is_skipped(d))
+        for filename in sorted(filenames):
+            if filename.endswith(EXTENSIONS) and not is_skipped(filename):
+                yield os.path.relpath(os.path.join(dirpath, filename), root)
+
+def changed_files(ref):
+    """相对 git ref 改动过的文件（含未跟踪文件），路径相对当前目录"""
+    commands = [
+        ['git', 'diff', '--name-only', '--relative', '--diff-filter=ACMR', ref],
+        ['git', 'ls-files', '--others', '--exclude-standard'],
+    ]
+    files = set()
+    for command in commands:
+        output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+        files.update(line for line in output.splitlines() if line)
+    return sorted(path for path in files
+                  if path.endswith(EXTENSIONS) and not is_skipped(path) and os.path.isfile(path))
+
+def scan_files(files, workers=None):
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(files) < PARALLEL_THRESHOLD:
+        results = map(check_file, files)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(check_file, files, chunksize=max(1, len(files) // (workers * 4))))
+    return [issue for issues in results for issue in issues]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="检查前端代码中的硬编码中文文案")
+    parser.add_argument('--changed', metavar='REF',
+                        help="只检查相对该 git ref 改动过的文件（如 HEAD、origin/main），发现问题时退出码为 1")
+    parser.add_argument('--workers', type=int, default=None, help="并行扫描的进程数，1 为顺序扫描")
+    return parser.parse_args()
+
+def main(args):
     """主函数"""
-    frontend_dir = Path('.')
-    
-    # 要检查的文件扩展名
-    extensions = ['.tsx', '.ts', '.jsx', '.js']
-    
-    all_issues = []
-    
-    # 遍历所有相关文件
-    for ext in extensions:
-        for file_path in frontend_dir.rglob(f'*{ext}'):
-            # 跳过一些目录
-            if any(skip in str(file_path) for skip in ['node_modules', '.next', 'dist', 'build']):
-                continue
-            
-            issues = check_file(file_path)
-            all_issues.extend(issues)
-    
+    if args.changed:
+        try:
+            files = changed_files(args.changed)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"❌ 获取改动文件失败: {e}")
+            return 2
+    else:
+        files = list(iter_source_files('.'))
+
+    all_issues = scan_files(files, args.workers)
+
     # 输出结果
     if all_issues:
         print("发现以下硬编码中文文案：\n")
@@ -74,5 +137,7 @@ def main():
     else:
         print("✅ 未发现硬编码中文文案")
 
+    return 1 if args.changed and all_issues else 0
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main(parse_args()))
@@ -0,0 +1,81 @@
+'use client'
+
+import { useState, type ReactNode } from 'react'
+import { usePathname } from 'next/navigation'
+import { NextIntlClientProvider, type AbstractIntlMessages } from 'next-intl'
+import { fetchBundles, getRouteBundleUrls, matchRoute } from '@/lib/i18n-bundles'
+
+interface RouteMessagesProviderProps {
+  locale: string
+  // 首屏路由用到的命名空间（布局用 pickRouteMessages 裁剪）
+  messages: Partial<AbstractIntlMessages>
+  children: ReactNode
+}
+
+type BundleRequest = {
+  promise: Promise<void>
+  messages?: Partial<AbstractIntlMessages>
+}
+
+// 消息包请求按 URL 列表缓存，挂起后重新渲染时拿到同一个请求
+const requests = new Map<string, BundleRequest>()
+
+// 最近一次失败的下载：失败的请求从 requests 中删除，同一路径上的重新渲染不再重试，导航到其他路径后清除
+let lastFailure: { pathname: string; key: string } | null = null
+
+/**
+ * 下载 URL 列表对应的消息包
+ * @returns 缓存的请求；该路径上这组消息包刚下载失败时返回 null
+ */
+function requestBundles(urls: string[], pathname: string): BundleRequest | null {
+  const key = urls.join('\n')
+  if (lastFailure && lastFailure.pathname === pathname && lastFailure.key === key) {
+    return null
+  }
+  let request = requests.get(key)
+  if (!request) {
+    const created: BundleRequest = {
+      promise: fetchBundles(urls).then(
+        messages => { created.messages = messages as Partial<AbstractIntlMessages> },
+        error => {
+          console.error('[i18n] 消息包加载失败:', error)
+          requests.delete(key)
+          lastFailure = { pathname, key }
+        }
+      )
+    }
+    requests.set(key, created)
+    request = created
+  }
+  return request
+}
+
+/**
+ * 布局只下发首屏路由的消息；客户端导航到其他路由时，按清单下载缺少的命名空间消息包再渲染。
+ * 下载期间挂起（导航是 transition，页面保持在上一个路由），下载失败时用已有消息渲染，下次导航到该路由时重新下载
+ */
+export function RouteMessagesProvider({ locale, messages: initialMessages, children }: RouteMessagesProviderProps) {
+  const pathname = usePathname()
+  const [messages, setMessages] = useState(initialMessages)
+
+  if (lastFailure && lastFailure.pathname !== pathname) {
+    lastFailure = null
+  }
+
+  const route = matchRoute(pathname)
+  const urls = route ? getRouteBundleUrls(locale, route, Object.keys(messages)) : []
+  if (urls.length > 0) {
+    const request = requestBundles(urls, pathname)
+    if (request?.messages) {
+      setMessages({ ...messages, ...request.messages })
+    } else if (request) {
+      throw request.promise
+    }
+  }
+
+  return (
+    <NextIntlClientProvider locale={locale} messages={messages as AbstractIntlMessages}>
+      {children}
+    </NextIntlClientProvider>
+  )
+}
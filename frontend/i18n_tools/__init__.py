@@ -0,0 +1,4 @@
+"""
+i18n 工具脚本共享模块
+供 auto-translate-i18n.py、translate-new-keys.py、check-i18n.py 等脚本复用
+"""
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+按命名空间拆分的消息包
+每个语言文件按顶层命名空间拆成压缩后的 JSON 包（文件名带内容哈希，并预先生成 .gz）；
+从每个路由的 page/layout 文件出发沿 import 图收集用到的命名空间，生成 路由 -> 命名空间 清单，
+页面只需加载自己渲染的文案
+"""
+
+import gzip
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from .catalog import CatalogStore
+from .key_scanner import ScanResult
+
+DEFAULT_BUNDLE_DIR = Path('public') / 'i18n'
+DEFAULT_BUNDLE_MANIFEST = Path('lib') / 'generated' / 'i18n-bundles.json'
+BUNDLE_URL_PREFIX = '/i18n'
+BUNDLE_MANIFEST_VERSION = 1
+
+# 文件名中内容哈希的长度
+HASH_LENGTH = 8
+
+# import x from '...' / export { x } from '...' / import '...' / import('...')，跳过 import type
+IMPORT_PATTERN = re.compile(
+    r"(?:^|[;\s])(?:import|export)\s+(?!type\s)(?:[\w*{}\s,$]+?\s+from\s+)?['\"]([^'\"]+)['\"]"
+    r"|import\(\s*['\"]([^'\"]+)['\"]\s*\)")
+
+# 服务端写法 getTranslations('A') / getTranslations({ locale, namespace: 'A' })，key_scanner 不识别
+NAMESPACE_PATTERN = re.compile(r"namespace:\s*['\"]([^'\"]+)['\"]|getTranslations\(\s*['\"]([^'\"]+)['\"]")
+
+RESOLVE_SUFFIXES = ('', '.ts', '.tsx', '.js', '.jsx', '/index.ts', '/index.tsx', '/index.js', '/index.jsx')
+
+# 路由目录及其上级目录中参与渲染的特殊文件
+SEGMENT_FILES = ('layout', 'template', 'loading', 'error', 'not-found')
+PAGE_SUFFIXES = ('.tsx', '.ts', '.jsx', '.js')
+
+
+def load_path_aliases(base_dir: Path) -> Dict[str, List[Path]]:
+    """tsconfig.json 中的 paths 别名：'@/lib/' -> [<base>/lib/]，解析失败时只保留 '@/'"""
+    aliases = {'@/': [base_dir]}
+    try:
+        with open(base_dir / 'tsconfig.json', 'r', encoding='utf-8') as f:
+            options = json.load(f).get('compilerOptions', {})
+    except (OSError, ValueError):
+        return aliases
+    root = base_dir / options.get('baseUrl', '.')
+    for alias, targets in options.get('paths', {}).items():
+        if alias.endswith('/*'):
+            aliases[alias[:-1]] = [root / target.rstrip('*') for target in targets]
+    return aliases
+
+
+class ImportGraph:
+    """源码 import 图：每个文件只读取一次，记录它直接引用的本地文件和服务端命名空间"""
+
+    def __init__(self, base_dir: Path):
+        self.base_dir = Path(base_dir).resolve()
+        self.aliases = sorted(load_path_aliases(self.base_dir).items(), key=lambda item: len(item[0]),
+                              reverse=True)
+        self.imports: Dict[Path, List[Path]] = {}
+        self.namespaces: Dict[Path, Set[str]] = {}
+
+    def resolve(self, specifier: str, importer: Path) -> Optional[Path]:
+        """把 import 路径解析为本地源文件；npm 包和找不到的文件返回 None"""
+        if specifier.startswith('.'):
+            bases = [importer.parent / specifier]
+        else:
+            # 只使用最长匹配的别名
+            match = next(((alias, targets) for alias, targets in self.aliases if specifier.startswith(alias)), None)
+            if match is None:
+                return None
+            alias, targets = match
+            bases = [target / specifier[len(alias):] for target in targets]
+        for base in bases:
+            for suffix in RESOLVE_SUFFIXES:
+                candidate = Path(f'{base}{suffix}')
+                if candidate.is_file():
+                    return candidate.resolve()
+        return None
+
+    def _parse(self, path: Path) -> None:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError):
+            content = ''
+        imports = []
+        for match in IMPORT_PATTERN.finditer(content):
+            resolved = self.resolve(match.group(1) or match.group(2), path)
+            if resolved and resolved.suffix in PAGE_SUFFIXES:
+                imports.append(resolved)
+        self.imports[path] = imports
+        self.namespaces[path] = {a or b for a, b in NAMESPACE_PATTERN.findall(content)}
+
+    def reachable(self, entries: Iterable[Path]) -> Set[Path]:
+        """entries 及其直接、间接 import 的所有本地源文件"""
+        seen: Set[Path] = set()
+        stack = [Path(entry).resolve() for entry in entries]
+        while stack:
+            path = stack.pop()
+            if path in seen:
+                continue
+            seen.add(path)
+            if path not in self.imports:
+                self._parse(path)
+            stack.extend(self.imports[path])
+        return seen
+
+    def relative(self, path: Path) -> str:
+        try:
+            return path.relative_to(self.base_dir).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+
+def iter_routes(app_dir: Path) -> Dict[str, List[Path]]:
+    """路由 -> [page 文件, 各级 layout/template/loading/error/not-found 文件]，路由组 (x) 不进入路径"""
+    routes = {}
+    for page in sorted(app_dir.rglob('page.*')):
+        if page.suffix not in PAGE_SUFFIXES or 'node_modules' in page.parts:
+            continue
+        segments = page.parent.relative_to(app_dir).parts
+        route = '/' + '/'.join(s for s in segments if not (s.startswith('(') and s.endswith(')')))
+        entries = [page]
+        directory = page.parent
+        while True:
+            entries.extend(directory / f'{name}{suffix}' for name in SEGMENT_FILES for suffix in PAGE_SUFFIXES
+                           if (directory / f'{name}{suffix}').is_file())
+            if directory == app_dir:
+                break
+            directory = directory.parent
+        routes[route] = entries
+    return routes
+
+
+def namespaces_by_file(scan: ScanResult, top_level: Set[str]) -> Dict[str, Set[str]]:
+    """
+    key_scanner 结果中每个文件用到的顶层命名空间
+    useTranslations('A.b') 记为 A；useTranslations() 配合 t('A.b') 记为 A；
+    t('b') 这类相对键的首段不是顶层命名空间，忽略
+    """
+    result: Dict[str, Set[str]] = {}
+    for key, locations in scan.locations.items():
+        namespace = key.split('.', 1)[0]
+        if namespace not in top_level:
+            continue
+        for location in locations:
+            result.setdefault(location.rsplit(':', 1)[0], set()).add(namespace)
+    return result
+
+
+def route_namespaces(base_dir: Path, scan: ScanResult, top_level: Set[str],
+                     always: Iterable[str] = ()) -> Dict[str, List[str]]:
+    """路由 -> 该路由 import 图中用到的顶层命名空间（包含 always 指定的命名空间）"""
+    graph = ImportGraph(base_dir)
+    by_file = namespaces_by_file(scan, top_level)
+    always = set(always) & top_level
+    routes = {}
+    for route, entries in iter_routes(Path(base_dir) / 'app').items():
+        used = set(always)
+        for path in graph.reachable(entries):
+            used |= by_file.get(graph.relative(path), set())
+            used |= {ns.split('.', 1)[0] for ns in graph.namespaces[path]} & top_level
+        routes[route] = sorted(used)
+    return routes
+
+
+def bundle_bytes(namespace: str, value) -> bytes:
+    """压缩后的单命名空间消息包 {"<namespace>": {...}}，多个包可直接合并"""
+    return json.dumps({namespace: value}, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def build_bundles(store: CatalogStore, routes: Dict[str, List[str]]) -> Dict[str, Dict[str, bytes]]:
+    """语言 -> {命名空间: 包内容}；只输出至少被一个路由用到的命名空间"""
+    used = {namespace for namespaces in routes.values() for namespace in namespaces}
+    bundles = {}
+    for lang in store.languages():
+        data = store[lang].data
+        bundles[lang] = {namespace: bundle_bytes(namespace, data[namespace])
+                         for namespace in data if namespace in used}
+    return bundles
+
+
+def bundle_name(namespace: str, data: bytes) -> str:
+    return f'{namespace}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}.json'
+
+
+def write_bundles(bundles: Dict[str, Dict[str, bytes]], routes: Dict[str, List[str]], output_dir: Path,
+                  manifest_path: Path, check: bool = False) -> Dict[str, int]:
+    """
+    写出消息包、预压缩的 .gz 和清单，删除旧的包文件
+    文件名带内容哈希，内容不变的包不会重写；check 为 True 时只统计不写入
+    返回 {'written': n, 'removed': n, 'manifest': 0/1}
+    """
+    output_dir = Path(output_dir)
+    stats = {'written': 0, 'removed': 0, 'manifest': 0}
+    manifest_bundles: Dict[str, Dict[str, str]] = {}
+    wanted: Set[Path] = set()
+
+    for lang, namespaces in bundles.items():
+        lang_dir = output_dir / lang
+        manifest_bundles[lang] = {}
+        for namespace, data in sorted(namespaces.items()):
+            name = bundle_name(namespace, data)
+            manifest_bundles[lang][namespace] = f'{BUNDLE_URL_PREFIX}/{lang}/{name}'
+            # mtime=0 让相同内容的 .gz 字节也相同
+            for path, payload in ((lang_dir / name, data),
+                                  (lang_dir / f'{name}.gz', gzip.compress(data, compresslevel=9, mtime=0))):
+                wanted.add(path)
+                if path.exists():
+                    continue
+                stats['written'] += 1
+                if not check:
+                    lang_dir.mkdir(parents=True, exist_ok=True)
+                    path.write_bytes(payload)
+
+    if output_dir.exists():
+        for path in sorted(output_dir.glob('*/*.json*')):
+            if path not in wanted:
+                stats['removed'] += 1
+                if not check:
+                    path.unlink()
+
+    manifest = {
+        'version': BUNDLE_MANIFEST_VERSION,
+        'bundles': manifest_bundles,
+        'routes': routes,
+    }
+    manifest_data = (json.dumps(manifest, ensure_ascii=False, indent=2) + '\n').encode('utf-8')
+    manifest_path = Path(manifest_path)
+    if not manifest_path.exists() or manifest_path.read_bytes() != manifest_data:
+        stats['manifest'] = 1
+        if not check:
+            manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            manifest_path.write_bytes(manifest_data)
+
+    return stats
+
+
+def route_payloads(bundles: Dict[str, bytes], routes: Dict[str, List[str]]) -> Dict[str, Dict[str, int]]:
+    """某一语言下每个路由需要加载的字节数（原始 / gzip 后，按包分别压缩累加）"""
+    gzipped = {namespace: len(gzip.compress(data, compresslevel=9, mtime=0)) for namespace, data in bundles.items()}
+    return {route: {'bytes': sum(len(bundles[ns]) for ns in namespaces if ns in bundles),
+                    'gzip': sum(gzipped[ns] for ns in namespaces if ns in bundles)}
+            for route, namespaces in routes.items()}
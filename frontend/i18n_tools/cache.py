@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+跨运行的翻译缓存
+以 (英文原文哈希, 目标语言, 模型/接口ID) 为键存放在本地 SQLite 文件中，
+auto-translate-i18n.py 和 translate-new-keys.py 在发出网络请求前先查缓存
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent.parent / '.i18n-cache' / 'translations.sqlite3'
+
+
+def source_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class TranslationCache:
+    """本地翻译缓存，同一 model_id 下的条目可跨运行复用"""
+
+    def __init__(self, model_id: str, path: Optional[Path] = None):
+        self.model_id = model_id
+        self.path = Path(path or os.getenv('I18N_CACHE_PATH') or DEFAULT_CACHE_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute(
+            '''CREATE TABLE IF NOT EXISTS translations (
+                source_hash TEXT NOT NULL,
+                target_lang TEXT NOT NULL,
+                model_id TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (source_hash, target_lang, model_id)
+            )'''
+        )
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+
+    def get_many(self, texts: Iterable[str], target_lang: str) -> Dict[str, str]:
+        """批量查询，返回 原文 -> 译文（只包含命中的条目）"""
+        by_hash = {source_hash(text): text for text in texts}
+        found = {}
+        hashes = list(by_hash)
+        # SQLite 默认最多 999 个绑定参数
+        for start in range(0, len(hashes), 900):
+            chunk = hashes[start:start + 900]
+            rows = self.conn.execute(
+                f'''SELECT source_hash, translation FROM translations
+                    WHERE target_lang = ? AND model_id = ?
+                    AND source_hash IN ({','.join('?' * len(chunk))})''',
+                [target_lang, self.model_id, *chunk]
+            )
+            for digest, translation in rows:
+                found[by_hash[digest]] = translation
+        self.hits += len(found)
+        self.misses += len(by_hash) - len(found)
+        return found
+
+    def put_many(self, pairs: Iterable[Tuple[str, str]], target_lang: str) -> None:
+        """写入 (原文, 译文)"""
+        now = time.time()
+        rows = [(source_hash(text), target_lang, self.model_id, translation, now)
+                for text, translation in pairs]
+        if not rows:
+            return
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)', rows
+            )
+        self.stored += len(rows)
+
+    def report(self) -> None:
+        # 计数按文本条数：打包后一次调用包含多条文本，命中数不等于节省的调用次数
+        print(f"💾 翻译缓存: 命中 {self.hits} 条（这些文本直接取缓存，不再发给翻译接口），"
+              f"未命中 {self.misses} 条，新写入 {self.stored} 条")
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+async def translate_with_cache(cache: Optional[TranslationCache], texts: Sequence[str], target_lang: str,
+                               translate: Callable[[List[str]], Awaitable[List[Optional[str]]]]) -> List[Optional[str]]:
+    """
+    先查缓存，只把未命中的去重文本交给 translate，成功的结果写回缓存
+    返回与 texts 等长的列表，翻译失败的位置为 None
+    """
+    unique = list(dict.fromkeys(texts))
+    known = cache.get_many(unique, target_lang) if cache else {}
+    missing = [text for text in unique if text not in known]
+
+    if missing:
+        translated = await translate(missing)
+        fresh = [(text, value) for text, value in zip(missing, translated) if value is not None]
+        known.update(fresh)
+        if cache:
+            cache.put_many(fresh, target_lang)
+
+    return [known.get(text) for text in texts]
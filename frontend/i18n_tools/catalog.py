@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+messages/*.json 语言文件的扁平化视图
+嵌套字典 <-> {点分路径: 叶子值}，数组按叶子值处理；
+Catalog / CatalogStore 让各个脚本共用同一份已加载的语言文件，只写回有变化的文件
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .journal import atomic_write_json
+
+# 第一处缩进，用于写回时保持原文件格式
+INDENT_PATTERN = re.compile(r'\n([ \t]+)\S')
+
+
+def flatten(data: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+    """把嵌套字典展开为 {点分路径: 叶子值}，保持原有键顺序"""
+    rows = {}
+    for key, value in data.items():
+        path = f'{prefix}.{key}' if prefix else key
+        if isinstance(value, dict):
+            rows.update(flatten(value, path))
+        else:
+            rows[path] = value
+    return rows
+
+
+def unflatten(rows: Dict[str, Any]) -> Dict[str, Any]:
+    """flatten 的逆操作"""
+    data: Dict[str, Any] = {}
+    for path, value in rows.items():
+        keys = path.split('.')
+        current = data
+        for key in keys[:-1]:
+            current = current.setdefault(key, {})
+        current[keys[-1]] = value
+    return data
+
+
+class Catalog:
+    """
+    单个语言文件：只解析一次，同时保留嵌套数据（写回用）和扁平化视图（O(1) 读写）
+    写回时沿用原文件的缩进和结尾换行，键顺序不变，新键追加在所属对象末尾
+    """
+
+    def __init__(self, path: Path, data: Optional[Dict[str, Any]] = None,
+                 indent: Union[int, str] = 2, trailing_newline: bool = False):
+        self.path = Path(path)
+        self.data: Dict[str, Any] = data if data is not None else {}
+        self.rows: Dict[str, Any] = flatten(self.data)
+        self.indent = indent
+        self.trailing_newline = trailing_newline
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: Path) -> 'Catalog':
+        """加载语言文件，文件不存在时返回空目录（首次保存时创建）"""
+        path = Path(path)
+        if not path.exists():
+            return cls(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            raw = f.read()
+        match = INDENT_PATTERN.search(raw)
+        indent: Union[int, str] = 2
+        if match:
+            indent = match.group(1) if '\t' in match.group(1) else len(match.group(1))
+        return cls(path, json.loads(raw) if raw.strip() else {}, indent, raw.endswith('\n'))
+
+    @property
+    def lang(self) -> str:
+        return self.path.stem
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def get(self, path: str, default: Any = None) -> Any:
+        return self.rows.get(path, default)
+
+    def items(self):
+        return self.rows.items()
+
+    def set(self, path: str, value: Any) -> bool:
+        """设置叶子值，返回是否有变化"""
+        if path in self.rows and self.rows[path] == value:
+            return False
+
+        keys = path.split('.')
+        current = self.data
+        for depth, key in enumerate(keys[:-1]):
+            child = current.get(key)
+            if not isinstance(child, dict):
+                # 原来是叶子值的路径变成命名空间
+                self.rows.pop('.'.join(keys[:depth + 1]), None)
+                child = current[key] = {}
+            current = child
+
+        previous = current.get(keys[-1])
+        if isinstance(previous, dict):
+            # 原来的命名空间被叶子值替换
+            prefix = path + '.'
+            for stale in [row for row in self.rows if row.startswith(prefix)]:
+                del self.rows[stale]
+        current[keys[-1]] = value
+        self.rows[path] = value
+        self.dirty = True
+        return True
+
+    def update(self, rows: Dict[str, Any]) -> int:
+        """批量设置，返回实际变化的键数"""
+        return sum(1 for path, value in rows.items() if self.set(path, value))
+
+    def save(self, force: bool = False) -> bool:
+        """有变化时原子写回，返回是否写了文件"""
+        if not (self.dirty or force):
+            return False
+        atomic_write_json(self.path, self.data, indent=self.indent, trailing_newline=self.trailing_newline)
+        self.dirty = False
+        return True
+
+
+class CatalogStore:
+    """messages/ 目录下语言文件的缓存：每个文件在一次运行中只加载一次"""
+
+    def __init__(self, messages_dir: Path = Path('messages')):
+        self.messages_dir = Path(messages_dir)
+        self.catalogs: Dict[str, Catalog] = {}
+
+    def path(self, lang_code: str) -> Path:
+        return self.messages_dir / f'{lang_code}.json'
+
+    def languages(self) -> List[str]:
+        """目录下存在的语言代码（按字母顺序）"""
+        return sorted(path.stem for path in self.messages_dir.glob('*.json'))
+
+    def is_loaded(self, lang_code: str) -> bool:
+        return lang_code in self.catalogs
+
+    def get(self, lang_code: str) -> Catalog:
+        catalog = self.catalogs.get(lang_code)
+        if catalog is None:
+            catalog = self.catalogs[lang_code] = Catalog.load(self.path(lang_code))
+        return catalog
+
+    def __getitem__(self, lang_code: str) -> Catalog:
+        return self.get(lang_code)
+
+    def save_all(self) -> List[str]:
+        """写回所有有变化的语言文件，返回写回的语言代码"""
+        return [lang_code for lang_code, catalog in self.catalogs.items() if catalog.save()]
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+多语言键值一致性检查引擎
+每个语言文件只解析、扁平化一次（与其他工具共用 CatalogStore）；英文键路径建成前缀树索引，
+未翻译标记在整份语言文件上单次扫描完成，各语言在进程池中并行检查
+"""
+
+import bisect
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .catalog import Catalog, CatalogStore
+
+UNTRANSLATED_MARKERS = [
+    '待翻译', 'يحتاج ترجمة', 'अनुवाद की आवश्यकता',
+    'Gen pou tradwi', 'Need translation', 'TODO:', 'FIXME:'
+]
+
+# 报告中的值截断长度
+VALUE_PREVIEW_LENGTH = 100
+
+
+class KeyIndex:
+    """键路径前缀树：按路径段逐级查找，判断完整键或命名空间是否存在"""
+
+    def __init__(self, paths: Iterable[str]):
+        self.keys: Set[str] = set()
+        self.root: Dict[str, Any] = {}
+        for path in paths:
+            self.keys.add(path)
+            node = self.root
+            for part in path.split('.'):
+                node = node.setdefault(part, {})
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.keys
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def has_namespace(self, path: str) -> bool:
+        """path 是否为某些键的前缀（命名空间）"""
+        node = self.root
+        for part in path.split('.'):
+            node = node.get(part)
+            if node is None:
+                return False
+        return bool(node)
+
+    def is_defined(self, path: str) -> bool:
+        return path in self.keys or self.has_namespace(path)
+
+
+class MarkerMatcher:
+    """
+    多模式未翻译标记匹配
+    把所有标记编译成一个正则交替式，在整份语言文件拼接后的文本上扫描一遍，
+    再用二分查找把命中位置映射回键路径
+    """
+
+    SEPARATOR = '\x00'
+
+    def __init__(self, markers: Iterable[str] = UNTRANSLATED_MARKERS):
+        markers = sorted(set(markers), key=len, reverse=True)
+        self.pattern = re.compile('|'.join(re.escape(marker) for marker in markers))
+
+    def scan(self, rows: Dict[str, Any]) -> List[Dict[str, str]]:
+        """返回 [{key, value, marker}]，每个键只报告第一个命中的标记"""
+        paths = []
+        starts = []
+        chunks = []
+        offset = 0
+        for path, value in rows.items():
+            if not isinstance(value, str):
+                continue
+            paths.append(path)
+            starts.append(offset)
+            chunks.append(value)
+            offset += len(value) + 1
+
+        text = self.SEPARATOR.join(chunks)
+        found = []
+        last_index = -1
+        for match in self.pattern.finditer(text):
+            index = bisect.bisect_right(starts, match.start()) - 1
+            if index == last_index:
+                continue
+            last_index = index
+            value = chunks[index]
+            if len(value) > VALUE_PREVIEW_LENGTH:
+                value = value[:VALUE_PREVIEW_LENGTH] + '...'
+            found.append({'key': paths[index], 'value': value, 'marker': match.group(0)})
+        return found
+
+
+def check_language(lang_code: str, rows: Dict[str, Any], en_keys: Set[str],
+                   matcher: Optional[MarkerMatcher] = None) -> Dict[str, Any]:
+    """检查一种语言的扁平化数据"""
+    matcher = matcher or MarkerMatcher()
+    lang_keys = set(rows)
+    return {
+        'lang': lang_code,
+        'keyCount': len(lang_keys),
+        'missingKeys': sorted(en_keys - lang_keys),
+        'extraKeys': sorted(lang_keys - en_keys),
+        'untranslated': matcher.scan(rows),
+    }
+
+
+def _check_file(lang_code: str, file_path: str, en_keys: Set[str]) -> Dict[str, Any]:
+    """进程池任务：加载、扁平化并检查一个语言文件"""
+    return check_language(lang_code, Catalog.load(Path(file_path)).rows, en_keys)
+
+
+def check_catalogs(store: CatalogStore, base_lang: str = 'en', workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    检查 store 中所有语言文件，返回可直接序列化为 JSON 的报告
+    store 中已加载的语言直接复用其扁平化视图；其余语言文件交给进程池加载并检查，
+    workers 为 1 时全部在当前进程通过 store 加载、顺序检查
+    """
+    languages = store.languages()
+    if base_lang not in languages:
+        raise FileNotFoundError(f"找不到基准语言文件 {base_lang}.json")
+
+    en_index = KeyIndex(store[base_lang].rows)
+    others = [lang for lang in languages if lang != base_lang]
+    unloaded = [lang for lang in others if not store.is_loaded(lang)]
+
+    results: Dict[str, Dict[str, Any]] = {}
+    errors: Dict[str, str] = {}
+    workers = workers or min(len(unloaded), os.cpu_count() or 1)
+
+    if workers > 1 and len(unloaded) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {lang: pool.submit(_check_file, lang, str(store.path(lang)), en_index.keys)
+                       for lang in unloaded}
+            for lang, future in futures.items():
+                try:
+                    results[lang] = future.result()
+                except Exception as e:
+                    errors[lang] = str(e)
+
+    matcher = MarkerMatcher()
+    for lang in others:
+        if lang in results or lang in errors:
+            continue
+        try:
+            results[lang] = check_language(lang, store[lang].rows, en_index.keys, matcher)
+        except Exception as e:
+            errors[lang] = str(e)
+
+    results = {lang: results[lang] for lang in others if lang in results}
+
+    summary = {
+        'complete': [lang for lang, r in results.items()
+                     if not r['missingKeys'] and not r['extraKeys'] and not r['untranslated']],
+        'missing_keys': [lang for lang, r in results.items() if r['missingKeys']],
+        'extra_keys': [lang for lang, r in results.items() if r['extraKeys']],
+        'untranslated': [lang for lang, r in results.items() if r['untranslated']],
+    }
+
+    return {
+        'base': base_lang,
+        'baseKeyCount': len(en_index),
+        'languages': results,
+        'errors': errors,
+        'summary': summary,
+        'index': en_index,
+    }
+
+
+def find_undefined_keys(used_keys: Iterable[str], en_index: KeyIndex) -> List[str]:
+    """代码中使用但既不是键也不是命名空间的翻译键"""
+    return sorted(key for key in used_keys if not en_index.is_defined(key))
+
+
+def to_json(report: Dict[str, Any]) -> str:
+    """机器可读输出（去掉内部索引）"""
+    return json.dumps({k: v for k, v in report.items() if k != 'index'}, ensure_ascii=False, indent=2)
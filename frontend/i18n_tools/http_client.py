@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+异步翻译 HTTP 客户端
+并发上限 + 令牌桶限速，根据 429/5xx 和 Retry-After 自适应调整并发，
+复用连接池中的 keep-alive 连接，重试退避只影响单个请求
+"""
+
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 需要退避重试的状态码
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class TranslationRequestError(Exception):
+    """请求在重试后仍然失败"""
+
+
+class TokenBucket:
+    """令牌桶限速器：rate 个请求/秒，最多突发 capacity 个"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AdaptiveConcurrency:
+    """
+    自适应并发限制（AIMD）
+    被限流或服务端出错时并发减半，连续成功后逐步加一，不超过 max_limit
+    """
+
+    def __init__(self, max_limit: int, increase_after: int = 10, cooldown: float = 1.0):
+        self.max_limit = max(1, max_limit)
+        self.limit = self.max_limit
+        self.in_flight = 0
+        self.increase_after = increase_after
+        self.success_streak = 0
+        self.cooldown = cooldown
+        self.last_decrease = 0.0
+        self.condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    async def release(self) -> None:
+        async with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def on_success(self) -> None:
+        self.success_streak += 1
+        if self.success_streak >= self.increase_after and self.limit < self.max_limit:
+            self.limit += 1
+            self.success_streak = 0
+
+    def on_throttle(self) -> None:
+        self.success_streak = 0
+        # 同一波并发请求同时被限流时只减半一次
+        now = time.monotonic()
+        if now - self.last_decrease >= self.cooldown:
+            self.limit = max(1, self.limit // 2)
+            self.last_decrease = now
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析 Retry-After 头（秒数或 HTTP 日期）"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AsyncTranslationClient:
+    """带限速与自适应并发的异步 JSON POST 客户端"""
+
+    def __init__(self, url: str, headers: Optional[Dict[str, str]] = None,
+                 max_concurrency: int = 4, rate: float = 2.0, burst: Optional[float] = None,
+                 max_retries: int = 5, timeout: float = 30, backoff_base: float = 1.0,
+                 backoff_max: float = 60.0):
+        self.url = url
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        # 连接池大小与并发上限一致，保持 keep-alive 连接复用
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, max_concurrency))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+        self.concurrency = AdaptiveConcurrency(max_concurrency)
+        self.bucket = TokenBucket(rate, burst)
+        self.stats = {'requests': 0, 'retries': 0, 'throttled': 0, 'failures': 0}
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)  # 抖动，避免重试同时涌入
+
+    async def post_json(self, payload: Dict[str, Any]) -> Any:
+        """发送 POST 请求并返回 JSON，可重试的错误按单个请求退避"""
+        last_error = None
+
+        for attempt in range(self.max_retries):
+            if attempt > 0:
+                self.stats['retries'] += 1
+
+            await self.concurrency.acquire()
+            try:
+                await self.bucket.acquire()
+                self.stats['requests'] += 1
+                response = await asyncio.to_thread(
+                    self.session.post, self.url, json=payload, timeout=self.timeout
+                )
+            except requests.exceptions.RequestException as e:
+                response = None
+                last_error = f"网络错误: {e}"
+            finally:
+                await self.concurrency.release()
+
+            is_last = attempt == self.max_retries - 1
+            if response is not None:
+                if response.status_code == 200:
+                    try:
+                        result = response.json()
+                    except ValueError:
+                        # 网关或冷启动时可能返回 HTML/空响应体，按可重试的失败处理
+                        last_error = f"响应不是有效的 JSON: {response.text[:200]!r}"
+                    else:
+                        self.concurrency.on_success()
+                        return result
+                else:
+                    last_error = f"API错误 {response.status_code}: {response.text[:200]}"
+                    if response.status_code not in RETRYABLE_STATUS:
+                        break
+
+                    self.stats['throttled'] += 1
+                    self.concurrency.on_throttle()
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    if retry_after is not None:
+                        # 最后一次尝试之后直接放弃，不再等待
+                        if not is_last:
+                            await asyncio.sleep(min(retry_after, self.backoff_max))
+                        continue
+
+            if not is_last:
+                await asyncio.sleep(self._backoff(attempt))
+
+        self.stats['failures'] += 1
+        raise TranslationRequestError(last_error or "未知错误")
+
+    def close(self) -> None:
+        self.session.close()
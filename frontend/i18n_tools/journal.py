@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+语言文件翻译的增量检查点
+每条译文完成后先追加写入日志，再按时间/条数间隔原子写回 messages/<lang>.json；
+中途崩溃或 Ctrl-C 后重新运行时回放日志，只翻译尚未完成的键
+"""
+
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+
+def atomic_write_json(path: Path, data: Any, indent: Union[int, str] = 2, trailing_newline: bool = False) -> None:
+    """先写临时文件再 rename，保证目标文件要么是旧内容要么是完整的新内容"""
+    path = Path(path)
+    tmp_path = path.with_name(f'.{path.name}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+        if trailing_newline:
+            f.write('\n')
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def journal_path(lang_file: Path) -> Path:
+    lang_file = Path(lang_file)
+    return lang_file.with_name(f'.{lang_file.name}.journal')
+
+
+def replay_journal(catalog, source_of: Optional[Callable[[str], Optional[str]]] = None) -> int:
+    """
+    把上次未写回的日志条目应用到语言文件 catalog（i18n_tools.catalog.Catalog），返回应用的条目数
+    source_of 返回键当前的英文原文；原文已变化的条目会被丢弃
+    """
+    path = journal_path(catalog.path)
+    if not path.exists():
+        return 0
+
+    applied = 0
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # 崩溃时最后一行可能只写了一半
+                continue
+            if source_of and source_of(entry['key']) != entry.get('source'):
+                continue
+            catalog.set(entry['key'], entry['value'])
+            applied += 1
+    return applied
+
+
+class CheckpointedLanguageFile:
+    """语言文件的检查点写入器"""
+
+    def __init__(self, catalog, interval: float = 30.0, every: int = 50):
+        self.catalog = catalog
+        self.lang_file = catalog.path
+        self.interval = interval
+        self.every = every
+        self.journal = open(journal_path(self.lang_file), 'a', encoding='utf-8')
+        self.pending = 0
+        self.last_flush = time.monotonic()
+        self.backed_up = False
+
+    def record(self, key_path: str, source: str, value: str) -> None:
+        """记录一条译文：更新内存数据并追加到日志，必要时写回语言文件"""
+        self.catalog.set(key_path, value)
+        self.journal.write(json.dumps({'key': key_path, 'source': source, 'value': value},
+                                      ensure_ascii=False) + '\n')
+        self.journal.flush()
+        self.pending += 1
+        if self.pending >= self.every or time.monotonic() - self.last_flush >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """语言文件有变化时原子写回，随后清空已落盘的日志"""
+        if self.catalog.dirty and not self.backed_up and self.lang_file.exists():
+            backup_file = self.lang_file.with_name(f'{self.lang_file.name}.backup')
+            shutil.copyfile(self.lang_file, backup_file)
+            print(f"💾 创建备份: {backup_file}")
+            self.backed_up = True
+
+        self.catalog.save()
+        self.journal.truncate(0)
+        self.journal.seek(0)
+        self.pending = 0
+        self.last_flush = time.monotonic()
+
+    def close(self) -> None:
+        """最终写回并删除日志"""
+        self.flush()
+        self.journal.close()
+        journal_path(self.lang_file).unlink(missing_ok=True)
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+代码中翻译键使用情况扫描
+所有调用形式合并成一个正则，源码目录只遍历一次（跳过 node_modules 和隐藏目录），
+文件在进程池中扫描；每个文件的结果按 mtime/size 缓存，再次运行时只重新扫描改动过的文件
+"""
+
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .cache import DEFAULT_CACHE_PATH
+from .journal import atomic_write_json
+
+# useTranslations('key') / t('key') / tNav('key') / tLayout('key') / tCommon('key')
+CALL_PATTERN = re.compile(r"(?:useTranslations|tNav|tLayout|tCommon|t)\(['\"]([^'\"]+)['\"]\)")
+
+SOURCE_ROOTS = ('components', 'app', 'lib')
+SOURCE_SUFFIXES = ('.ts', '.tsx')
+PRUNED_DIRS = {'node_modules'}
+
+DEFAULT_SCAN_CACHE = Path(os.getenv('I18N_SCAN_CACHE_PATH') or DEFAULT_CACHE_PATH.parent / 'key-scan.json')
+SCAN_CACHE_VERSION = 1
+
+# 待扫描文件少于该数量时不启动进程池
+PARALLEL_THRESHOLD = 64
+
+# 单个文件的扫描结果：[(键, 行号)]
+FileHits = List[Tuple[str, int]]
+
+
+def iter_source_files(base_dir: Path, roots: Sequence[str] = SOURCE_ROOTS) -> Iterator[Path]:
+    """单次遍历源码目录，跳过 node_modules 和以 . 开头的目录"""
+    for root in roots:
+        for dirpath, dirnames, filenames in os.walk(Path(base_dir) / root):
+            dirnames[:] = sorted(d for d in dirnames if d not in PRUNED_DIRS and not d.startswith('.'))
+            for filename in sorted(filenames):
+                if filename.endswith(SOURCE_SUFFIXES):
+                    yield Path(dirpath) / filename
+
+
+def scan_text(content: str) -> FileHits:
+    """返回文本中所有翻译键及其所在行号"""
+    hits = []
+    line = 1
+    position = 0
+    for match in CALL_PATTERN.finditer(content):
+        line += content.count('\n', position, match.start())
+        position = match.start()
+        hits.append((match.group(1), line))
+    return hits
+
+
+def scan_file(file_path: str) -> Tuple[str, Optional[FileHits], Optional[str]]:
+    """进程池任务：返回 (路径, 结果, 错误信息)"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return file_path, scan_text(f.read()), None
+    except Exception as e:
+        return file_path, None, str(e)
+
+
+class ScanResult:
+    """扫描结果：键 -> ['文件:行号', ...]"""
+
+    def __init__(self):
+        self.locations: Dict[str, List[str]] = {}
+        self.errors: Dict[str, str] = {}
+        self.files = 0
+        self.scanned = 0
+
+    @property
+    def keys(self) -> Set[str]:
+        return set(self.locations)
+
+    def add(self, file_path: str, hits: FileHits) -> None:
+        for key, line in hits:
+            self.locations.setdefault(key, []).append(f"{file_path}:{line}")
+
+
+def _load_scan_cache(path: Path) -> Dict[str, dict]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != SCAN_CACHE_VERSION:
+        return {}
+    return data.get('files', {})
+
+
+def scan_keys(base_dir: Path = Path('.'), cache_path: Optional[Path] = DEFAULT_SCAN_CACHE,
+              workers: Optional[int] = None) -> ScanResult:
+    """
+    扫描 base_dir 下源码中使用的翻译键
+    cache_path 为 None 时不读写缓存；workers 为 1 时在当前进程顺序扫描
+    """
+    base_dir = Path(base_dir)
+    cached = _load_scan_cache(cache_path) if cache_path else {}
+    entries: Dict[str, dict] = {}
+    stale: Dict[str, os.stat_result] = {}
+
+    for path in iter_source_files(base_dir):
+        file_path = path.relative_to(base_dir).as_posix()
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entry = cached.get(file_path)
+        if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            entries[file_path] = entry
+        else:
+            stale[file_path] = stat
+
+    result = ScanResult()
+    workers = workers or os.cpu_count() or 1
+    paths = [str(base_dir / file_path) for file_path in stale]
+
+    if workers <= 1 or len(paths) < PARALLEL_THRESHOLD:
+        scanned = map(scan_file, paths)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        scanned = pool.map(scan_file, paths, chunksize=max(1, len(paths) // (workers * 4)))
+
+    try:
+        for file_path, (_, hits, error) in zip(stale, scanned):
+            if error is not None:
+                result.errors[file_path] = error
+                continue
+            stat = stale[file_path]
+            entries[file_path] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'keys': hits}
+            result.scanned += 1
+    finally:
+        if pool:
+            pool.shutdown()
+
+    for file_path in sorted(entries):
+        result.add(file_path, entries[file_path]['keys'])
+    result.files = len(entries)
+
+    if cache_path and (stale or set(cached) != set(entries)):
+        Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_json(Path(cache_path), {'version': SCAN_CACHE_VERSION, 'files': entries})
+
+    return result
+
+
+def find_unused_keys(defined_keys: Iterable[str], used_keys: Set[str]) -> List[str]:
+    """
+    代码中没有出现的已定义键
+    useTranslations('A') 配合 t('b.c') 时视为使用了 A.b.c；动态拼接的键无法识别，结果仅供参考
+    """
+    unused = []
+    for key in defined_keys:
+        if key in used_keys:
+            continue
+        parts = key.split('.')
+        if not any('.'.join(parts[:i]) in used_keys and '.'.join(parts[i:]) in used_keys
+                   for i in range(1, len(parts))):
+            unused.append(key)
+    return sorted(unused)
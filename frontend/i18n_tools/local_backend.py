@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+本地 NLLB 翻译后端
+在进程内直接加载 microservices/nllb-local/scripts/translate.py 中的 NLLBTranslator，
+把待翻译文本整批交给模型，不经过任何 HTTP 请求
+"""
+
+import asyncio
+import importlib.util
+import os
+from pathlib import Path
+from typing import Callable, List, Optional
+
+DEFAULT_SCRIPT_PATH = (Path(__file__).resolve().parent.parent.parent
+                       / 'microservices' / 'nllb-local' / 'scripts' / 'translate.py')
+
+SOURCE_LANG = "eng_Latn"
+
+
+def load_translator_module(script_path: Path):
+    """按文件路径导入 translate.py（缺少 torch/transformers 时该脚本会直接退出）"""
+    spec = importlib.util.spec_from_file_location('nllb_local_translate', script_path)
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except SystemExit:
+        raise RuntimeError("本地 NLLB 后端需要安装 torch、transformers 和 sentencepiece")
+    return module
+
+
+class LocalNLLBBackend:
+    """进程内 NLLB 翻译后端"""
+
+    def __init__(self, script_path: Optional[Path] = None, model_dir: Optional[Path] = None,
+                 batch_size: int = 32):
+        self.script_path = Path(script_path or os.getenv('NLLB_LOCAL_SCRIPT') or DEFAULT_SCRIPT_PATH)
+        self.batch_size = batch_size
+        module = load_translator_module(self.script_path)
+        if model_dir or os.getenv('NLLB_MODEL_DIR'):
+            module.model_dir = Path(model_dir or os.getenv('NLLB_MODEL_DIR'))
+        self.model_dir = Path(module.model_dir)
+        self.translator = module.NLLBTranslator()
+        # 模型只能串行使用
+        self.lock = asyncio.Lock()
+
+    @property
+    def model_id(self) -> str:
+        """缓存键中使用的模型ID"""
+        return f"nllb-local:{self.model_dir.name}"
+
+    def load(self) -> bool:
+        print(f"🧠 加载本地 NLLB 模型: {self.model_dir}")
+        return self.translator.load_model()
+
+    async def translate_texts(self, texts: List[str], target_lang: str,
+                              on_progress: Optional[Callable[[int], None]] = None,
+                              on_result: Optional[Callable[[str, str], None]] = None) -> List[Optional[str]]:
+        """整批翻译，generate 在工作线程中运行，不阻塞事件循环"""
+        results: List[Optional[str]] = []
+        # 每次交给模型多个批次，既保持大批量 generate 又能汇报进度
+        chunk = self.batch_size * 4
+        async with self.lock:
+            for start in range(0, len(texts), chunk):
+                part = texts[start:start + chunk]
+                translated = await asyncio.to_thread(
+                    self.translator.translate_batch, part, SOURCE_LANG, target_lang, self.batch_size
+                )
+                translated = [value.strip() if value else None for value in translated]
+                results.extend(translated)
+                if on_result:
+                    for text, value in zip(part, translated):
+                        if value:
+                            on_result(text, value)
+                if on_progress:
+                    on_progress(sum(1 for value in translated if value))
+        return results
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+英文键值同步清单
+记录上次同步时 messages/en.json 中每个键路径的内容哈希，
+下次同步时与当前 en.json 对比，找出新增、修改和删除的键
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .journal import atomic_write_json
+
+MANIFEST_FILE = '.sync-manifest.json'
+MANIFEST_VERSION = 1
+
+
+def content_hash(value: Any) -> str:
+    encoded = json.dumps(value, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def build_manifest(rows: Dict[str, Any]) -> Dict[str, str]:
+    """{路径: 叶子值} -> {路径: 内容哈希}"""
+    return {path: content_hash(value) for path, value in rows.items()}
+
+
+def load_manifest(path: Path) -> Optional[Dict[str, str]]:
+    """读取清单，不存在时返回 None（首次同步）"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get('keys', {})
+
+
+def save_manifest(path: Path, rows: Dict[str, Any], previous: Optional[Dict[str, str]] = None,
+                  pending: Iterable[str] = ()) -> None:
+    """
+    把当前 rows 记为已同步；pending 中的键（本次没有同步成功）保留 previous 中的旧哈希，
+    旧清单中没有时不记录，下次同步时仍会被识别为修改/新增
+    """
+    keys = build_manifest(rows)
+    for key in pending:
+        if previous and key in previous:
+            keys[key] = previous[key]
+        else:
+            keys.pop(key, None)
+    atomic_write_json(path, {
+        'version': MANIFEST_VERSION,
+        'source': 'en.json',
+        'keys': keys
+    })
+
+
+def diff_manifest(rows: Dict[str, Any], manifest: Dict[str, str]) -> Tuple[List[str], List[str], List[str]]:
+    """返回 (新增, 修改, 删除) 的键路径"""
+    added = [path for path in rows if path not in manifest]
+    modified = [path for path in rows if path in manifest and manifest[path] != content_hash(rows[path])]
+    removed = [path for path in manifest if path not in rows]
+    return added, modified, removed
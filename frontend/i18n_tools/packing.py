@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+多文本打包请求
+按字符预算把多条界面文案打包进一次请求，返回后拆包校验；
+数量对不上时把该批对半拆分重试，直到单条为止。请求本身失败（重试耗尽）时整批放弃，不拆分
+"""
+
+import asyncio
+import re
+from typing import Awaitable, Callable, List, Optional, Sequence
+
+# 打包标记：[[0]] 第一条\n[[1]] 第二条
+MARKER_PATTERN = re.compile(r'\[\[\s*(\d+)\s*\]\]')
+
+# 发送一批文本，返回同样数量的译文；格式异常时返回 None
+SendBatch = Callable[[List[str]], Awaitable[Optional[List[str]]]]
+
+
+def is_packable(text: str) -> bool:
+    """文本本身包含标记样式时不能安全打包，只能单独发送"""
+    return '[[' not in text and ']]' not in text
+
+
+def pack_texts(texts: Sequence[str]) -> str:
+    """用编号标记把多条文本拼成一条"""
+    return '\n'.join(f'[[{i}]] {text}' for i, text in enumerate(texts))
+
+
+def unpack_texts(packed: str, expected: int) -> Optional[List[str]]:
+    """按编号标记拆包，编号缺失、重复或乱序时返回 None"""
+    matches = list(MARKER_PATTERN.finditer(packed))
+    if [int(m.group(1)) for m in matches] != list(range(expected)):
+        return None
+
+    parts = []
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(packed)
+        parts.append(packed[match.end():end].strip())
+    return parts
+
+
+def plan_batches(texts: Sequence[str], max_chars: int, max_items: int) -> List[List[int]]:
+    """按字符预算和条数上限把文本下标分组，不可打包的文本单独成批"""
+    batches = []
+    current = []
+    current_chars = 0
+
+    for index, text in enumerate(texts):
+        if not is_packable(text):
+            batches.append([index])
+            continue
+        if current and (current_chars + len(text) > max_chars or len(current) >= max_items):
+            batches.append(current)
+            current = []
+            current_chars = 0
+        current.append(index)
+        current_chars += len(text)
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def translate_in_batches(texts: Sequence[str], send_batch: SendBatch,
+                               max_chars: int = 1000, max_items: int = 32,
+                               on_progress: Optional[Callable[[int], None]] = None,
+                               on_result: Optional[Callable[[str, str], None]] = None) -> List[Optional[str]]:
+    """
+    打包翻译 texts，返回与输入等长的列表，无法翻译的位置为 None
+    只有返回数量/标记对不上时才拆分重试；send_batch 抛出异常（限流、服务端错误、超时在客户端重试耗尽后）
+    时整批记为失败，避免把一个失败请求放大成 2N-1 个各自带完整重试预算的子请求，加重服务端压力。
+    on_result 在每条译文完成时立即回调 (原文, 译文)
+    """
+    results: List[Optional[str]] = [None] * len(texts)
+
+    async def run(indices: List[int]) -> None:
+        batch = [texts[i] for i in indices]
+        try:
+            translated = await send_batch(batch)
+        except Exception as e:
+            print(f"  ❌ 批量请求失败，放弃该批 ({len(batch)} 条): {e}")
+            if on_progress:
+                on_progress(len(indices))
+            return
+
+        if translated is not None and len(translated) == len(batch) and all(translated):
+            for index, value in zip(indices, translated):
+                results[index] = value
+                if on_result:
+                    on_result(texts[index], value)
+            if on_progress:
+                on_progress(len(indices))
+            return
+
+        if len(indices) == 1:
+            if on_progress:
+                on_progress(1)
+            return
+
+        # 数量对不上：对半拆分后分别重试
+        middle = len(indices) // 2
+        await asyncio.gather(run(indices[:middle]), run(indices[middle:]))
+
+    await asyncio.gather(*(run(batch) for batch in plan_batches(texts, max_chars, max_items)))
+    return results
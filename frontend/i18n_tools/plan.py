@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+自动翻译计划
+先收集所有语言文件需要的 (英文原文, 目标语言) 并去重，
+再统一调度翻译，结果写回引用该原文的每一个键
+"""
+
+from typing import Callable, Dict, List
+
+
+class TranslationPlan:
+    """语言代码 -> 英文原文 -> 需要写回的键路径列表"""
+
+    def __init__(self):
+        self.work: Dict[str, Dict[str, List[str]]] = {}
+
+    def add(self, lang_code: str, key_path: str, en_text: str) -> None:
+        self.work.setdefault(lang_code, {}).setdefault(en_text, []).append(key_path)
+
+    def languages(self) -> List[str]:
+        return [lang for lang, texts in self.work.items() if texts]
+
+    def texts(self, lang_code: str) -> List[str]:
+        return list(self.work.get(lang_code, {}))
+
+    @property
+    def key_count(self) -> int:
+        return sum(len(paths) for texts in self.work.values() for paths in texts.values())
+
+    @property
+    def unique_count(self) -> int:
+        return sum(len(texts) for texts in self.work.values())
+
+    def apply(self, lang_code: str, translations: Dict[str, str],
+              update: Callable[[str, str], None]) -> int:
+        """把译文写回该语言所有引用此原文的键，返回更新的键数量"""
+        updated = 0
+        for en_text, key_paths in self.work.get(lang_code, {}).items():
+            translated = translations.get(en_text)
+            if not translated or translated == en_text:
+                continue
+            for key_path in key_paths:
+                update(key_path, translated)
+                updated += 1
+        return updated
+
+    def summary(self) -> str:
+        return (f"{len(self.languages())} 种语言, {self.key_count} 个键, "
+                f"{self.unique_count} 条去重后的翻译任务 "
+                f"(节省 {self.key_count - self.unique_count} 条重复)")
+
+
+class PlanProgress:
+    """整个计划共用的进度视图"""
+
+    def __init__(self, plan: TranslationPlan):
+        self.totals = {lang: len(plan.texts(lang)) for lang in plan.languages()}
+        self.done = {lang: 0 for lang in self.totals}
+
+    def advance(self, lang_code: str, count: int) -> None:
+        self.done[lang_code] += count
+        total = sum(self.totals.values())
+        finished = sum(self.done.values())
+        percent = finished / total * 100 if total else 100.0
+        per_lang = ', '.join(f"{lang} {self.done[lang]}/{self.totals[lang]}" for lang in self.totals)
+        print(f"  📈 总进度: {finished}/{total} ({percent:.1f}%) | {per_lang}")
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""
+本地替身翻译服务
+同时支持 Hugging Face Space 接口（{"text", "source", "target"} -> {"result"}）和
+推理 API（{"inputs": [...], "parameters": {...}} -> [{"translation_text"}]）两种请求格式，
+可配置响应延迟分布、429/5xx 注入和 Retry-After，用于离线测量翻译客户端的吞吐和重试行为
+
+python -m i18n_tools.stub_server --port 8765 --latency lognormal:0.3,0.5 --throttle-rate 0.1
+HF_SPACE_URL=http://127.0.0.1:8765 python auto-translate-i18n.py --no-cache
+HF_API_URL=http://127.0.0.1:8765 python translate-new-keys.py sync --no-cache
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .packing import MARKER_PATTERN
+
+# 注入的服务端错误状态码
+SERVER_ERROR_STATUS = (500, 502, 503, 504)
+
+# 打包文本中每一段：[[n]] 后到下一个标记之前
+PACKED_SEGMENT_PATTERN = re.compile(r'(\[\[\s*\d+\s*\]\]\s*)([^\n]*)')
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    延迟分布（秒）：
+    fixed:0.1 | uniform:0.05,0.3 | normal:均值,标准差 | lognormal:中位数,sigma | exp:均值
+    """
+    kind, _, params = spec.partition(':')
+    try:
+        values = [float(value) for value in params.split(',')] if params else []
+    except ValueError:
+        raise ValueError(f"无效的延迟分布: {spec}")
+
+    samplers = {
+        'fixed': (1, lambda rng, v: v[0]),
+        'uniform': (2, lambda rng, v: rng.uniform(v[0], v[1])),
+        'normal': (2, lambda rng, v: rng.gauss(v[0], v[1])),
+        'lognormal': (2, lambda rng, v: v[0] * rng.lognormvariate(0, v[1])),
+        'exp': (1, lambda rng, v: rng.expovariate(1 / v[0]) if v[0] > 0 else 0.0),
+    }
+    if kind not in samplers or len(values) != samplers[kind][0]:
+        raise ValueError(f"无效的延迟分布: {spec}（可用: {', '.join(samplers)}）")
+    sample = samplers[kind][1]
+    return lambda rng: max(0.0, sample(rng, values))
+
+
+def fake_translate(text: str, target: str) -> str:
+    """确定性的“译文”：每段前加 <目标语言>，保留打包标记，便于客户端拆包"""
+    if MARKER_PATTERN.search(text):
+        return PACKED_SEGMENT_PATTERN.sub(lambda m: f'{m.group(1)}<{target}> {m.group(2)}', text)
+    return f'<{target}> {text}'
+
+
+@dataclass
+class StubConfig:
+    latency: str = 'fixed:0'
+    # 每个字符额外的处理时间（秒），模拟长文本更慢
+    per_char: float = 0.0
+    throttle_rate: float = 0.0
+    error_rate: float = 0.0
+    # 429 的 Retry-After 秒数，None 表示不带该头
+    retry_after: Optional[float] = 1.0
+    # Retry-After 使用 HTTP 日期格式而不是秒数
+    retry_after_date: bool = False
+    # 同时处理的请求数上限，超出时返回 429，0 表示不限制
+    max_concurrency: int = 0
+    seed: Optional[int] = None
+
+
+class StubStats:
+    """线程安全的请求统计"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.requests = 0
+            self.strings = 0
+            self.characters = 0
+            self.status: Dict[int, int] = {}
+            self.formats: Dict[str, int] = {}
+            self.peak_concurrency = 0
+            self.in_flight = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'requests': self.requests,
+                'strings': self.strings,
+                'characters': self.characters,
+                'status': {str(code): count for code, count in sorted(self.status.items())},
+                'formats': dict(self.formats),
+                'peakConcurrency': self.peak_concurrency,
+            }
+
+
+class StubTranslationServer(ThreadingHTTPServer):
+    """替身翻译服务，每个请求在独立线程中处理"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], config: StubConfig):
+        super().__init__(address, StubRequestHandler)
+        self.config = config
+        self.sample_latency = parse_latency(config.latency)
+        self.rng = random.Random(config.seed)
+        self.rng_lock = threading.Lock()
+        self.stats = StubStats()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def roll(self) -> Tuple[float, float, int]:
+        """(决定是否注入错误的随机数, 本次延迟, 注入 5xx 时的状态码)"""
+        with self.rng_lock:
+            return self.rng.random(), self.sample_latency(self.rng), self.rng.choice(SERVER_ERROR_STATUS)
+
+    def start(self) -> threading.Thread:
+        """在后台线程中运行，配合 shutdown() 使用"""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    server: StubTranslationServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def throttle_headers(self) -> Dict[str, str]:
+        retry_after = self.server.config.retry_after
+        if retry_after is None:
+            return {}
+        if self.server.config.retry_after_date:
+            return {'Retry-After': formatdate(time.time() + retry_after, usegmt=True)}
+        return {'Retry-After': f'{retry_after:g}'}
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/stats':
+            self.send_json(200, self.server.stats.snapshot())
+        else:
+            self.send_json(404, {'error': 'Not Found'})
+
+    def do_POST(self):
+        server = self.server
+        config = server.config
+        stats = server.stats
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'null')
+        except ValueError:
+            body = None
+
+        if isinstance(body, dict) and isinstance(body.get('inputs'), (list, str)):
+            texts: List[str] = body['inputs'] if isinstance(body['inputs'], list) else [body['inputs']]
+            target = (body.get('parameters') or {}).get('tgt_lang', 'unknown')
+            request_format = 'api'
+        elif isinstance(body, dict) and isinstance(body.get('text'), str):
+            texts = [body['text']]
+            target = body.get('target', 'unknown')
+            request_format = 'space'
+        else:
+            self.send_json(400, {'error': 'Unsupported request body'})
+            return
+
+        with stats.lock:
+            stats.requests += 1
+            stats.formats[request_format] = stats.formats.get(request_format, 0) + 1
+            stats.in_flight += 1
+            stats.peak_concurrency = max(stats.peak_concurrency, stats.in_flight)
+            overloaded = config.max_concurrency and stats.in_flight > config.max_concurrency
+
+        status = 200
+        try:
+            roll, latency, error_status = server.roll()
+            if overloaded or roll < config.throttle_rate:
+                status = 429
+                self.send_json(status, {'error': 'Rate limit reached'}, self.throttle_headers())
+                return
+            characters = sum(len(text) for text in texts)
+            time.sleep(latency + characters * config.per_char)
+            if roll < config.throttle_rate + config.error_rate:
+                status = error_status
+                self.send_json(status, {'error': 'Injected server error'})
+                return
+
+            with stats.lock:
+                stats.strings += len(texts) if request_format == 'api' else max(1, len(
+                    MARKER_PATTERN.findall(texts[0])))
+                stats.characters += characters
+            if request_format == 'api':
+                self.send_json(200, [{'translation_text': fake_translate(text, target)} for text in texts])
+            else:
+                self.send_json(200, {'result': fake_translate(texts[0], target)})
+        finally:
+            with stats.lock:
+                stats.in_flight -= 1
+                stats.status[status] = stats.status.get(status, 0) + 1
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    """替身服务的行为参数，benchmark 脚本复用"""
+    parser.add_argument('--latency', default='fixed:0',
+                        help="响应延迟分布，秒: fixed:0.1 | uniform:a,b | normal:均值,标准差 | "
+                             "lognormal:中位数,sigma | exp:均值 (默认: fixed:0)")
+    parser.add_argument('--per-char', type=float, default=0.0, help="每个字符额外的处理秒数 (默认: 0)")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="随机返回 429 的比例 (默认: 0)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="随机返回 5xx 的比例 (默认: 0)")
+    parser.add_argument('--retry-after', type=float, default=1.0,
+                        help="429 响应的 Retry-After 秒数，负数表示不带该头 (默认: 1)")
+    parser.add_argument('--retry-after-date', action='store_true', help="Retry-After 使用 HTTP 日期格式")
+    parser.add_argument('--max-concurrency', type=int, default=0,
+                        help="同时处理的请求数上限，超出返回 429，0 为不限制 (默认: 0)")
+    parser.add_argument('--seed', type=int, default=None, help="随机种子，固定后错误注入可复现")
+
+
+def config_from_args(args: argparse.Namespace) -> StubConfig:
+    return StubConfig(
+        latency=args.latency,
+        per_char=args.per_char,
+        throttle_rate=args.throttle_rate,
+        error_rate=args.error_rate,
+        retry_after=args.retry_after if args.retry_after >= 0 else None,
+        retry_after_date=args.retry_after_date,
+        max_concurrency=args.max_concurrency,
+        seed=args.seed,
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="本地替身翻译服务（HF Space / 推理 API 两种格式）")
+    parser.add_argument('--host', default='127.0.0.1', help="监听地址 (默认: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8765, help="监听端口 (默认: 8765)")
+    add_config_arguments(parser)
+    return parser.parse_args()
+
+
+def main(args: argparse.Namespace) -> None:
+    server = StubTranslationServer((args.host, args.port), config_from_args(args))
+    print(f"🧪 替身翻译服务: {server.url}（GET /stats 查看请求统计，Ctrl-C 退出）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.stats.snapshot(), ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main(parse_args())
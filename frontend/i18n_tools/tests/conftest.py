@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""i18n 工具的测试：python -m pytest frontend/i18n_tools/tests"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+FRONTEND_DIR = Path(__file__).resolve().parents[2]
+REPO_ROOT = FRONTEND_DIR.parent
+sys.path.insert(0, str(FRONTEND_DIR))
+
+
+@pytest.fixture
+def load_script():
+    """按文件名导入 frontend/ 下带连字符的脚本（auto-translate-i18n.py 等），找不到时再看仓库根目录"""
+    def load(name: str):
+        path = FRONTEND_DIR / f'{name}.py'
+        if not path.exists():
+            path = REPO_ROOT / f'{name}.py'
+        spec = importlib.util.spec_from_file_location(name.replace('-', '_'), path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    return load
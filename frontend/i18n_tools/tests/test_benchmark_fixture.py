@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from i18n_tools.catalog import CatalogStore
+
+
+@pytest.mark.parametrize('depth', [1, 2, 3, 5])
+def test_key_paths_are_unique_at_every_depth(load_script, depth):
+    paths = load_script('benchmark-i18n').key_paths(500, depth)
+    assert len(set(paths)) == 500
+    assert {path.count('.') + 1 for path in paths} == {depth}
+    # 没有键同时是另一个键的命名空间
+    assert not any(path.startswith(other + '.') for path in paths for other in paths[:50])
+
+
+def test_generated_catalog_has_every_key(load_script, tmp_path):
+    size = load_script('benchmark-i18n').generate_fixture(tmp_path, keys=300, depth=1, locales=2, files=3,
+                                                          calls_per_file=2)
+    assert size['keys'] == 300
+    assert len(CatalogStore(tmp_path / 'messages')['en']) == 300
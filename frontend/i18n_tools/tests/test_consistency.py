@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+from i18n_tools.consistency import KeyIndex, MarkerMatcher, check_language, find_undefined_keys
+
+
+def test_key_index_answers_key_and_namespace_queries():
+    index = KeyIndex(['Nav.home', 'Nav.menu.open', 'Footer.copyright'])
+    assert 'Nav.home' in index and len(index) == 3
+    assert index.has_namespace('Nav') and index.has_namespace('Nav.menu')
+    # 叶子键、部分路径段和不存在的路径都不是命名空间
+    assert not index.has_namespace('Nav.home')
+    assert not index.has_namespace('Na')
+    assert not index.has_namespace('Nav.menu.open.extra')
+    assert index.is_defined('Nav.menu') and index.is_defined('Footer.copyright')
+    assert not index.is_defined('Footer.links')
+
+
+def test_find_undefined_keys_accepts_namespaces():
+    index = KeyIndex(['Nav.home', 'Nav.menu.open'])
+    assert find_undefined_keys(['Nav', 'Nav.menu', 'Nav.about', 'Other'], index) == ['Nav.about', 'Other']
+
+
+def test_marker_matcher_reports_first_marker_per_key():
+    rows = {
+        'a': '待翻译: Home',
+        'b': 'Fine',
+        'c': 'TODO: fix 待翻译',
+        'd': ['待翻译'],
+        'e': 'Need translation',
+    }
+    assert MarkerMatcher().scan(rows) == [
+        {'key': 'a', 'value': '待翻译: Home', 'marker': '待翻译'},
+        {'key': 'c', 'value': 'TODO: fix 待翻译', 'marker': 'TODO:'},
+        {'key': 'e', 'value': 'Need translation', 'marker': 'Need translation'},
+    ]
+
+
+def test_marker_spanning_two_values_is_not_reported():
+    assert MarkerMatcher(['ab']).scan({'x': 'a', 'y': 'b'}) == []
+
+
+def test_check_language_diffs_keys():
+    result = check_language('zh', {'a': '首页', 'extra': 'x'}, {'a', 'b'})
+    assert result['missingKeys'] == ['b']
+    assert result['extraKeys'] == ['extra']
+    assert result['keyCount'] == 2
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+import time
+
+
+def test_reports_each_line_once_with_its_line_number(load_script, tmp_path):
+    source = tmp_path / 'page.tsx'
+    source.write_text('const a = 1\n'
+                      '// 注释里的中文\n'
+                      'const title = "标题" + "副标题"\n'
+                      '\n'
+                      'const b = "ok"\n'
+                      'export const label = "按钮"', encoding='utf-8')
+    issues = load_script('check-hardcoded-chinese').check_file(source)
+    assert [(issue['line'], issue['content']) for issue in issues] == [
+        (3, 'const title = "标题" + "副标题"'),
+        (6, 'export const label = "按钮"'),
+    ]
+
+
+def test_long_cjk_line_scans_in_linear_time(load_script, tmp_path):
+    source = tmp_path / 'long.ts'
+    source.write_text('const x = 1\nconst text = "' + '中' * 200_000 + '"\n', encoding='utf-8')
+    check_file = load_script('check-hardcoded-chinese').check_file
+    started = time.perf_counter()
+    issues = check_file(source)
+    assert time.perf_counter() - started < 0.2
+    assert [issue['line'] for issue in issues] == [2]
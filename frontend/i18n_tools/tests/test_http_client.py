@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from i18n_tools.http_client import AsyncTranslationClient, TranslationRequestError
+
+
+class ScriptedServer(ThreadingHTTPServer):
+    """按顺序返回预设的 (状态码, 响应体, 响应头)"""
+
+    def __init__(self, responses):
+        super().__init__(('127.0.0.1', 0), ScriptedHandler)
+        self.responses = list(responses)
+        self.requests = 0
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        server = self.server
+        status, body, headers = server.responses[min(server.requests, len(server.responses) - 1)]
+        server.requests += 1
+        data = body.encode('utf-8')
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(*responses):
+        server = ScriptedServer(responses)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def client(url, max_retries=3):
+    return AsyncTranslationClient(url, max_concurrency=2, rate=0, max_retries=max_retries,
+                                  backoff_base=0.01, backoff_max=0.05)
+
+
+def test_non_json_200_is_retried(serve):
+    server = serve((200, '<html>warming up</html>', {}), (200, '', {}),
+                   (200, json.dumps({'result': 'ok'}), {'Content-Type': 'application/json'}))
+    assert asyncio.run(client(server.url).post_json({'text': 'hi'})) == {'result': 'ok'}
+    assert server.requests == 3
+
+
+def test_non_json_body_raises_request_error_after_retries(serve):
+    server = serve((200, '<html>bad gateway</html>', {}))
+    api = client(server.url)
+    with pytest.raises(TranslationRequestError, match='JSON'):
+        asyncio.run(api.post_json({'text': 'hi'}))
+    assert server.requests == 3
+    assert api.stats['failures'] == 1
+
+
+def test_retry_after_is_not_slept_on_final_attempt(serve):
+    server = serve((429, 'slow down', {'Retry-After': '30'}))
+    api = client(server.url, max_retries=1)
+    api.backoff_max = 30
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        with pytest.raises(TranslationRequestError):
+            await api.post_json({'text': 'hi'})
+        return loop.time() - started
+
+    assert asyncio.run(run()) < 5
+    assert server.requests == 1
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import sys
+
+import pytest
+
+from i18n_tools.catalog import Catalog
+from i18n_tools.journal import CheckpointedLanguageFile, journal_path, replay_journal
+from i18n_tools.stub_server import StubConfig, StubTranslationServer
+
+
+def write_json(path, data):
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+
+
+def read_json(path):
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def write_journal(lang_file, *entries):
+    journal_path(lang_file).write_text(
+        ''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries), encoding='utf-8')
+
+
+def test_replay_skips_stale_and_torn_entries(tmp_path):
+    lang_file = tmp_path / 'zh.json'
+    write_json(lang_file, {'a': {'x': '待翻译: Hello', 'y': '待翻译: Bye'}})
+    write_journal(lang_file,
+                  {'key': 'a.x', 'source': 'Hello', 'value': '你好'},
+                  {'key': 'a.y', 'source': 'Goodbye (old)', 'value': '再见'})
+    with open(journal_path(lang_file), 'a', encoding='utf-8') as f:
+        f.write('{"key": "a.y", "sou')
+
+    catalog = Catalog.load(lang_file)
+    english = {'a.x': 'Hello', 'a.y': 'Bye'}
+    assert replay_journal(catalog, source_of=english.get) == 1
+    assert catalog.get('a.x') == '你好'
+    assert catalog.get('a.y') == '待翻译: Bye'
+
+
+def test_checkpoint_flush_writes_file_and_truncates_journal(tmp_path):
+    lang_file = tmp_path / 'zh.json'
+    write_json(lang_file, {'a': {'x': '待翻译: Hello'}})
+    checkpoint = CheckpointedLanguageFile(Catalog.load(lang_file), interval=3600, every=1)
+    checkpoint.record('a.x', 'Hello', '你好')
+    assert read_json(lang_file) == {'a': {'x': '你好'}}
+    assert journal_path(lang_file).read_text(encoding='utf-8') == ''
+    checkpoint.close()
+    assert not journal_path(lang_file).exists()
+
+
+@pytest.fixture
+def stub_url():
+    server = StubTranslationServer(('127.0.0.1', 0), StubConfig())
+    server.start()
+    yield server.url
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def run_auto_translate(load_script, stub_url, monkeypatch, capsys):
+    module = load_script('auto-translate-i18n')
+    module.HF_SPACE_URL = stub_url
+
+    def run(root, *argv):
+        monkeypatch.chdir(root)
+        monkeypatch.setattr(sys, 'argv', ['auto-translate-i18n.py', '--no-cache', '--rate', '0', *argv])
+        asyncio.run(module.main(module.parse_args()))
+        return capsys.readouterr().out
+    return run
+
+
+def test_replay_that_fills_every_key_is_saved(tmp_path, run_auto_translate):
+    messages = tmp_path / 'messages'
+    messages.mkdir()
+    write_json(messages / 'en.json', {'nav': {'home': 'Home', 'about': 'About'}})
+    write_json(messages / 'zh.json', {'nav': {'home': '待翻译: Home', 'about': '待翻译: About'}})
+    write_journal(messages / 'zh.json',
+                  {'key': 'nav.home', 'source': 'Home', 'value': '首页'},
+                  {'key': 'nav.about', 'source': 'About', 'value': '关于'})
+
+    output = run_auto_translate(tmp_path, '--languages', 'zh')
+
+    assert '从日志恢复 2 条译文' in output
+    assert read_json(messages / 'zh.json') == {'nav': {'home': '首页', 'about': '关于'}}
+    assert not journal_path(messages / 'zh.json').exists()
+
+
+def test_partial_replay_is_kept_alongside_new_translations(tmp_path, run_auto_translate):
+    messages = tmp_path / 'messages'
+    messages.mkdir()
+    write_json(messages / 'en.json', {'nav': {'home': 'Home', 'about': 'About'}})
+    write_json(messages / 'zh.json', {'nav': {'home': '待翻译: Home', 'about': '待翻译: About'}})
+    write_journal(messages / 'zh.json', {'key': 'nav.home', 'source': 'Home', 'value': '首页'})
+
+    run_auto_translate(tmp_path, '--languages', 'zh')
+
+    assert read_json(messages / 'zh.json') == {'nav': {'home': '首页', 'about': '<zho_Hans> About'}}
+    assert not journal_path(messages / 'zh.json').exists()
+
+
+def test_stale_journal_is_removed(tmp_path, run_auto_translate):
+    messages = tmp_path / 'messages'
+    messages.mkdir()
+    write_json(messages / 'en.json', {'nav': {'home': 'Home'}})
+    write_json(messages / 'zh.json', {'nav': {'home': '首页'}})
+    write_journal(messages / 'zh.json', {'key': 'nav.home', 'source': 'Start', 'value': '开始'})
+
+    run_auto_translate(tmp_path, '--languages', 'zh')
+
+    assert read_json(messages / 'zh.json') == {'nav': {'home': '首页'}}
+    assert not journal_path(messages / 'zh.json').exists()
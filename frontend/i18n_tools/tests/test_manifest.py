@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import argparse
+import asyncio
+import json
+
+import pytest
+
+from i18n_tools.http_client import TranslationRequestError
+from i18n_tools.manifest import MANIFEST_FILE, build_manifest, diff_manifest, load_manifest, save_manifest
+
+
+def test_diff_manifest_reports_added_modified_and_removed():
+    manifest = build_manifest({'a': 'Hello', 'b': 'Bye', 'c': 'Gone'})
+    rows = {'a': 'Hello', 'b': 'Goodbye', 'd': 'New'}
+    assert diff_manifest(rows, manifest) == (['d'], ['b'], ['c'])
+
+
+def test_save_manifest_keeps_pending_keys_unsynced(tmp_path):
+    path = tmp_path / MANIFEST_FILE
+    previous = build_manifest({'a': 'Hello', 'b': 'Bye'})
+    rows = {'a': 'Hello there', 'b': 'Goodbye', 'c': 'New'}
+    save_manifest(path, rows, previous=previous, pending={'a', 'c'})
+
+    # a 保留旧哈希（仍是修改），c 不记录（仍是新增），b 已同步
+    assert diff_manifest(rows, load_manifest(path)) == (['c'], ['a'], [])
+
+
+class FlakyClient:
+    """推理 API 替身：包含 broken 中任一文本的请求在重试耗尽后失败"""
+
+    def __init__(self, broken=()):
+        self.broken = set(broken)
+
+    async def post_json(self, payload):
+        if self.broken & set(payload['inputs']):
+            raise TranslationRequestError('API错误 503: overloaded')
+        target = payload['parameters']['tgt_lang']
+        return [{'translation_text': f'<{target}> {text}'} for text in payload['inputs']]
+
+
+@pytest.fixture
+def sync(load_script, monkeypatch, tmp_path):
+    module = load_script('translate-new-keys')
+    monkeypatch.setattr(module, 'LANGUAGE_CODES', {'zh': 'zho_Hans', 'es': 'spa_Latn'})
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'messages').mkdir()
+    args = argparse.Namespace(batch_chars=2000, batch_size=1)
+    return lambda client: asyncio.run(module.sync_keys(args, client, None))
+
+
+def write_en(tmp_path, data):
+    (tmp_path / 'messages' / 'en.json').write_text(json.dumps(data), encoding='utf-8')
+
+
+def read_lang(tmp_path, lang):
+    return json.loads((tmp_path / 'messages' / f'{lang}.json').read_text(encoding='utf-8'))
+
+
+def test_failed_keys_are_not_written_and_retried_next_sync(tmp_path, sync, capsys):
+    write_en(tmp_path, {'nav': {'home': 'Home', 'docs': 'Docs'}})
+    sync(FlakyClient(broken={'Docs'}))
+
+    assert read_lang(tmp_path, 'zh') == {'nav': {'home': '<zho_Hans> Home'}}
+    assert 'nav.docs' not in load_manifest(tmp_path / 'messages' / MANIFEST_FILE)
+    capsys.readouterr()
+
+    sync(FlakyClient())
+    assert '新增 1 个' in capsys.readouterr().out
+    assert read_lang(tmp_path, 'es') == {'nav': {'home': '<spa_Latn> Home', 'docs': '<spa_Latn> Docs'}}
+
+
+def test_failed_modification_stays_modified(tmp_path, sync, capsys):
+    write_en(tmp_path, {'nav': {'home': 'Home'}})
+    sync(FlakyClient())
+    write_en(tmp_path, {'nav': {'home': 'Start page'}})
+    sync(FlakyClient(broken={'Start page'}))
+
+    # 旧译文保留，不会被英文覆盖
+    assert read_lang(tmp_path, 'zh') == {'nav': {'home': '<zho_Hans> Home'}}
+    capsys.readouterr()
+
+    sync(FlakyClient())
+    assert '修改 1 个' in capsys.readouterr().out
+    assert read_lang(tmp_path, 'zh') == {'nav': {'home': '<zho_Hans> Start page'}}
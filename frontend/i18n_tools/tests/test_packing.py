@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+import asyncio
+
+from i18n_tools.http_client import TranslationRequestError
+from i18n_tools.packing import pack_texts, plan_batches, translate_in_batches, unpack_texts
+
+
+def test_pack_unpack_round_trip():
+    texts = ['Hello', 'Sign in', 'Two\nlines']
+    assert unpack_texts(pack_texts(texts), 3) == texts
+
+
+def test_unpack_rejects_missing_duplicate_or_reordered_markers():
+    assert unpack_texts('[[0]] a\n[[2]] c', 3) is None
+    assert unpack_texts('[[0]] a\n[[0]] b', 2) is None
+    assert unpack_texts('[[1]] b\n[[0]] a', 2) is None
+    assert unpack_texts('[[ 0 ]] a\n[[1]]b', 2) == ['a', 'b']
+
+
+def test_plan_batches_respects_budgets_and_sends_marker_text_alone():
+    texts = ['aaaa', 'bbbb', 'cccc', 'see [[docs]]', 'dd']
+    assert plan_batches(texts, max_chars=8, max_items=10) == [[0, 1], [3], [2, 4]]
+    assert plan_batches(texts[:3], max_chars=100, max_items=2) == [[0, 1], [2]]
+
+
+def test_count_mismatch_splits_until_batches_succeed():
+    sent = []
+
+    async def send(batch):
+        sent.append(list(batch))
+        if len(batch) > 1:
+            return None
+        return [batch[0].upper()]
+
+    progress = []
+    results = asyncio.run(translate_in_batches(['a', 'b', 'c'], send, on_progress=progress.append))
+    assert results == ['A', 'B', 'C']
+    assert sent[0] == ['a', 'b', 'c']
+    assert sum(progress) == 3
+
+
+def test_request_failure_fails_whole_batch_without_splitting():
+    sent = []
+
+    async def send(batch):
+        sent.append(list(batch))
+        raise TranslationRequestError('API错误 503')
+
+    progress = []
+    results = asyncio.run(translate_in_batches(['a', 'b', 'c', 'd'], send, on_progress=progress.append))
+    assert results == [None] * 4
+    assert sent == [['a', 'b', 'c', 'd']]
+    assert sum(progress) == 4
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""仓库根目录 update_all_translation_pages.py 的页面生成"""
+import argparse
+import gzip
+import shutil
+
+import pytest
+
+
+@pytest.fixture
+def pages(load_script):
+    return load_script('update_all_translation_pages')
+
+
+@pytest.fixture
+def page_path(tmp_path):
+    path = tmp_path / 'spanish-to-english' / 'page.tsx'
+    path.parent.mkdir()
+    return path
+
+
+def test_page_is_written_only_when_generated_bytes_change(pages, page_path):
+    status, _, digest = pages.update_translation_page(page_path)
+    assert status == 'created' and pages.file_hash(page_path) == digest
+    mtime = page_path.stat().st_mtime_ns
+
+    assert pages.update_translation_page(page_path, generated_hash=digest)[0] == 'unchanged'
+    assert page_path.stat().st_mtime_ns == mtime
+
+
+def test_outdated_generator_output_is_regenerated(pages, page_path):
+    page_path.write_text('// old template output\n', encoding='utf-8')
+    old_hash = pages.file_hash(page_path)
+
+    assert pages.update_translation_page(page_path, check=True, generated_hash=old_hash)[0] == 'changed'
+    assert pages.file_hash(page_path) == old_hash
+
+    status, _, digest = pages.update_translation_page(page_path, generated_hash=old_hash)
+    assert status == 'changed' and pages.file_hash(page_path) == digest
+
+
+def test_hand_edited_page_is_left_alone_unless_forced(pages, page_path):
+    digest = pages.update_translation_page(page_path)[2]
+    page_path.write_text('// edited by hand\n', encoding='utf-8')
+
+    assert pages.update_translation_page(page_path, generated_hash=digest)[0] == 'modified'
+    assert page_path.read_text(encoding='utf-8') == '// edited by hand\n'
+
+    assert pages.update_translation_page(page_path, generated_hash=digest, force=True)[0] == 'changed'
+    assert pages.file_hash(page_path) == digest
+
+
+def test_pages_state_keeps_hand_edited_and_unselected_entries(pages):
+    state = {'a-to-english': 'old-a', 'b-to-english': 'old-b', 'c-to-english': 'old-c'}
+    results = [('a-to-english', 'changed', 0.1, 'new-a'),
+               ('b-to-english', 'modified', 0.1, 'new-b'),
+               ('d-to-english', 'modified', 0.1, 'new-d')]
+    assert pages.update_pages_state(state, results, {'a-to-english', 'b-to-english', 'd-to-english'}) == {
+        'a-to-english': 'new-a', 'b-to-english': 'old-b', 'c-to-english': 'old-c'}
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='needs node')
+def test_compile_timing_uses_the_frontend_typescript(pages, tmp_path):
+    assert pages.measure_compile_ms(tmp_path, {'a/page.tsx': 'x'}) is None
+
+    typescript = tmp_path / 'node_modules' / 'typescript'
+    typescript.mkdir(parents=True)
+    (typescript / 'index.js').write_text(
+        "exports.JsxEmit = {}; exports.ModuleKind = {}; exports.ScriptTarget = {};\n"
+        "exports.transpileModule = (source) => ({ outputText: source })\n", encoding='utf-8')
+    timings = pages.measure_compile_ms(tmp_path, {'a/page.tsx': 'const a = 1', 'pages.json': '{"a": 1}'})
+    assert set(timings) == {'a/page.tsx', 'pages.json'}
+    assert all(ms >= 0 for ms in timings.values())
+
+
+def test_shard_urls_respects_count_and_size_limits(pages):
+    urls = [('2026-01-01', f'<url>{i:03d}</url>\n') for i in range(10)]
+    assert [len(shard) for shard in pages.shard_urls(urls, max_urls=4)] == [4, 4, 2]
+
+    overhead = len(pages.SITEMAP_URLSET_OPEN.encode()) + len(pages.SITEMAP_URLSET_CLOSE.encode())
+    url_bytes = len(urls[0][1].encode())
+    shards = pages.shard_urls(urls, max_urls=100, max_bytes=overhead + 3 * url_bytes)
+    assert [len(shard) for shard in shards] == [3, 3, 3, 1]
+    assert [url for shard in shards for url in shard] == urls
+
+
+def test_sitemap_state_keeps_lastmod_for_unchanged_directions(pages):
+    state = {'a-to-english': {'hash': 'h1', 'lastmod': '2026-01-01'},
+             'b-to-english': {'hash': 'h2', 'lastmod': '2026-01-01'},
+             'gone-to-english': {'hash': 'h3', 'lastmod': '2026-01-01'}}
+    new_state, touched = pages.update_sitemap_state(
+        state, {'a-to-english': 'h1', 'b-to-english': 'h2-new', 'c-to-english': 'h4'}, '2026-02-02')
+    assert touched == 2
+    assert new_state == {'a-to-english': {'hash': 'h1', 'lastmod': '2026-01-01'},
+                         'b-to-english': {'hash': 'h2-new', 'lastmod': '2026-02-02'},
+                         'c-to-english': {'hash': 'h4', 'lastmod': '2026-02-02'}}
+
+
+def test_sitemap_shards_are_rewritten_only_when_content_changes(pages, tmp_path, capsys):
+    root = tmp_path / 'frontend'
+    (root / pages.LOCALES_SOURCE).parent.mkdir(parents=True)
+    (root / pages.LOCALES_SOURCE).write_text("export const locales = ['en', 'es'] as const\n", encoding='utf-8')
+    args = argparse.Namespace(root=root, check=False, sitemap_max_urls=3)
+    hashes = {'spanish-to-english': 'h1', 'french-to-english': 'h2'}
+
+    assert pages.generate_sitemap(args, hashes) > 0
+    shards = sorted((root / pages.SITEMAP_DIR).glob(pages.SITEMAP_SHARD_GLOB))
+    assert len(shards) == 2
+    with gzip.open(shards[0], 'rt', encoding='utf-8') as f:
+        assert 'hreflang="x-default"' in f.read()
+
+    args.check = True
+    assert pages.generate_sitemap(args, hashes) == 0
+    capsys.readouterr()
+
+    # 更多的 URL 上限会合并分片，多出的旧分片在 --check 下算作过期
+    args.sitemap_max_urls = 10
+    assert pages.generate_sitemap(args, hashes) > 0
+    assert 'out of date' in capsys.readouterr().out
+    assert len(list((root / pages.SITEMAP_DIR).glob(pages.SITEMAP_SHARD_GLOB))) == 2
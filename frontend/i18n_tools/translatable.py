@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""
+不需要翻译的文案识别
+价格、邮箱、URL、纯数字和纯 ICU 占位符原样保留，不发给翻译接口
+"""
+
+import re
+
+NON_TRANSLATABLE_PATTERNS = [
+    re.compile(r'^[$€£¥₹]\s?\d[\d,]*(\.\d+)?(\s?/\s?\w+)?$'),           # 价格: $120, $0.001/char
+    re.compile(r'^\d[\d,]*(\.\d+)?\s?(USD|EUR|CNY)$', re.IGNORECASE),   # 价格: 120 USD
+    re.compile(r'^[\w.+-]+@[\w-]+(\.[\w-]+)+$'),                        # 邮箱
+    re.compile(r'^(https?://|www\.)\S+$', re.IGNORECASE),               # URL
+    re.compile(r'^[\d\s.,:%+\-×/]+$'),                                  # 纯数字: 4.8/5, 99%, 24/7
+    re.compile(r'^(\s*\{[^{}]*\}\s*)+$'),                               # 纯 ICU 占位符: {count}
+]
+
+
+def is_translatable(text: str) -> bool:
+    """文案是否需要翻译"""
+    if not isinstance(text, str) or not text.strip():
+        return False
+    stripped = text.strip()
+    return not any(pattern.match(stripped) for pattern in NON_TRANSLATABLE_PATTERNS)
@@ -0,0 +1,108 @@
+/**
+ * 按命名空间拆分的消息包
+ * build-i18n-bundles.py 根据代码扫描结果生成 路由 -> 命名空间 清单，
+ * 并把每个语言文件拆成 public/i18n/<locale>/<命名空间>.<哈希>.json（附预压缩的 .gz），
+ * npm run dev / build 之前自动运行（predev / prebuild）
+ * [locale] 布局用 pickRouteMessages 只下发首屏路由的命名空间，
+ * 客户端导航时 RouteMessagesProvider 用 getRouteBundleUrls 下载缺少的消息包
+ */
+
+import manifest from '@/lib/generated/i18n-bundles.json'
+
+type BundleManifest = {
+  version: number
+  // locale -> 命名空间 -> 消息包 URL
+  bundles: Record<string, Record<string, string>>
+  // 路由（如 /[locale]/pricing）-> 用到的顶层命名空间
+  routes: Record<string, string[]>
+}
+
+type Messages = Record<string, unknown>
+
+const bundleManifest = manifest as BundleManifest
+
+/**
+ * 路由需要的顶层命名空间
+ * @param route - app 目录下的路由路径，如 /[locale]/pricing
+ * @returns 命名空间列表；清单中没有该路由时返回 null
+ */
+export function getRouteNamespaces(route: string): string[] | null {
+  return bundleManifest.routes[route] ?? null
+}
+
+/**
+ * 请求路径对应的清单路由
+ * @param pathname - 请求路径，如 /zh/pricing
+ * @returns 清单中的路由，如 /[locale]/pricing；动态段 [x] 匹配任意一段，静态段多的路由优先；没有匹配时返回 null
+ */
+export function matchRoute(pathname: string): string | null {
+  const segments = pathname.split('/').filter(Boolean)
+  let best: string | null = null
+  let bestDynamic = Infinity
+  for (const route of Object.keys(bundleManifest.routes)) {
+    const parts = route.split('/').filter(Boolean)
+    if (parts.length !== segments.length) {
+      continue
+    }
+    const dynamic = parts.filter(part => part.startsWith('[') && part.endsWith(']')).length
+    const matches = parts.every((part, index) =>
+      (part.startsWith('[') && part.endsWith(']')) || part === segments[index])
+    if (matches && dynamic < bestDynamic) {
+      best = route
+      bestDynamic = dynamic
+    }
+  }
+  return best
+}
+
+/**
+ * 路由在某个语言下需要加载的消息包 URL
+ * @param locale - 当前语言
+ * @param route - app 目录下的路由路径
+ * @param loaded - 已经加载的命名空间，不再返回它们的消息包
+ * @returns 消息包 URL 列表；清单中没有该路由时返回该语言的全部消息包
+ */
+export function getRouteBundleUrls(locale: string, route: string, loaded: Iterable<string> = []): string[] {
+  const bundles = bundleManifest.bundles[locale] ?? {}
+  const skip = new Set(loaded)
+  const namespaces = getRouteNamespaces(route) ?? Object.keys(bundles)
+  return namespaces
+    .filter(namespace => namespace in bundles && !skip.has(namespace))
+    .map(namespace => bundles[namespace])
+}
+
+/**
+ * 下载并合并消息包（每个包是 {"<命名空间>": {...}}）
+ * @param urls - getRouteBundleUrls 返回的 URL
+ * @returns 合并后的消息
+ */
+export async function fetchBundles(urls: string[]): Promise<Messages> {
+  const bundles = await Promise.all(urls.map(async url => {
+    const response = await fetch(url)
+    if (!response.ok) {
+      throw new Error(`Failed to load message bundle ${url}: ${response.status}`)
+    }
+    return response.json() as Promise<Messages>
+  }))
+  return Object.assign({}, ...bundles)
+}
+
+/**
+ * 只保留路由用到的命名空间，用于传给 NextIntlClientProvider
+ * @param messages - 整份语言文件
+ * @param route - app 目录下的路由路径
+ * @returns 裁剪后的消息；清单中没有该路由时原样返回
+ */
+export function pickRouteMessages<T extends Messages>(messages: T, route: string): Partial<T> {
+  const namespaces = getRouteNamespaces(route)
+  if (!namespaces) {
+    return messages
+  }
+  const picked: Partial<T> = {}
+  for (const namespace of namespaces) {
+    if (namespace in messages) {
+      picked[namespace as keyof T] = messages[namespace as keyof T]
+    }
+  }
+  return picked
+}
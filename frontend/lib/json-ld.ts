@@ -0,0 +1,21 @@
+/**
+ * 预序列化的结构化数据（JSON-LD）
+ * update_all_translation_pages.py 在生成页面时已把 JSON-LD 压缩序列化，
+ * 并在 locale 出现的位置切开；渲染时只需要把 locale 拼回去
+ */
+
+/**
+ * 用 locale 填充预序列化的 JSON-LD 片段
+ * @param parts - 在 locale 位置切开的 JSON 字符串片段
+ * @param locale - 当前语言
+ * @returns 可直接放进 <script type="application/ld+json"> 的字符串
+ */
+export function fillJsonLd(parts: string[], locale: string): string {
+  // 按 JSON 字符串转义，并转义 <、>、&，防止提前闭合 script 标签
+  const slot = JSON.stringify(locale)
+    .slice(1, -1)
+    .replace(/</g, '\\u003c')
+    .replace(/>/g, '\\u003e')
+    .replace(/&/g, '\\u0026');
+  return parts.join(slot);
+}
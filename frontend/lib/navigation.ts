@@ -6,6 +6,9 @@ import { defineRouting } from 'next-intl/routing';
 export const locales = ['en', 'zh', 'es', 'fr', 'ar', 'hi', 'ht', 'lo', 'my', 'pt', 'sw', 'te'] as const;
 export type Locale = typeof locales[number];
 
+// 中间件写入的请求头，带语言前缀的请求路径；[locale] 布局据此只下发当前路由用到的消息
+export const PATHNAME_HEADER = 'x-pathname';
+
 // 页面路径配置 - 统一使用英文路径，提升SEO效果
 export const PAGE_TRANSLATIONS = {
   '/': '/',
@@ -1,12 +1,19 @@
 import createMiddleware from 'next-intl/middleware'
-import { locales } from './lib/navigation'
+import type { NextRequest } from 'next/server'
+import { locales, PATHNAME_HEADER } from './lib/navigation'
 
-export default createMiddleware({
+const handleI18nRouting = createMiddleware({
   locales,
   defaultLocale: 'en',
   localePrefix: 'always'
 })
 
+export default function middleware(request: NextRequest) {
+  // next-intl 转发请求头，布局通过 headers() 读到当前路径
+  request.headers.set(PATHNAME_HEADER, request.nextUrl.pathname)
+  return handleI18nRouting(request)
+}
+
 export const config = {
   matcher: [
     // Match all pathnames except for
@@ -15,6 +22,6 @@ export const config = {
     // - Static files (including all icon files)
     // - AI search optimization file
     // - Google verification files
-    '/((?!api|_next/static|_next/image|favicon\\.ico|icon-.*\\.png|icon\\.svg|apple-touch-icon\\.png|loretrans-logo\\.svg|sitemap\\.xml|robots\\.txt|llm\\.txt|images|icons|logo|manifest\\.json|google.*\\.html).*)',
+    '/((?!api|_next/static|_next/image|favicon\\.ico|icon-.*\\.png|icon\\.svg|apple-touch-icon\\.png|loretrans-logo\\.svg|sitemap\\.xml|sitemaps|i18n/|robots\\.txt|llm\\.txt|images|icons|logo|manifest\\.json|google.*\\.html).*)',
   ],
 }
\ No newline at end of file
@@ -2,16 +2,27 @@
 """
 翻译新添加的key到其他语言
 使用Hugging Face API进行翻译
+
+python translate-new-keys.py              # 翻译脚本中的 NEW_KEYS
+python translate-new-keys.py sync         # 只同步 en.json 中新增/修改的键
+python translate-new-keys.py sync --watch # en.json 变化时自动增量同步
 """
 
-import json
-import requests
-import time
+import argparse
+import asyncio
 import os
 from pathlib import Path
 
-# Hugging Face API配置
-HF_API_URL = "https://api-inference.huggingface.co/models/facebook/nllb-200-distilled-600M"
+from i18n_tools.cache import TranslationCache, translate_with_cache
+from i18n_tools.catalog import CatalogStore, flatten
+from i18n_tools.http_client import AsyncTranslationClient
+from i18n_tools.local_backend import LocalNLLBBackend
+from i18n_tools.manifest import MANIFEST_FILE, diff_manifest, load_manifest, save_manifest
+from i18n_tools.packing import translate_in_batches
+from i18n_tools.translatable import is_translatable
+
+# Hugging Face API配置（HF_API_URL 可指向 i18n_tools.stub_server 等替身服务）
+HF_API_URL = os.getenv("HF_API_URL", "https://api-inference.huggingface.co/models/facebook/nllb-200-distilled-600M")
 HF_TOKEN = os.getenv("HUGGINGFACE_API_TOKEN", "hf_your_token_here")
 
 # 语言映射
@@ -29,117 +40,246 @@ LANGUAGE_CODES = {
     "ht": "hat_Latn",  # 海地克里奥尔语
 }
 
-def translate_text(text, target_lang_code):
-    """使用Hugging Face API翻译文本"""
-    headers = {"Authorization": f"Bearer {HF_TOKEN}"}
-    
-    payload = {
-        "inputs": text,
-        "parameters": {
-            "src_lang": "eng_Latn",
-            "tgt_lang": target_lang_code
+# 需要翻译的新key
+NEW_KEYS = {
+    "PricingPage": {
+        "cost_comparison": {
+            "title": "💰 Cost Comparison: Why Choose Transly?",
+            "human_translation": {
+                "price": "$120",
+                "title": "Human Translation",
+                "description": "1000 characters × $0.12/char"
+            },
+            "google_translate": {
+                "price": "Not Supported",
+                "title": "Google Translate",
+                "description": "Limited small language coverage"
+            },
+            "transly": {
+                "price": "$1",
+                "title": "Transly",
+                "description": "1000 characters × $0.001/char",
+                "savings": "Save 99% cost"
+            }
+        }
+    },
+    "Layout": {
+        "Footer": {
+            "contact_us": "Contact Us",
+            "support_email": "support@transly.app",
+            "support_24_7": "24/7 Online Support",
+            "contact_form": "Contact Form",
+            "view_all_languages": "View All →",
+            "telugu_language": "Telugu"
         }
     }
-    
-    try:
-        response = requests.post(HF_API_URL, headers=headers, json=payload)
-        if response.status_code == 200:
-            result = response.json()
-            if isinstance(result, list) and len(result) > 0:
-                return result[0].get("translation_text", text)
-            return text
-        else:
-            print(f"API错误: {response.status_code} - {response.text}")
-            return text
-    except Exception as e:
-        print(f"翻译错误: {e}")
-        return text
-
-def translate_nested_dict(data, target_lang_code, path=""):
-    """递归翻译嵌套字典"""
-    if isinstance(data, dict):
-        result = {}
-        for key, value in data.items():
-            current_path = f"{path}.{key}" if path else key
-            result[key] = translate_nested_dict(value, target_lang_code, current_path)
-        return result
-    elif isinstance(data, str):
-        print(f"翻译: {path} = {data}")
-        translated = translate_text(data, target_lang_code)
-        print(f"结果: {translated}")
-        time.sleep(0.5)  # 避免API限制
-        return translated
-    else:
-        return data
-
-def main():
-    # 需要翻译的新key
-    new_keys = {
-        "PricingPage": {
-            "cost_comparison": {
-                "title": "💰 Cost Comparison: Why Choose Transly?",
-                "human_translation": {
-                    "price": "$120",
-                    "title": "Human Translation",
-                    "description": "1000 characters × $0.12/char"
-                },
-                "google_translate": {
-                    "price": "Not Supported",
-                    "title": "Google Translate",
-                    "description": "Limited small language coverage"
-                },
-                "transly": {
-                    "price": "$1",
-                    "title": "Transly",
-                    "description": "1000 characters × $0.001/char",
-                    "savings": "Save 99% cost"
-                }
-            }
-        },
-        "Layout": {
-            "Footer": {
-                "contact_us": "Contact Us",
-                "support_email": "support@transly.app",
-                "support_24_7": "24/7 Online Support",
-                "contact_form": "Contact Form",
-                "view_all_languages": "View All →",
-                "telugu_language": "Telugu"
+}
+
+def create_client(args):
+    """创建带限速与自适应并发的推理API客户端"""
+    return AsyncTranslationClient(
+        HF_API_URL,
+        headers={"Authorization": f"Bearer {HF_TOKEN}"},
+        max_concurrency=args.concurrency,
+        rate=args.rate
+    )
+
+async def translate_texts(client, texts, target_lang_code, batch_chars=2000, batch_size=32, cache=None):
+    """
+    批量翻译文本，先查本地缓存，返回与 texts 等长的列表，翻译失败的位置为 None
+    client 为推理API客户端时 inputs 直接传列表，一次请求翻译多条；为 LocalNLLBBackend 时在进程内整批翻译
+    """
+    async def send(batch):
+        payload = {
+            "inputs": batch,
+            "parameters": {
+                "src_lang": "eng_Latn",
+                "tgt_lang": target_lang_code
             }
         }
-    }
+        result = await client.post_json(payload)
+        if not isinstance(result, list) or len(result) != len(batch):
+            print(f"API响应数量不一致，拆分重试 ({len(batch)} 条)")
+            return None
+        return [item.get("translation_text") if isinstance(item, dict) else None for item in result]
     
-    messages_dir = Path("messages")
+    async def translate_missing(missing):
+        if isinstance(client, LocalNLLBBackend):
+            return await client.translate_texts(missing, target_lang_code)
+        return await translate_in_batches(missing, send, max_chars=batch_chars, max_items=batch_size)
+    
+    return await translate_with_cache(cache, texts, target_lang_code, translate_missing)
+
+async def translate_rows(client, rows_by_lang, batch_chars=2000, batch_size=32, cache=None):
+    """
+    把每种语言各自的 {路径: 文本} 批量翻译，各语言并行
+    返回 语言代码 -> {路径: 译文}，翻译失败的路径不在结果中（不能把英文原文写进其他语言）
+    """
+    async def run(lang_code, rows):
+        texts = list(dict.fromkeys(rows.values()))
+        translated = await translate_texts(client, texts, LANGUAGE_CODES[lang_code], batch_chars=batch_chars,
+                                           batch_size=batch_size, cache=cache)
+        lookup = dict(zip(texts, translated))
+        failed = [path for path, text in rows.items() if lookup[text] is None]
+        if failed:
+            print(f"❌ {lang_code}: {len(failed)} 个键翻译失败，下次同步时重试")
+        return {path: lookup[text] for path, text in rows.items() if lookup[text] is not None}
+    
+    languages = [lang_code for lang_code, rows in rows_by_lang.items() if rows]
+    results = await asyncio.gather(*(run(lang_code, rows_by_lang[lang_code]) for lang_code in languages))
+    results = dict(zip(languages, results))
+    return {lang_code: results.get(lang_code, {}) for lang_code in rows_by_lang}
+
+def split_translatable(rows):
+    """拆分出需要翻译的行；价格、邮箱、URL、数字和占位符原样保留"""
+    translatable = {path: text for path, text in rows.items() if is_translatable(text)}
+    kept = {path: value for path, value in rows.items() if path not in translatable}
+    return translatable, kept
+
+async def translate_new_keys(args, client, cache):
+    """把脚本中硬编码的 NEW_KEYS 翻译到所有语言"""
+    store = CatalogStore(Path("messages"))
+    
+    # 展开为 (路径, 文本) 行
+    rows = flatten(NEW_KEYS)
+    translatable, kept = split_translatable(rows)
+    print(f"共 {len(rows)} 个键，需要翻译 {len(translatable)} 个，原样保留 {len(kept)} 个")
+    for path, value in kept.items():
+        print(f"  保留: {path} = {value}")
+    
+    # 所有语言一次性批量翻译
+    translations = await translate_rows(client, {lang_code: translatable for lang_code in LANGUAGE_CODES},
+                                        batch_chars=args.batch_chars, batch_size=args.batch_size, cache=cache)
     
-    # 为每种语言翻译
     for lang_code, hf_lang_code in LANGUAGE_CODES.items():
-        print(f"\n开始翻译到 {lang_code} ({hf_lang_code})")
+        print(f"\n{lang_code} ({hf_lang_code})")
+        for path, text in translatable.items():
+            print(f"  {path}: {text} -> {translations[lang_code].get(path, '❌ 翻译失败，未写入')}")
         
-        # 读取现有翻译文件
-        lang_file = messages_dir / f"{lang_code}.json"
-        if lang_file.exists():
-            with open(lang_file, 'r', encoding='utf-8') as f:
-                existing_data = json.load(f)
+        # 合并到现有数据，只在有变化时写回，每个文件只写一次；翻译失败的键不写入
+        catalog = store[lang_code]
+        changed = catalog.update({**kept, **translations[lang_code]})
+        if catalog.save():
+            print(f"已更新 {catalog.path}: {changed} 个键")
         else:
-            existing_data = {}
-        
-        # 翻译新key
-        translated_keys = translate_nested_dict(new_keys, hf_lang_code)
-        
-        # 合并到现有数据
-        def merge_dicts(existing, new):
-            for key, value in new.items():
-                if key in existing and isinstance(existing[key], dict) and isinstance(value, dict):
-                    merge_dicts(existing[key], value)
-                else:
-                    existing[key] = value
-        
-        merge_dicts(existing_data, translated_keys)
-        
-        # 保存更新后的文件
-        with open(lang_file, 'w', encoding='utf-8') as f:
-            json.dump(existing_data, f, ensure_ascii=False, indent=2)
-        
-        print(f"已更新 {lang_file}")
+            print(f"{catalog.path} 无变化")
+
+async def sync_keys(args, client, cache):
+    """
+    对比 en.json 与同步清单，只把新增或修改的英文键（以及各语言缺失的键）翻译到所有语言
+    首次同步（没有清单）时只补全缺失的键，然后建立清单
+    """
+    messages_dir = Path("messages")
+    manifest_path = messages_dir / MANIFEST_FILE
+    # 每次同步重新加载，watch 模式下语言文件可能已被外部修改
+    store = CatalogStore(messages_dir)
+    
+    en_rows = store["en"].rows
+    manifest = load_manifest(manifest_path)
+    
+    if manifest is None:
+        print("📋 未找到同步清单，首次同步只补全各语言缺失的键")
+        changed = []
+    else:
+        added, modified, removed = diff_manifest(en_rows, manifest)
+        print(f"📋 en.json 变化: 新增 {len(added)} 个, 修改 {len(modified)} 个, 删除 {len(removed)} 个")
+        for path in removed:
+            print(f"  - {path}（已从 en.json 删除，请手动清理其他语言）")
+        changed = added + modified
+    
+    # 每种语言需要处理的键：新增/修改的键 + 该语言缺失的键（数组等非字符串值不自动翻译）
+    rows_by_lang = {}
+    kept_by_lang = {}
+    for lang_code in LANGUAGE_CODES:
+        catalog = store[lang_code]
+        paths = list(dict.fromkeys(changed + [path for path in en_rows if path not in catalog]))
+        rows = {path: en_rows[path] for path in paths if isinstance(en_rows[path], str)}
+        rows_by_lang[lang_code], kept_by_lang[lang_code] = split_translatable(rows)
+    
+    pending = sum(len(rows) + len(kept_by_lang[lang_code]) for lang_code, rows in rows_by_lang.items())
+    failed = set()
+    if pending:
+        translations = await translate_rows(client, rows_by_lang, batch_chars=args.batch_chars,
+                                            batch_size=args.batch_size, cache=cache)
+        for lang_code in LANGUAGE_CODES:
+            failed.update(path for path in rows_by_lang[lang_code] if path not in translations[lang_code])
+            catalog = store[lang_code]
+            changed_count = catalog.update({**kept_by_lang[lang_code], **translations[lang_code]})
+            if catalog.save():
+                print(f"已更新 {catalog.path}: {changed_count} 个键")
+    else:
+        print("✅ 所有语言已与 en.json 同步")
+    
+    # 翻译失败的键不更新清单中的哈希，下次同步时仍视为新增/修改
+    save_manifest(manifest_path, en_rows, previous=manifest, pending=failed)
+    if failed:
+        print(f"⚠️  {len(failed)} 个键在部分语言中翻译失败，下次同步时重试")
+    print(f"💾 已更新同步清单: {manifest_path}")
+
+async def watch_keys(args, client, cache):
+    """监视 en.json，每次变化后增量同步"""
+    en_file = Path("messages") / "en.json"
+    print(f"👀 监视 {en_file} (每 {args.interval} 秒检查一次，Ctrl-C 退出)")
+    last_mtime = None
+    while True:
+        mtime = en_file.stat().st_mtime_ns
+        if mtime != last_mtime:
+            if last_mtime is not None:
+                # 等待编辑器写完
+                await asyncio.sleep(args.interval)
+                if en_file.stat().st_mtime_ns != mtime:
+                    continue
+                print(f"\n🔄 检测到 {en_file} 变化")
+            await sync_keys(args, client, cache)
+            last_mtime = mtime
+        await asyncio.sleep(args.interval)
+
+async def main(args):
+    if args.backend == "local":
+        try:
+            client = LocalNLLBBackend(batch_size=args.local_batch_size)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return
+        if not client.load():
+            print("❌ 本地模型加载失败，请先运行 microservices/nllb-local/scripts/download_model.py")
+            return
+        model_id = client.model_id
+    else:
+        client = create_client(args)
+        model_id = HF_API_URL
+    cache = None if args.no_cache else TranslationCache(model_id)
+    
+    try:
+        if args.command == "sync":
+            if args.watch:
+                await watch_keys(args, client, cache)
+            else:
+                await sync_keys(args, client, cache)
+        else:
+            await translate_new_keys(args, client, cache)
+    finally:
+        if args.backend != "local":
+            client.close()
+        if cache:
+            cache.report()
+            cache.close()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="翻译新添加的key到其他语言")
+    parser.add_argument("command", choices=["new-keys", "sync"], default="new-keys", nargs="?",
+                        help="new-keys: 翻译脚本中的 NEW_KEYS; sync: 按同步清单增量同步 en.json 的变化 (默认: new-keys)")
+    parser.add_argument("--watch", action="store_true", help="sync 模式下持续监视 en.json 并增量同步")
+    parser.add_argument("--interval", type=float, default=2.0, help="--watch 检查间隔秒数 (默认: 2)")
+    parser.add_argument("--backend", choices=["api", "local"], default="api",
+                        help="翻译后端: api=Hugging Face 推理API, local=进程内本地 NLLB 模型 (默认: api)")
+    parser.add_argument("--local-batch-size", type=int, default=32, help="本地后端每次 generate 的文本条数 (默认: 32)")
+    parser.add_argument("--concurrency", type=int, default=4, help="最大并发请求数 (默认: 4)")
+    parser.add_argument("--rate", type=float, default=2.0, help="每秒最多发出的请求数 (默认: 2.0)")
+    parser.add_argument("--batch-chars", type=int, default=2000, help="每次请求的最大字符数 (默认: 2000)")
+    parser.add_argument("--batch-size", type=int, default=32, help="每次请求的最大文本条数 (默认: 32)")
+    parser.add_argument("--no-cache", action="store_true", help="不使用本地翻译缓存 (.i18n-cache/)")
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main(parse_args()))
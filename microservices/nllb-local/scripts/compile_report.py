@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+NLLB compiled-mode report
+
+Translates a set of source sentences in eager mode, then compiles the model with length buckets
+(NLLB_COMPILE in translate.py) and translates them again. Reports compile time per bucket and beam
+width, how requests were spread over the buckets, recompiles after warm-up, Inductor cache hits,
+and the steady-state latency against eager. Run it twice: the second run reuses the on-disk
+Inductor cache, so the compile time drops.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import translate  # noqa: E402  (exits with a JSON error when torch/transformers are missing)
+
+
+def read_lines(path, limit=None):
+    with open(path, "r", encoding="utf-8") as f:
+        lines = [line.strip() for line in f if line.strip()]
+    return lines[:limit] if limit else lines
+
+
+def timed_translations(translator, texts, src_lang, tgt_lang):
+    results, seconds = [], []
+    for text in texts:
+        started = time.perf_counter()
+        detailed = translator.translate_detailed(text, src_lang, tgt_lang, deadline=0)
+        seconds.append(time.perf_counter() - started)
+        results.append(detailed["translatedText"] if detailed else "")
+    return results, seconds
+
+
+def latency(seconds):
+    ordered = sorted(seconds)
+    return {
+        "mean": round(statistics.mean(ordered), 4),
+        "p50": round(ordered[len(ordered) // 2], 4),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare bucketed torch.compile decoding with eager decoding")
+    parser.add_argument("--model-dir", type=Path, default=None, help=f"Model directory (default: {translate.model_dir})")
+    parser.add_argument("--source", required=True, help="Source sentences, one per line")
+    parser.add_argument("--src-lang", default="eng_Latn", help="Source language (default: eng_Latn)")
+    parser.add_argument("--tgt-lang", required=True, help="Target language (NLLB code)")
+    parser.add_argument("--limit", type=int, default=30, help="Number of sentences to translate (default: 30)")
+    parser.add_argument("--buckets", type=int, nargs="+", default=list(translate.COMPILE_BUCKETS),
+                        help=f"Input length buckets in tokens (default: {' '.join(map(str, translate.COMPILE_BUCKETS))})")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+    if args.model_dir:
+        translate.model_dir = args.model_dir
+
+    texts = read_lines(args.source, args.limit)
+    translator = translate.NLLBTranslator(shortlist=False, compile=False)
+    if not texts or not translator.load_model():
+        sys.exit(1)
+
+    # Warm up the eager path once so the first measured call does not pay for lazy initialisation
+    translator.translate_detailed(texts[0], args.src_lang, args.tgt_lang, deadline=0)
+    eager, eager_seconds = timed_translations(translator, texts, args.src_lang, args.tgt_lang)
+
+    started = time.perf_counter()
+    translator.compile_model(args.buckets)
+    compile_wall = time.perf_counter() - started
+    if translator.compile_mode is None:
+        sys.exit(1)
+    compiled, compiled_seconds = timed_translations(translator, texts, args.src_lang, args.tgt_lang)
+
+    compile_stats = translator.compile_report()
+    report = {
+        "source": str(args.source),
+        "sentences": len(texts),
+        "compileWallSeconds": round(compile_wall, 3),
+        "compile": compile_stats,
+        "eager": latency(eager_seconds),
+        "compiled": latency(compiled_seconds),
+        "speedup": round(sum(eager_seconds) / sum(compiled_seconds), 3),
+        "exactAgreement": round(sum(a == b for a, b in zip(eager, compiled)) / len(texts), 4),
+    }
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+
+    cache = compile_stats["fxGraphCache"]
+    print(f"⚙️  Compiled mode ({compile_stats['mode']}): {len(texts)} sentences from {args.source}, "
+          f"{args.src_lang} -> {args.tgt_lang}")
+    print(f"Compile + warm-up: {compile_wall:.1f}s, Inductor cache {cache['hit']} hits / {cache['miss']} misses")
+    print(f"{'bucket':>8} {'requests':>9}  warm-up seconds by beam width")
+    for bucket in compile_stats["buckets"]:
+        warmup = ", ".join(f"{item['numBeams']}: {item['seconds']:.1f}"
+                           for item in compile_stats["warmup"] if item["bucket"] == bucket)
+        print(f"{bucket:>8} {compile_stats['requests'].get(str(bucket), 0):>9}  {warmup}")
+    print(f"Longer than the largest bucket (eager): {compile_stats['eager']}, "
+          f"recompiles after warm-up: {compile_stats['recompiles']}")
+    print()
+    print(f"{'':<10} {'mean s':>8} {'p50 s':>8} {'p95 s':>8}")
+    for name in ("eager", "compiled"):
+        row = report[name]
+        print(f"{name:<10} {row['mean']:>8.3f} {row['p50']:>8.3f} {row['p95']:>8.3f}")
+    print(f"Speedup {report['speedup']:.2f}x, identical outputs {report['exactAgreement']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
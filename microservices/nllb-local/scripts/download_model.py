@@ -5,10 +5,43 @@ Downloads and manages the NLLB 600M model for local inference
 """
 
 import os
+import re
 import sys
+import json
+import time
+import shutil
 import argparse
+import unicodedata
 from pathlib import Path
 
+MODELS_DIR = Path(__file__).parent.parent / "models"
+
+# 服务使用的语言（NLLB 代码）从 translation-service.js 的 languageMap 中读取
+SERVICE_FILE = Path(__file__).parent.parent / "src" / "translation-service.js"
+LANGUAGE_MAP_ENTRY = re.compile(r"'[\w-]+':\s*'([a-z]{3}_[A-Z][a-z]{3})'")
+
+# 裁剪模型目录中的词表映射文件：裁剪前 ID 列表（下标即新 ID），NLLBTranslator 据此识别裁剪模型
+PRUNED_VOCAB_FILE = "pruned_vocab.json"
+
+# NLLB 语言代码中的书写系统 -> Unicode 字符名前缀
+SCRIPT_PREFIXES = {
+    "Latn": ("LATIN",), "Arab": ("ARABIC",), "Deva": ("DEVANAGARI",), "Ethi": ("ETHIOPIC",),
+    "Mymr": ("MYANMAR",), "Khmr": ("KHMER",), "Laoo": ("LAO",), "Cyrl": ("CYRILLIC",),
+    "Sinh": ("SINHALA",), "Telu": ("TELUGU",), "Hans": ("CJK",), "Hant": ("CJK",),
+    "Beng": ("BENGALI",), "Grek": ("GREEK",), "Hebr": ("HEBREW",), "Thai": ("THAI",),
+    "Tibt": ("TIBETAN",), "Geor": ("GEORGIAN",), "Armn": ("ARMENIAN",), "Gujr": ("GUJARATI",),
+    "Knda": ("KANNADA",), "Mlym": ("MALAYALAM",), "Taml": ("TAMIL",), "Orya": ("ORIYA",),
+    "Guru": ("GURMUKHI",), "Hang": ("HANGUL",), "Jpan": ("CJK", "HIRAGANA", "KATAKANA"),
+}
+
+# 等价性检查的默认英文样例
+DEFAULT_SAMPLES = [
+    "Hello, how are you today?",
+    "Translate your documents quickly and for free.",
+    "The meeting has been moved to 3 PM on Friday.",
+    "Please sign in to view your translation history.",
+]
+
 def check_dependencies():
     """检查Python依赖"""
     required_packages = ['transformers', 'torch', 'sentencepiece']
@@ -130,12 +163,296 @@ def cleanup_model():
     
     print("✅ Cleanup completed!")
 
+
+def service_languages():
+    """translation-service.js 中 languageMap 的 NLLB 语言代码"""
+    with open(SERVICE_FILE, "r", encoding="utf-8") as f:
+        return sorted(set(LANGUAGE_MAP_ENTRY.findall(f.read())))
+
+def directory_size(path):
+    return sum(f.stat().st_size for f in Path(path).rglob('*') if f.is_file())
+
+def script_filter(languages):
+    """返回判断子词是否只由这些语言的书写系统（以及数字、标点等非字母字符）组成的函数"""
+    unknown = sorted({lang.split("_")[1] for lang in languages} - set(SCRIPT_PREFIXES))
+    if unknown:
+        raise ValueError(f"Unknown scripts {unknown}, pass --corpus instead")
+    prefixes = tuple(p for lang in languages for p in SCRIPT_PREFIXES[lang.split("_")[1]])
+    
+    def allowed(token):
+        for char in token:
+            if not unicodedata.category(char).startswith(("L", "M")):
+                continue
+            name = unicodedata.name(char, "")
+            if not (name.startswith(prefixes) or name.startswith(("COMBINING", "MODIFIER"))):
+                return False
+        return True
+    
+    return allowed
+
+def merge_parts(merge):
+    """BPE 合并规则的两个组成部分，兼容 "a b" 和 ["a", "b"] 两种格式"""
+    return tuple(merge.split(" ", 1)) if isinstance(merge, str) else tuple(merge)
+
+def select_vocabulary(tokenizer_json, languages, corpus_ids=None):
+    """
+    裁剪后保留的原始 token ID（升序）
+    没有语料时保留只含目标书写系统字符的全部子词；有语料时保留语料中出现的子词加上
+    这些书写系统的单字符子词（保证任意文本仍可切分）。所有 added token（特殊符号、语言代码）都保留，
+    BPE 模型还会补齐合成保留子词所需的中间子词
+    """
+    model = tokenizer_json["model"]
+    if model["type"] == "BPE":
+        vocab = model["vocab"]
+    elif model["type"] == "Unigram":
+        vocab = {piece: index for index, (piece, _) in enumerate(model["vocab"])}
+    else:
+        raise ValueError(f"Unsupported tokenizer model: {model['type']}")
+    
+    allowed = script_filter(languages)
+    if corpus_ids is None:
+        kept = {token_id for token, token_id in vocab.items() if allowed(token)}
+    else:
+        kept = set(corpus_ids) | {token_id for token, token_id in vocab.items()
+                                  if len(token.lstrip("▁")) <= 1 and allowed(token)}
+    kept |= {token["id"] for token in tokenizer_json["added_tokens"]}
+    
+    if model["type"] == "BPE":
+        # 合并结果被保留时，它的两个组成部分也必须保留
+        produced = {a + b: (a, b) for a, b in map(merge_parts, model["merges"])}
+        stack = [token for token, token_id in vocab.items() if token_id in kept]
+        while stack:
+            parts = produced.get(stack.pop())
+            for part in parts or ():
+                if part in vocab and vocab[part] not in kept:
+                    kept.add(vocab[part])
+                    stack.append(part)
+    
+    return sorted(kept)
+
+def remap_ids(node, mapping):
+    """递归替换 post_processor 等结构中的 "ids" / "id"（整数）字段"""
+    if isinstance(node, dict):
+        return {key: ([mapping[i] for i in value] if key == "ids" and isinstance(value, list)
+                      else mapping[value] if key == "id" and isinstance(value, int)
+                      else remap_ids(value, mapping))
+                for key, value in node.items()}
+    if isinstance(node, list):
+        return [remap_ids(item, mapping) for item in node]
+    return node
+
+def prune_tokenizer_json(tokenizer_json, kept):
+    """按保留的原始 ID 重建 tokenizer.json，新 ID 为其在 kept 中的下标"""
+    mapping = {old: new for new, old in enumerate(kept)}
+    pruned = dict(tokenizer_json)
+    model = dict(tokenizer_json["model"])
+    
+    if model["type"] == "BPE":
+        model["vocab"] = {token: mapping[token_id] for token, token_id in model["vocab"].items() if token_id in mapping}
+        # 两个组成部分和合并结果都保留的合并规则才有意义
+        model["merges"] = [m for m in model["merges"]
+                           if all(token in model["vocab"] for token in (*merge_parts(m), "".join(merge_parts(m))))]
+    else:
+        model["vocab"] = [entry for index, entry in enumerate(model["vocab"]) if index in mapping]
+        if model.get("unk_id") is not None:
+            model["unk_id"] = mapping[model["unk_id"]]
+    
+    pruned["model"] = model
+    pruned["added_tokens"] = [{**token, "id": mapping[token["id"]]} for token in tokenizer_json["added_tokens"]]
+    if tokenizer_json.get("post_processor"):
+        pruned["post_processor"] = remap_ids(tokenizer_json["post_processor"], mapping)
+    return pruned
+
+def prune_embeddings(model, kept):
+    """
+    只保留 kept 行的词嵌入和输出层
+    按词表大小找出所有词嵌入 / 输出投影（编码器、解码器、lm_head），共享同一权重的模块裁剪后仍共享
+    """
+    import torch
+    
+    index = torch.tensor(kept, dtype=torch.long)
+    vocab_size = model.get_input_embeddings().num_embeddings
+    pruned = {}
+    for module in model.modules():
+        if isinstance(module, torch.nn.Embedding) and module.num_embeddings == vocab_size:
+            module.num_embeddings = len(kept)
+        elif isinstance(module, torch.nn.Linear) and module.out_features == vocab_size:
+            module.out_features = len(kept)
+        else:
+            continue
+        key = module.weight.data_ptr()
+        if key not in pruned:
+            pruned[key] = torch.nn.Parameter(module.weight.data.index_select(0, index).clone())
+        module.weight = pruned[key]
+        if getattr(module, "bias", None) is not None:
+            module.bias = torch.nn.Parameter(module.bias.data.index_select(0, index).clone())
+
+def remap_special_ids(config, mapping):
+    """config / generation_config 中的特殊 token ID 改为新 ID"""
+    for name in ("bos_token_id", "eos_token_id", "pad_token_id", "decoder_start_token_id",
+                 "forced_bos_token_id", "forced_eos_token_id"):
+        value = getattr(config, name, None)
+        if isinstance(value, int):
+            setattr(config, name, mapping[value])
+        elif isinstance(value, list):
+            setattr(config, name, [mapping[v] for v in value])
+
+def timed_load(translate, model_dir):
+    """用 NLLBTranslator 加载模型，返回 (translator, 秒)"""
+    translate.model_dir = Path(model_dir)
+    translator = translate.NLLBTranslator()
+    started = time.perf_counter()
+    if not translator.load_model():
+        raise RuntimeError(f"Failed to load {model_dir}")
+    return translator, time.perf_counter() - started
+
+def prune_model(args):
+    """裁剪模型：只保留服务语言需要的词表，重排 token ID，并对比完整模型的大小、加载时间和输出"""
+    check_dependencies()
+    
+    import torch
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+    
+    source_dir = Path(args.source)
+    output_dir = Path(args.output)
+    languages = sorted(set(args.langs or service_languages()) | {"eng_Latn"})
+    print(f"✂️  Pruning {source_dir} for {len(languages)} languages: {', '.join(languages)}")
+    
+    if not (source_dir / "tokenizer.json").exists():
+        print(f"❌ {source_dir / 'tokenizer.json'} not found. Run download first.")
+        return False
+    
+    with open(source_dir / "tokenizer.json", "r", encoding="utf-8") as f:
+        tokenizer_json = json.load(f)
+    
+    corpus_ids = None
+    if args.corpus:
+        # 用完整模型的分词器切分每种语言的语料，记录出现过的子词
+        tokenizer = AutoTokenizer.from_pretrained(source_dir)
+        corpus_ids = set()
+        for lang in languages:
+            path = Path(args.corpus) / f"{lang}.txt"
+            if not path.exists():
+                print(f"  ⚠️  {path} not found, {lang} keeps only single-character subwords")
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                lines = [line.strip() for line in f if line.strip()]
+            for start in range(0, len(lines), 256):
+                for ids in tokenizer(lines[start:start + 256], add_special_tokens=False)["input_ids"]:
+                    corpus_ids.update(ids)
+    
+    try:
+        kept = select_vocabulary(tokenizer_json, languages, corpus_ids)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
+    
+    original_size = len(tokenizer_json["model"]["vocab"]) + sum(
+        1 for token in tokenizer_json["added_tokens"]
+        if token["id"] >= len(tokenizer_json["model"]["vocab"]))
+    mapping = {old: new for new, old in enumerate(kept)}
+    print(f"📖 Keeping {len(kept)} of {original_size} tokens ({len(kept) / original_size:.1%})")
+    
+    if output_dir.exists():
+        shutil.rmtree(output_dir)
+    output_dir.mkdir(parents=True)
+    
+    # 分词器：重建 tokenizer.json，tokenizer_config.json 中的 ID 一并改写；不复制 sentencepiece 模型
+    with open(output_dir / "tokenizer.json", "w", encoding="utf-8") as f:
+        json.dump(prune_tokenizer_json(tokenizer_json, kept), f, ensure_ascii=False)
+    for name in ("tokenizer_config.json", "special_tokens_map.json"):
+        if not (source_dir / name).exists():
+            continue
+        with open(source_dir / name, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if "added_tokens_decoder" in data:
+            data["added_tokens_decoder"] = {str(mapping[int(k)]): v for k, v in data["added_tokens_decoder"].items()
+                                            if int(k) in mapping}
+        with open(output_dir / name, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+    
+    # 模型：裁剪词嵌入和输出层
+    print("📥 Loading full model...")
+    model = AutoModelForSeq2SeqLM.from_pretrained(source_dir)
+    with torch.no_grad():
+        prune_embeddings(model, kept)
+    model.config.vocab_size = len(kept)
+    remap_special_ids(model.config, mapping)
+    if model.generation_config is not None:
+        remap_special_ids(model.generation_config, mapping)
+    model.save_pretrained(output_dir)
+    
+    with open(output_dir / PRUNED_VOCAB_FILE, "w", encoding="utf-8") as f:
+        json.dump({
+            "source": str(source_dir),
+            "languages": languages,
+            "originalVocabSize": original_size,
+            "vocabSize": len(kept),
+            "keptIds": kept,
+        }, f)
+    del model
+    
+    # 报告：大小、加载时间、与完整模型输出是否一致
+    sys.path.insert(0, str(Path(__file__).parent))
+    import translate
+    
+    full, full_load = timed_load(translate, source_dir)
+    pruned, pruned_load = timed_load(translate, output_dir)
+    
+    full_size = directory_size(source_dir)
+    pruned_size = directory_size(output_dir)
+    full_params = sum(p.numel() for p in full.model.parameters())
+    pruned_params = sum(p.numel() for p in pruned.model.parameters())
+    
+    samples = DEFAULT_SAMPLES
+    if args.samples:
+        with open(args.samples, "r", encoding="utf-8") as f:
+            samples = [line.strip() for line in f if line.strip()]
+    check_langs = args.check_langs or [lang for lang in languages if lang != "eng_Latn"][:3]
+    
+    same_tokens = sum(full.tokenizer(text)["input_ids"] == [kept[i] for i in pruned.tokenizer(text)["input_ids"]]
+                      for text in samples)
+    matches = 0
+    total = 0
+    differences = []
+    for lang in check_langs:
+        for text in samples:
+            expected = full.translate(text, "eng_Latn", lang)
+            actual = pruned.translate(text, "eng_Latn", lang)
+            total += 1
+            if expected == actual:
+                matches += 1
+            elif len(differences) < 5:
+                differences.append((lang, text, expected, actual))
+    
+    print("📊 Pruning report:")
+    print(f"  📦 Size: {full_size / 1024 ** 2:.1f} MB -> {pruned_size / 1024 ** 2:.1f} MB "
+          f"({pruned_size / full_size - 1:+.1%})")
+    print(f"  🧮 Parameters: {full_params:,} -> {pruned_params:,} ({pruned_params / full_params - 1:+.1%})")
+    print(f"  ⏱️  Load time: {full_load:.2f}s -> {pruned_load:.2f}s")
+    print(f"  🔤 Identical tokenization: {same_tokens}/{len(samples)} samples")
+    print(f"  🧪 Identical translations: {matches}/{total} ({', '.join(check_langs)})")
+    for lang, text, expected, actual in differences:
+        print(f"    - [{lang}] {text}\n      full:   {expected}\n      pruned: {actual}")
+    print(f"✅ Pruned model saved to: {output_dir} (NLLB_MODEL_DIR={output_dir})")
+    return True
+
 def main():
     parser = argparse.ArgumentParser(description="NLLB Model Management")
-    parser.add_argument("command", choices=["download", "verify", "info", "cleanup"], 
+    parser.add_argument("command", choices=["download", "verify", "info", "cleanup", "prune"], 
                        default="download", nargs="?",
                        help="Command to execute")
     
+    # prune 参数
+    parser.add_argument("--langs", nargs="+", metavar="NLLB_CODE",
+                       help="Languages to keep for prune (default: languageMap in src/translation-service.js)")
+    parser.add_argument("--corpus", help="Directory with <lang>.txt files; keep only subwords seen there")
+    parser.add_argument("--source", default=str(MODELS_DIR / "nllb-600m"), help="Full model directory")
+    parser.add_argument("--output", default=str(MODELS_DIR / "nllb-600m-pruned"), help="Pruned model directory")
+    parser.add_argument("--samples", help="English sentences (one per line) for the equivalence check")
+    parser.add_argument("--check-langs", nargs="+", metavar="NLLB_CODE",
+                       help="Target languages for the equivalence check (default: first three kept languages)")
+    
     args = parser.parse_args()
     
     if args.command == "download":
@@ -146,6 +463,9 @@ def main():
         get_model_info()
     elif args.command == "cleanup":
         cleanup_model()
+    elif args.command == "prune":
+        if not prune_model(args):
+            sys.exit(1)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
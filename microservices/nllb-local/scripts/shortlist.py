@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+NLLB target-language vocabulary shortlists
+
+build:  tokenize a local corpus (<corpus>/<lang>.txt, one sentence per line, e.g. hat_Latn.txt)
+        and write the subword IDs that cover the target language to <model_dir>/shortlists/<lang>.json
+report: translate a set of source sentences with full-vocabulary and shortlist decoding,
+        and report the speedup against output agreement
+
+translate.py uses the shortlists when NLLB_SHORTLIST=1.
+"""
+
+import argparse
+import difflib
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import translate  # noqa: E402  (exits with a JSON error when torch/transformers are missing)
+
+
+def build_shortlist(tokenizer, lines, coverage=1.0, min_count=1):
+    """
+    Subword IDs seen in the target-language text, most frequent first, until `coverage`
+    of all token occurrences is reached; IDs seen fewer than `min_count` times are dropped
+    """
+    counts = Counter()
+    for start in range(0, len(lines), 256):
+        for ids in tokenizer(lines[start:start + 256], add_special_tokens=False)["input_ids"]:
+            counts.update(ids)
+
+    total = sum(counts.values())
+    kept = []
+    covered = 0
+    for token_id, count in counts.most_common():
+        if count < min_count or (total and covered / total >= coverage):
+            break
+        kept.append(token_id)
+        covered += count
+
+    return {
+        "ids": sorted(kept),
+        "coverage": round(covered / total, 6) if total else 0.0,
+        "lines": len(lines),
+        "tokens": total,
+        "distinct": len(counts),
+    }
+
+
+def read_lines(path, limit=None):
+    with open(path, "r", encoding="utf-8") as f:
+        lines = [line.strip() for line in f if line.strip()]
+    return lines[:limit] if limit else lines
+
+
+def command_build(args, translator):
+    corpus = Path(args.corpus)
+    files = sorted(corpus.glob("*.txt"))
+    if args.langs:
+        files = [corpus / f"{lang}.txt" for lang in args.langs]
+    output_dir = Path(args.output or translate.shortlist_dir())
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    vocab_size = len(translator.tokenizer)
+    print(f"📚 Building shortlists from {corpus} (vocabulary: {vocab_size})")
+    for path in files:
+        if not path.exists():
+            print(f"  ❌ {path.stem}: {path} not found")
+            continue
+        lang = path.stem
+        translator.tokenizer.src_lang = lang
+        shortlist = build_shortlist(translator.tokenizer, read_lines(path, args.limit), args.coverage, args.min_count)
+        shortlist.update(lang=lang, vocabSize=vocab_size)
+        with open(output_dir / f"{lang}.json", "w", encoding="utf-8") as f:
+            json.dump(shortlist, f)
+        print(f"  ✅ {lang}: {len(shortlist['ids'])} ids ({len(shortlist['ids']) / vocab_size:.1%} of vocabulary), "
+              f"coverage {shortlist['coverage']:.4f} over {shortlist['tokens']} tokens / {shortlist['lines']} lines")
+
+
+def timed_translations(translator, texts, src_lang, tgt_lang):
+    results = []
+    started = time.perf_counter()
+    for text in texts:
+        detailed = translator.translate_detailed(text, src_lang, tgt_lang, deadline=0)
+        results.append(detailed["translatedText"] if detailed else "")
+    return results, time.perf_counter() - started
+
+
+def command_report(args, translator):
+    texts = read_lines(args.source, args.limit)
+    report = {"source": str(args.source), "sentences": len(texts), "languages": {}}
+
+    for lang in args.langs:
+        translator.shortlist = True
+        shortlist = translator.load_shortlist(lang)
+        if shortlist is None:
+            print(f"  ❌ {lang}: no usable shortlist in {translate.shortlist_dir()}")
+            continue
+
+        # Warm up both paths once so the first measured call does not pay for lazy initialisation
+        for enabled in (False, True):
+            translator.shortlist = enabled
+            translator.translate_detailed(texts[0], args.src_lang, lang, deadline=0)
+
+        translator.shortlist = False
+        full, full_seconds = timed_translations(translator, texts, args.src_lang, lang)
+        translator.shortlist = True
+        short, short_seconds = timed_translations(translator, texts, args.src_lang, lang)
+
+        exact = sum(a == b for a, b in zip(full, short)) / len(texts)
+        similarity = sum(difflib.SequenceMatcher(None, a, b).ratio() for a, b in zip(full, short)) / len(texts)
+        report["languages"][lang] = {
+            "shortlistSize": len(shortlist.ids),
+            "vocabSize": len(translator.tokenizer),
+            "fullSeconds": round(full_seconds, 4),
+            "shortlistSeconds": round(short_seconds, 4),
+            "speedup": round(full_seconds / short_seconds, 3) if short_seconds else None,
+            "exactAgreement": round(exact, 4),
+            "similarity": round(similarity, 4),
+            "disagreements": [{"source": t, "full": a, "shortlist": b}
+                              for t, a, b in zip(texts, full, short) if a != b][:args.examples],
+        }
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+
+    print(f"📊 Shortlist report: {len(texts)} sentences from {args.source}, {args.src_lang} -> target")
+    print(f"{'lang':<10} {'ids':>8} {'full s':>9} {'short s':>9} {'speedup':>8} {'exact':>7} {'similar':>8}")
+    for lang, row in report["languages"].items():
+        print(f"{lang:<10} {row['shortlistSize']:>8} {row['fullSeconds']:>9.2f} {row['shortlistSeconds']:>9.2f} "
+              f"{row['speedup'] or 0:>7.2f}x {row['exactAgreement']:>7.1%} {row['similarity']:>8.1%}")
+        for item in row["disagreements"]:
+            print(f"    - {item['source']}\n      full:      {item['full']}\n      shortlist: {item['shortlist']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and evaluate NLLB target-language vocabulary shortlists")
+    parser.add_argument("--model-dir", type=Path, default=None, help=f"Model directory (default: {translate.model_dir})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("build", help="Build shortlists from a local corpus")
+    build.add_argument("--corpus", required=True, help="Directory with <lang>.txt files (NLLB codes, e.g. hat_Latn.txt)")
+    build.add_argument("--langs", nargs="+", help="Only these languages (default: every file in the corpus)")
+    build.add_argument("--output", help="Output directory (default: NLLB_SHORTLIST_DIR or <model_dir>/shortlists)")
+    build.add_argument("--coverage", type=float, default=1.0,
+                       help="Keep the most frequent IDs until this share of token occurrences is covered (default: 1.0)")
+    build.add_argument("--min-count", type=int, default=1, help="Drop IDs seen fewer times than this (default: 1)")
+    build.add_argument("--limit", type=int, default=None, help="Only read the first N lines of each file")
+
+    report = subparsers.add_parser("report", help="Compare shortlist decoding with full-vocabulary decoding")
+    report.add_argument("--source", required=True, help="Source sentences, one per line")
+    report.add_argument("--langs", nargs="+", required=True, help="Target languages (NLLB codes)")
+    report.add_argument("--src-lang", default="eng_Latn", help="Source language (default: eng_Latn)")
+    report.add_argument("--limit", type=int, default=50, help="Number of sentences to translate (default: 50)")
+    report.add_argument("--examples", type=int, default=3, help="Disagreeing outputs to show per language")
+    report.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    args = parser.parse_args()
+    if args.model_dir:
+        translate.model_dir = args.model_dir
+
+    translator = translate.NLLBTranslator()
+    if not translator.load_model():
+        sys.exit(1)
+
+    if args.command == "build":
+        command_build(args, translator)
+    else:
+        command_report(args, translator)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Summarise NLLB request traces
+
+translate.py writes one JSON file per traced request (--trace, or sampled with NLLB_TRACE_SAMPLE_RATE)
+to NLLB_TRACE_DIR. This script aggregates them: per-stage latency percentiles (load_model, tokenize,
+generate per decoding stage, decode) and the operators that account for the most self time
+across all traces.
+"""
+
+import argparse
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+DEFAULT_TRACE_DIR = Path(__file__).parent.parent / "traces"
+
+
+def trace_files(paths):
+    """Trace JSON files from the given files/directories (torch chrome traces are skipped)"""
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(p for p in path.glob("*.json") if not p.name.endswith(".chrome.json")))
+        elif path.exists():
+            files.append(path)
+    return files
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(traces, top=20):
+    totals = [trace["totalMs"] for trace in traces]
+    spans = defaultdict(list)
+    operators = defaultdict(lambda: {"calls": 0, "selfMs": 0.0, "totalMs": 0.0, "traces": 0})
+    errors = 0
+
+    for trace in traces:
+        if trace["meta"].get("error") or trace["meta"].get("errors"):
+            errors += 1
+        for span in trace["spans"]:
+            name = f"{span['name']}:{span['stage']}" if span.get("stage") else span["name"]
+            spans[name].append(span["durationMs"])
+        for row in trace["operators"]:
+            operator = operators[(trace["profiler"], row["name"])]
+            operator["calls"] += row["calls"]
+            operator["selfMs"] += row["selfMs"]
+            operator["totalMs"] += row["totalMs"]
+            operator["traces"] += 1
+
+    hottest = sorted(operators.items(), key=lambda item: item[1]["selfMs"], reverse=True)[:top]
+    grand_total = sum(totals) or 1.0
+    return {
+        "traces": len(traces),
+        "errors": errors,
+        "totalMs": {"p50": percentile(totals, 50), "p95": percentile(totals, 95), "max": max(totals, default=0.0)},
+        "spans": {
+            name: {
+                "count": len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "max": max(values),
+                "share": round(sum(values) / grand_total, 4),
+            }
+            for name, values in sorted(spans.items(), key=lambda item: sum(item[1]), reverse=True)
+        },
+        "operators": [
+            {"profiler": profiler, "name": name, **{k: round(v, 3) for k, v in row.items()},
+             "share": round(row["selfMs"] / grand_total, 4)}
+            for (profiler, name), row in hottest
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarise NLLB request traces written by translate.py")
+    parser.add_argument("paths", nargs="*", default=[DEFAULT_TRACE_DIR],
+                        help=f"Trace files or directories (default: {DEFAULT_TRACE_DIR})")
+    parser.add_argument("--top", type=int, default=20, help="Number of hottest operators to show (default: 20)")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args()
+
+    traces = []
+    for path in trace_files(args.paths):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                traces.append(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"  ❌ {path}: {e}", file=sys.stderr)
+    if not traces:
+        print(f"No traces found in {', '.join(map(str, args.paths))}")
+        sys.exit(1)
+
+    summary = summarize(traces, args.top)
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+        return
+
+    total = summary["totalMs"]
+    print(f"🔍 {summary['traces']} traces ({summary['errors']} with errors), "
+          f"total p50 {total['p50']:.1f} ms / p95 {total['p95']:.1f} ms / max {total['max']:.1f} ms")
+    print()
+    print(f"{'stage':<24} {'count':>6} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10} {'share':>7}")
+    for name, row in summary["spans"].items():
+        print(f"{name:<24} {row['count']:>6} {row['p50']:>10.1f} {row['p95']:>10.1f} {row['max']:>10.1f} "
+              f"{row['share']:>7.1%}")
+    print()
+    print(f"{'self ms':>10} {'share':>7} {'calls':>9} {'traces':>6}  operator")
+    for row in summary["operators"]:
+        print(f"{row['selfMs']:>10.1f} {row['share']:>7.1%} {row['calls']:>9} {row['traces']:>6}  "
+              f"[{row['profiler']}] {row['name']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,91 +1,750 @@
 #!/usr/bin/env python3
+import argparse
 import sys
 import json
 import os
+import time
+import random
+import cProfile
+import pstats
+import uuid
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
 
-# 添加模型路径
-model_dir = Path(__file__).parent.parent / "models" / "nllb-600m"
+# 进程启动时刻：Node 服务每个请求启动一个进程，导入 torch 和加载模型的时间也计入请求的截止时间
+PROCESS_STARTED = time.monotonic()
+
+# 添加模型路径（NLLB_MODEL_DIR 可指向其他模型目录，例如 download_model.py prune 生成的裁剪模型）
+model_dir = Path(os.getenv("NLLB_MODEL_DIR") or Path(__file__).parent.parent / "models" / "nllb-600m")
+
+# 裁剪模型的词表映射文件（download_model.py prune 生成）：裁剪前的 token ID 列表，下标即新 ID
+PRUNED_VOCAB_FILE = "pruned_vocab.json"
 
 try:
-    from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+    from transformers import AutoTokenizer, AutoModelForSeq2SeqLM, StoppingCriteria, StoppingCriteriaList
     import torch
 except ImportError as e:
     print(json.dumps({"error": f"Missing dependency: {e}"}))
     sys.exit(1)
 
+# 单个请求的默认截止时间（秒），0 表示不限制
+DEFAULT_DEADLINE_SECONDS = float(os.getenv("NLLB_DEADLINE_SECONDS", "0"))
+
+# 每一级解码可使用的剩余预算比例，超出后降级到下一级
+STAGE_BUDGET_RATIO = float(os.getenv("NLLB_STAGE_BUDGET_RATIO", "0.5"))
+
+# 解码降级阶梯：完整束搜索 -> 缩小束宽 -> 贪心解码
+DECODING_LADDER = [
+    {"name": "beam4", "num_beams": 4},
+    {"name": "beam2", "num_beams": 2},
+    {"name": "greedy", "num_beams": 1},
+]
+
+
+# 目标语言词表裁剪：只计算该语言语料中出现过的子词的输出 logits（scripts/shortlist.py 生成）
+SHORTLIST_ENABLED = os.getenv("NLLB_SHORTLIST", "0") == "1"
+
+
+def shortlist_dir():
+    """shortlist 文件目录，默认 <model_dir>/shortlists，每个目标语言一个 <lang>.json"""
+    return Path(os.getenv("NLLB_SHORTLIST_DIR") or model_dir / "shortlists")
+
+
+class Shortlist:
+    """目标语言的候选子词 ID（已排序）和对应的输出层权重切片，加载 shortlist 时切一次，随 shortlist 缓存"""
+
+    def __init__(self, ids, full):
+        self.ids = ids
+        with torch.no_grad():
+            self.weight = full.weight.index_select(0, ids)
+            self.bias = full.bias.index_select(0, ids) if full.bias is not None else None
+
+
+class ShortlistLMHead(torch.nn.Module):
+    """
+    只覆盖候选子词的输出层：logits 宽度等于候选数（紧凑词表），generate 直接在紧凑 ID 上做束搜索
+    候选 = shortlist（使用缓存的权重切片）+ 本次输入中不在 shortlist 里的子词（专名、数字等可以原样复制）
+    ids[紧凑 ID] 为完整词表中的 ID，按升序排列，束搜索遇到同分时和完整词表一样选 ID 较小的子词
+    """
+
+    def __init__(self, shortlist, full, input_ids):
+        super().__init__()
+        self.shortlist = shortlist
+        extra = torch.unique(input_ids.flatten().to(shortlist.ids.device))
+        extra = extra[~torch.isin(extra, shortlist.ids)]
+        with torch.no_grad():
+            self.extra_weight = full.weight.index_select(0, extra)
+            self.extra_bias = full.bias.index_select(0, extra) if full.bias is not None else None
+        # shortlist 和额外子词的 logits 拼接后按 order 重排成升序
+        self.ids, self.order = torch.cat([shortlist.ids, extra]).sort()
+
+    def compact_id(self, token_id):
+        """完整词表 ID -> 紧凑 ID（generate 的特殊 token 参数），None 原样返回"""
+        if token_id is None:
+            return None
+        return int((self.ids == token_id).nonzero()[0, 0])
+
+    def forward(self, hidden_states):
+        logits = torch.nn.functional.linear(hidden_states, self.shortlist.weight, self.shortlist.bias)
+        if len(self.extra_weight):
+            extra = torch.nn.functional.linear(hidden_states, self.extra_weight, self.extra_bias)
+            logits = torch.cat([logits, extra], dim=-1).index_select(-1, self.order)
+        return logits
+
+
+class CompactEmbedding(torch.nn.Module):
+    """紧凑词表下的解码器输入嵌入：把紧凑 ID 换回完整 ID 后查原嵌入层（保留其缩放）"""
+
+    def __init__(self, embed, ids):
+        super().__init__()
+        self.embed = embed
+        self.ids = ids
+
+    def forward(self, input_ids):
+        return self.embed(self.ids[input_ids])
+
+
+# 编译模式：输入补齐到固定的长度档位（token 数），启动时每个档位用 torch.compile 编译一次编码器和解码步，
+# 之后同一档位的请求复用已编译的图。编译需要数十秒，只适合常驻进程（本地后端、评测脚本）
+COMPILE_ENABLED = os.getenv("NLLB_COMPILE", "0") == "1"
+COMPILE_BUCKETS = tuple(sorted(int(v) for v in os.getenv("NLLB_COMPILE_BUCKETS", "32,64,128,256").split(",") if v.strip()))
+
+# torch.compile 的 mode，默认 GPU 上为 reduce-overhead（CUDA graphs），CPU 上为 default
+COMPILE_MODE = os.getenv("NLLB_COMPILE_MODE") or None
+
+# 预热时每个档位生成的步数：预填充之后至少再走一步，才会触发解码步的编译
+COMPILE_WARMUP_STEPS = 3
+
+
+# 请求追踪：--trace 强制追踪单个请求；NLLB_TRACE_SAMPLE_RATE 为后台抽样比例（0-1）
+TRACE_SAMPLE_RATE = float(os.getenv("NLLB_TRACE_SAMPLE_RATE", "0"))
+TRACE_DIR = Path(os.getenv("NLLB_TRACE_DIR") or Path(__file__).parent.parent / "traces")
+
+# 追踪使用的分析器：cprofile（Python 函数）或 torch（算子级，额外导出 chrome trace）
+TRACE_PROFILER = os.getenv("NLLB_TRACE_PROFILER", "cprofile")
+
+# 每个追踪文件记录的热点算子 / 函数数量
+TRACE_TOP_OPERATORS = 50
+
+
+class RequestTrace:
+    """
+    单个请求的追踪：记录分词、每次 generate、解码等阶段的耗时，并用 cProfile 或 torch.profiler
+    采集热点；结束时写入 <trace_dir>/<id>.json。未启用时所有方法都是空操作
+    """
+
+    def __init__(self, enabled, profiler=None, trace_dir=None, **meta):
+        self.enabled = enabled
+        self.profiler_kind = profiler or TRACE_PROFILER
+        self.trace_dir = Path(trace_dir or TRACE_DIR)
+        self.meta = meta
+        self.spans = []
+        self.id = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.path = None
+        self._profiler = None
+        self._origin = None
+
+    @classmethod
+    def sampled(cls, trace=None, **meta):
+        """trace 为 True 时强制追踪，为 None 时按 NLLB_TRACE_SAMPLE_RATE 抽样"""
+        if trace is None:
+            trace = TRACE_SAMPLE_RATE > 0 and random.random() < TRACE_SAMPLE_RATE
+        return cls(bool(trace), **meta)
+
+    def __enter__(self):
+        if not self.enabled:
+            return self
+        self._origin = time.perf_counter()
+        if self.profiler_kind == "torch":
+            self._profiler = torch.profiler.profile(
+                activities=[torch.profiler.ProfilerActivity.CPU]
+                + ([torch.profiler.ProfilerActivity.CUDA] if torch.cuda.is_available() else []),
+                record_shapes=True
+            )
+            self._profiler.__enter__()
+        else:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.enabled:
+            return False
+        if self.profiler_kind == "torch":
+            self._profiler.__exit__(exc_type, exc, tb)
+        else:
+            self._profiler.disable()
+        if exc_type is not None:
+            self.meta["error"] = f"{exc_type.__name__}: {exc}"
+        try:
+            self.write()
+        except OSError as e:
+            print(f"Failed to write trace {self.id}: {e}", file=sys.stderr)
+        return False
+
+    @contextmanager
+    def span(self, name, **attrs):
+        """记录一个阶段的耗时；torch 分析器下同时作为 record_function 出现在 chrome trace 中"""
+        if not self.enabled:
+            yield
+            return
+        label = torch.profiler.record_function(name) if self.profiler_kind == "torch" else nullcontext()
+        started = time.perf_counter()
+        try:
+            with label:
+                yield
+        finally:
+            self.spans.append({
+                "name": name,
+                "startMs": round((started - self._origin) * 1000, 3),
+                "durationMs": round((time.perf_counter() - started) * 1000, 3),
+                **attrs,
+            })
+
+    def operators(self):
+        """热点：[{name, calls, selfMs, totalMs}]，按 selfMs 降序"""
+        rows = []
+        if self.profiler_kind == "torch":
+            # record_function 标记的阶段本身不算热点
+            spans = {span["name"] for span in self.spans}
+            for event in self._profiler.key_averages():
+                if event.key in spans:
+                    continue
+                rows.append({
+                    "name": event.key,
+                    "calls": event.count,
+                    "selfMs": round(event.self_cpu_time_total / 1000, 3),
+                    "totalMs": round(event.cpu_time_total / 1000, 3),
+                })
+        else:
+            stats = pstats.Stats(self._profiler)
+            for (filename, line, function), (_, calls, self_time, total_time, _) in stats.stats.items():
+                rows.append({
+                    "name": f"{function} ({Path(filename).name}:{line})" if line else function,
+                    "calls": calls,
+                    "selfMs": round(self_time * 1000, 3),
+                    "totalMs": round(total_time * 1000, 3),
+                })
+        rows.sort(key=lambda row: row["selfMs"], reverse=True)
+        return rows[:TRACE_TOP_OPERATORS]
+
+    def write(self):
+        self.trace_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.trace_dir / f"{self.id}.json"
+        data = {
+            "id": self.id,
+            "profiler": self.profiler_kind,
+            "totalMs": round((time.perf_counter() - self._origin) * 1000, 3),
+            "meta": self.meta,
+            "spans": self.spans,
+            "operators": self.operators(),
+        }
+        if self.profiler_kind == "torch":
+            chrome_path = self.trace_dir / f"{self.id}.chrome.json"
+            self._profiler.export_chrome_trace(str(chrome_path))
+            data["chromeTrace"] = chrome_path.name
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+
+def compiled_graph_count():
+    """当前进程中 torch.compile 生成的图数量"""
+    from torch._dynamo.utils import counters
+    return int(counters["stats"]["unique_graphs"])
+
+
+def fx_graph_cache_counts():
+    """Inductor 磁盘缓存的命中/未命中次数：第二次启动时命中说明复用了上次的编译结果"""
+    from torch._dynamo.utils import counters
+    return {"hit": int(counters["inductor"]["fxgraph_cache_hit"]),
+            "miss": int(counters["inductor"]["fxgraph_cache_miss"])}
+
+
+class DeadlineStoppingCriteria(StoppingCriteria):
+    """到达截止时间（time.monotonic）后停止生成"""
+
+    def __init__(self, deadline):
+        self.deadline = deadline
+        self.triggered = False
+
+    def __call__(self, input_ids, scores, **kwargs):
+        if time.monotonic() >= self.deadline:
+            self.triggered = True
+        return self.triggered
+
+
+class StepStoppingCriteria(StoppingCriteria):
+    """生成 steps 步后停止（编译预热只需要走几步解码）"""
+
+    def __init__(self, steps):
+        self.steps = steps
+        self.calls = 0
+
+    def __call__(self, input_ids, scores, **kwargs):
+        self.calls += 1
+        return self.calls >= self.steps
+
+
 class NLLBTranslator:
-    def __init__(self):
+    def __init__(self, shortlist=None, compile=None):
         self.model = None
         self.tokenizer = None
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        
+        self.shortlist = SHORTLIST_ENABLED if shortlist is None else shortlist
+        self._shortlists = {}
+        # output_vocabulary 期间替换上的紧凑输出层，其余时间为 None
+        self._compact_head = None
+        # 裁剪模型的信息（languages、originalVocabSize、keptIds），完整模型为 None
+        self.pruned_vocab = None
+        # 编译模式：load_model 时按 COMPILE_BUCKETS 预热，compile_mode 为 None 表示 eager
+        self.compile = COMPILE_ENABLED if compile is None else compile
+        self.compile_mode = None
+        self.compile_buckets = ()
+        self._compiled_encoder = None
+        self._compiled_forward = None
+        self.compile_stats = {"warmup": [], "requests": {}, "eager": 0, "graphsAfterWarmup": 0}
+
     def load_model(self):
         if self.model is None:
             try:
                 self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
                 self.model = AutoModelForSeq2SeqLM.from_pretrained(model_dir)
                 self.model.to(self.device)
+                pruned_path = Path(model_dir) / PRUNED_VOCAB_FILE
+                if pruned_path.exists():
+                    with open(pruned_path, "r", encoding="utf-8") as f:
+                        self.pruned_vocab = json.load(f)
+                if self.compile:
+                    self.compile_model()
                 return True
             except Exception as e:
                 print(json.dumps({"error": f"Failed to load model: {e}"}))
                 return False
         return True
-    
-    def translate(self, text, src_lang, tgt_lang):
-        if not self.load_model():
-            return None
-            
+
+    def compile_model(self, buckets=None):
+        """
+        编译并预热：编码器和解码步（模型 forward，配合静态 KV cache）都按静态形状编译。
+        每个档位、解码阶梯中的每种束宽各生成几步，触发编译。编译失败时退回 eager
+        """
+        buckets = tuple(sorted(buckets or COMPILE_BUCKETS))
+        if self.shortlist:
+            # 每次替换输出层都会触发重新编译
+            print("NLLB_SHORTLIST is ignored in compiled mode", file=sys.stderr)
+            self.shortlist = False
+
+        beams = sorted({stage["num_beams"] for stage in DECODING_LADDER}, reverse=True)
+        mode = COMPILE_MODE or ("reduce-overhead" if self.device.type == "cuda" else "default")
+        try:
+            # 每个档位一张编码器图；每个 (档位, 束宽) 两张解码图（预填充时交叉注意力 cache 尚未写入，之后为已写入）。
+            # 较旧的 torch 中这个上限叫 cache_size_limit
+            dynamo_config = torch._dynamo.config
+            limit_name = "recompile_limit" if hasattr(dynamo_config, "recompile_limit") else "cache_size_limit"
+            setattr(dynamo_config, limit_name, max(getattr(dynamo_config, limit_name),
+                                                   len(buckets) * (2 * len(beams) + 1) + 8))
+            self._compiled_encoder = torch.compile(self.model.get_encoder(), dynamic=False, mode=mode)
+            self._compiled_forward = torch.compile(self.model.forward, dynamic=False, mode=mode)
+            self.compile_mode = mode
+            self.compile_buckets = buckets
+
+            sample = self.tokenizer("Hello", return_tensors="pt")
+            sample = {k: v.to(self.device) for k, v in sample.items()}
+            bos_id = self.tokenizer.convert_tokens_to_ids(self.tokenizer.src_lang)
+            for bucket in buckets:
+                for num_beams in beams:
+                    started = time.perf_counter()
+                    inputs, kwargs = self.bucketed(sample, bucket=bucket)
+                    self._generate(
+                        inputs, bos_id, num_beams,
+                        stopping_criteria=StoppingCriteriaList([StepStoppingCriteria(COMPILE_WARMUP_STEPS)]),
+                        **kwargs
+                    )
+                    self.compile_stats["warmup"].append({
+                        "bucket": bucket,
+                        "numBeams": num_beams,
+                        "seconds": round(time.perf_counter() - started, 3),
+                    })
+            self.compile_stats["graphsAfterWarmup"] = compiled_graph_count()
+        except Exception as e:
+            print(f"torch.compile failed, falling back to eager: {e}", file=sys.stderr)
+            self.compile_mode = None
+            self._compiled_encoder = None
+            self._compiled_forward = None
+            self.compile_buckets = ()
+
+    def bucketed(self, inputs, bucket=None):
+        """
+        编译模式下把输入补齐到能容纳它的最小档位，并用编译好的编码器编码，返回 (inputs, generate 额外参数)。
+        未启用编译或超过最大档位时原样返回，走 eager 路径
+        """
+        if self.compile_mode is None:
+            return inputs, {}
+
+        length = inputs["input_ids"].shape[-1]
+        if bucket is None:
+            bucket = next((b for b in self.compile_buckets if b >= length), None)
+            if bucket is None:
+                self.compile_stats["eager"] += 1
+                return inputs, {}
+            self.compile_stats["requests"][bucket] = self.compile_stats["requests"].get(bucket, 0) + 1
+
+        # 右侧补 pad，attention_mask 屏蔽补齐的位置，编码结果与不补齐时一致
+        padded = {
+            "input_ids": torch.nn.functional.pad(inputs["input_ids"], (0, bucket - length),
+                                                 value=self.tokenizer.pad_token_id),
+            "attention_mask": torch.nn.functional.pad(inputs["attention_mask"], (0, bucket - length), value=0),
+        }
+        # 编码器输出只算一次，解码阶梯的每一级都复用
+        with torch.no_grad():
+            encoder_outputs = self._compiled_encoder(**padded)
+        # 静态 KV cache 的形状只取决于档位和束宽；解码步由 compiled_forward 编译，不使用 generate 自带的自动编译
+        return padded, {
+            "encoder_outputs": encoder_outputs,
+            "cache_implementation": "static",
+            "disable_compile": True,
+        }
+
+    @contextmanager
+    def compiled_forward(self, enabled):
+        """临时把模型的 forward 换成编译版本，generate 的每一步解码都会调用它"""
+        if not enabled:
+            yield
+            return
+        self.model.forward = self._compiled_forward
+        try:
+            yield
+        finally:
+            del self.model.forward
+
+    def compile_report(self):
+        """编译模式统计：预热耗时、各档位的请求数、超出档位走 eager 的请求数、预热之后新编译的图数"""
+        return {
+            "enabled": self.compile_mode is not None,
+            "mode": self.compile_mode,
+            "buckets": list(self.compile_buckets),
+            "warmup": self.compile_stats["warmup"],
+            "compileSeconds": round(sum(item["seconds"] for item in self.compile_stats["warmup"]), 3),
+            "requests": {str(bucket): count for bucket, count in sorted(self.compile_stats["requests"].items())},
+            "eager": self.compile_stats["eager"],
+            "recompiles": compiled_graph_count() - self.compile_stats["graphsAfterWarmup"],
+            "fxGraphCache": fx_graph_cache_counts(),
+        }
+
+    def check_languages(self, *langs):
+        """裁剪模型只保留了部分语言的词表，其他语言无法正确翻译"""
+        if self.pruned_vocab:
+            missing = [lang for lang in langs if lang not in self.pruned_vocab["languages"]]
+            if missing:
+                raise ValueError(f"Languages not kept in the pruned model {model_dir}: {', '.join(missing)}")
+
+    def load_shortlist(self, tgt_lang):
+        """目标语言的 Shortlist（候选 ID 和输出层权重切片），没有可用的 shortlist 文件时返回 None"""
+        if tgt_lang not in self._shortlists:
+            shortlist = None
+            path = shortlist_dir() / f"{tgt_lang}.json"
+            if path.exists():
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                # 为完整模型构建的 shortlist 在裁剪模型上按词表映射换成新 ID
+                if self.pruned_vocab and data.get("vocabSize") == self.pruned_vocab["originalVocabSize"]:
+                    new_ids = {old: new for new, old in enumerate(self.pruned_vocab["keptIds"])}
+                    data = {**data, "ids": [new_ids[i] for i in data["ids"] if i in new_ids],
+                            "vocabSize": len(self.tokenizer)}
+                # 词表不一致（例如换了模型）时 ID 没有意义，退回完整词表；stdout 留给 JSON 结果
+                if data.get("vocabSize") != len(self.tokenizer):
+                    print(f"Ignoring shortlist {path}: built for vocabulary size {data.get('vocabSize')}, "
+                          f"model has {len(self.tokenizer)}", file=sys.stderr)
+                else:
+                    keep = set(data["ids"]) | set(self.tokenizer.all_special_ids)
+                    keep.add(self.tokenizer.convert_tokens_to_ids(tgt_lang))
+                    ids = torch.tensor(sorted(keep), dtype=torch.long, device=self.device)
+                    # 解码器按 pad ID 计算位置编码，紧凑词表中 pad 必须保持原 ID（特殊 token 都在词表最前面）
+                    pad = self.tokenizer.pad_token_id
+                    if pad >= len(ids) or int(ids[pad]) != pad:
+                        print(f"Ignoring shortlist {path}: pad token {pad} would change ID in the compact vocabulary",
+                              file=sys.stderr)
+                    else:
+                        shortlist = Shortlist(ids, self.model.get_output_embeddings())
+            self._shortlists[tgt_lang] = shortlist
+        return self._shortlists[tgt_lang]
+
+    @contextmanager
+    def output_vocabulary(self, tgt_lang, input_ids):
+        """
+        shortlist 模式下临时换成紧凑词表：输出层只计算候选子词的 logits，解码器输入嵌入随之换成紧凑 ID 的映射。
+        期间 generate 的特殊 token 参数要经 generate_token_ids 换算，生成结果经 full_token_ids 换回完整 ID
+        """
+        shortlist = self.load_shortlist(tgt_lang) if self.shortlist else None
+        if shortlist is None:
+            yield
+            return
+
+        full = self.model.get_output_embeddings()
+        decoder = self.model.get_decoder()
+        embed = decoder.embed_tokens
+        head = ShortlistLMHead(shortlist, full, input_ids)
+        self.model.set_output_embeddings(head)
+        decoder.embed_tokens = CompactEmbedding(embed, head.ids)
+        self._compact_head = head
+        try:
+            yield
+        finally:
+            self.model.set_output_embeddings(full)
+            decoder.embed_tokens = embed
+            self._compact_head = None
+
+    def generate_token_ids(self, forced_bos_token_id):
+        """generate 的特殊 token 参数，紧凑词表下换成紧凑 ID（包括模型默认的 decoder_start_token_id）"""
+        token_ids = {
+            "forced_bos_token_id": forced_bos_token_id,
+            "pad_token_id": self.tokenizer.pad_token_id,
+            "eos_token_id": self.tokenizer.eos_token_id,
+        }
+        if self._compact_head is not None:
+            token_ids["decoder_start_token_id"] = self.model.generation_config.decoder_start_token_id
+            token_ids = {name: self._compact_head.compact_id(value) for name, value in token_ids.items()}
+        return token_ids
+
+    def full_token_ids(self, outputs):
+        """generate 的输出换回完整词表 ID"""
+        return outputs if self._compact_head is None else self._compact_head.ids[outputs]
+
+    def _generate(self, inputs, tgt_lang_id, num_beams, stopping_criteria=None, **kwargs):
+        # 生成翻译 - 强制完整翻译参数；kwargs 为编译模式的额外参数（见 bucketed）
+        compiled = "encoder_outputs" in kwargs
+        if compiled:
+            # generate 会按束宽原地扩展编码结果，解码阶梯的每一级都传入新的副本
+            kwargs["encoder_outputs"] = kwargs["encoder_outputs"].__class__(**kwargs["encoder_outputs"])
+        with torch.no_grad(), self.compiled_forward(compiled):
+            outputs = self.model.generate(
+                **inputs,
+                **kwargs,
+                **self.generate_token_ids(tgt_lang_id),
+                max_new_tokens=512,  # 使用max_new_tokens而不是max_length
+                min_length=20,  # 增加最小长度
+                num_beams=num_beams,
+                length_penalty=0.0,  # 完全移除长度惩罚
+                early_stopping=False,  # 禁用早停
+                no_repeat_ngram_size=3,  # 避免重复
+                do_sample=False,
+                forced_eos_token_id=None,  # 不强制结束
+                stopping_criteria=stopping_criteria
+            )
+        return self.full_token_ids(outputs)
+
+    def translate_detailed(self, text, src_lang, tgt_lang, deadline=None, trace=None, started=None):
+        """
+        翻译并返回详细结果
+        deadline 为本次请求的时间预算（秒），从 started（time.monotonic()，默认为调用时刻）算起，加载模型也计入预算。
+        预算紧张时依次降级为更便宜的解码方式，最后一级仍超时则返回各级中最长的部分结果（可能为空），
+        而不是让调用方等待超时。
+        trace 为 True 时追踪本次请求，为 None 时按 NLLB_TRACE_SAMPLE_RATE 抽样，结果中的 traceFile 为追踪文件
+        """
+        if started is None:
+            started = time.monotonic()
+        request_trace = RequestTrace.sampled(trace, src=src_lang, tgt=tgt_lang, chars=len(text), deadline=deadline)
+        with request_trace:
+            with request_trace.span("load_model", cached=self.model is not None):
+                loaded = self.load_model()
+            result = (self._translate_detailed(text, src_lang, tgt_lang, deadline, started, request_trace)
+                      if loaded else None)
+
+        if result is not None and request_trace.path:
+            result["traceFile"] = str(request_trace.path)
+        return result
+
+    def _translate_detailed(self, text, src_lang, tgt_lang, deadline, started, request_trace):
+        if deadline is None:
+            deadline = DEFAULT_DEADLINE_SECONDS
+
         try:
-            # 设置源语言 - 这是NLLB正确翻译的关键
-            self.tokenizer.src_lang = src_lang
-            
-            # 编码输入文本 - 增加长度限制
-            inputs = self.tokenizer(text, return_tensors="pt", max_length=1024, truncation=True)
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
-            
-            # 获取目标语言的token ID
-            tgt_lang_id = self.tokenizer.convert_tokens_to_ids(tgt_lang)
-            
-            # 生成翻译 - 强制完整翻译参数
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    **inputs,
-                    forced_bos_token_id=tgt_lang_id,
-                    max_new_tokens=512,  # 使用max_new_tokens而不是max_length
-                    min_length=20,  # 增加最小长度
-                    num_beams=4,
-                    length_penalty=0.0,  # 完全移除长度惩罚
-                    early_stopping=False,  # 禁用早停
-                    no_repeat_ngram_size=3,  # 避免重复
-                    do_sample=False,
-                    pad_token_id=self.tokenizer.pad_token_id,
-                    eos_token_id=self.tokenizer.eos_token_id,
-                    forced_eos_token_id=None  # 不强制结束
-                )
-            
-            # 解码结果
-            result = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-            return result
-            
+            self.check_languages(src_lang, tgt_lang)
+
+            with request_trace.span("tokenize"):
+                # 设置源语言 - 这是NLLB正确翻译的关键
+                self.tokenizer.src_lang = src_lang
+
+                # 编码输入文本 - 增加长度限制
+                inputs = self.tokenizer(text, return_tensors="pt", max_length=1024, truncation=True)
+                inputs = {k: v.to(self.device) for k, v in inputs.items()}
+
+                # 获取目标语言的token ID
+                tgt_lang_id = self.tokenizer.convert_tokens_to_ids(tgt_lang)
+            request_trace.meta.update(inputTokens=int(inputs["input_ids"].shape[-1]), shortlist=bool(self.shortlist))
+
+            with request_trace.span("encode") if self.compile_mode else nullcontext():
+                inputs, compile_kwargs = self.bucketed(inputs)
+
+            with self.output_vocabulary(tgt_lang, inputs["input_ids"]):
+                if not deadline or deadline <= 0:
+                    stage = DECODING_LADDER[0]
+                    with request_trace.span("generate", stage=stage["name"], num_beams=stage["num_beams"]):
+                        outputs = self._generate(inputs, tgt_lang_id, stage["num_beams"], **compile_kwargs)
+                    with request_trace.span("decode"):
+                        result = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
+                    partial = False
+                    stage_index = 0
+                else:
+                    hard_deadline = started + deadline
+                    # 各级超时时的部分结果中最长的一个 (result, stage_index, outputs)；后面的级别从头开始生成，
+                    # 不一定比前一级走得更远
+                    best = None
+                    for stage_index, stage in enumerate(DECODING_LADDER):
+                        now = time.monotonic()
+                        is_last = stage_index == len(DECODING_LADDER) - 1
+                        if is_last:
+                            stage_deadline = hard_deadline
+                        else:
+                            stage_deadline = now + max(hard_deadline - now, 0) * STAGE_BUDGET_RATIO
+
+                        criteria = DeadlineStoppingCriteria(stage_deadline)
+                        with request_trace.span("generate", stage=stage["name"], num_beams=stage["num_beams"]):
+                            outputs = self._generate(
+                                inputs, tgt_lang_id, stage["num_beams"],
+                                stopping_criteria=StoppingCriteriaList([criteria]),
+                                **compile_kwargs
+                            )
+                        with request_trace.span("decode", stage=stage["name"]):
+                            result = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
+                        partial = criteria.triggered
+                        if not partial:
+                            break
+                        if best is None or len(result) > len(best[0]):
+                            best = (result, stage_index, outputs)
+                        # 总预算已用完时下一级也不会有结果
+                        if time.monotonic() >= hard_deadline:
+                            break
+                    if partial:
+                        # 所有级别都超时：返回最长的部分结果（可能为空），仍标记为降级
+                        result, stage_index, outputs = best
+                        stage = DECODING_LADDER[stage_index]
+
+            request_trace.meta.update(outputTokens=int(outputs.shape[-1]), decoding=stage["name"], partial=partial)
+            return {
+                "translatedText": result,
+                "decoding": stage["name"],
+                "degraded": stage_index > 0 or partial,
+                "partial": partial,
+                "elapsedMs": int((time.monotonic() - started) * 1000)
+            }
+
         except Exception as e:
+            request_trace.meta["error"] = str(e)
             print(json.dumps({"error": f"Translation failed: {e}"}))
             return None
 
+    def translate(self, text, src_lang, tgt_lang, deadline=None):
+        detailed = self.translate_detailed(text, src_lang, tgt_lang, deadline=deadline)
+        if detailed is None:
+            return None
+        return detailed["translatedText"]
+
+    def translate_batch(self, texts, src_lang, tgt_lang, batch_size=32, num_beams=4, trace=None):
+        """
+        批量翻译短文本（界面文案等），每批一次 generate 调用
+        按长度排序分批以减少 padding；短文案不强制最小长度。返回与输入等长的列表，失败的位置为 None
+        批次大小不固定，编译模式不作用于批量翻译
+        trace 与 translate_detailed 相同，整个批量调用写入一个追踪文件
+        """
+        request_trace = RequestTrace.sampled(trace, src=src_lang, tgt=tgt_lang, texts=len(texts),
+                                             chars=sum(len(text) for text in texts), batch_size=batch_size)
+        with request_trace:
+            with request_trace.span("load_model", cached=self.model is not None):
+                loaded = self.load_model()
+            if not loaded:
+                return [None] * len(texts)
+            return self._translate_batch(texts, src_lang, tgt_lang, batch_size, num_beams, request_trace)
+
+    def _translate_batch(self, texts, src_lang, tgt_lang, batch_size, num_beams, request_trace):
+        results = [None] * len(texts)
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+
+        try:
+            self.check_languages(src_lang, tgt_lang)
+        except ValueError as e:
+            request_trace.meta["error"] = str(e)
+            print(json.dumps({"error": f"Batch translation failed: {e}"}))
+            return results
+
+        self.tokenizer.src_lang = src_lang
+        tgt_lang_id = self.tokenizer.convert_tokens_to_ids(tgt_lang)
+
+        for start in range(0, len(order), batch_size):
+            indices = order[start:start + batch_size]
+            try:
+                with request_trace.span("tokenize", batch=len(indices)):
+                    inputs = self.tokenizer(
+                        [texts[i] for i in indices], return_tensors="pt",
+                        padding=True, max_length=1024, truncation=True
+                    )
+                    inputs = {k: v.to(self.device) for k, v in inputs.items()}
+
+                with request_trace.span("generate", batch=len(indices), num_beams=num_beams,
+                                        input_tokens=int(inputs["input_ids"].shape[-1])), \
+                        torch.no_grad(), self.output_vocabulary(tgt_lang, inputs["input_ids"]):
+                    outputs = self.full_token_ids(self.model.generate(
+                        **inputs,
+                        **self.generate_token_ids(tgt_lang_id),
+                        max_new_tokens=512,
+                        num_beams=num_beams,
+                        no_repeat_ngram_size=3,
+                        do_sample=False
+                    ))
+
+                with request_trace.span("decode", batch=len(indices)):
+                    decoded = self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
+                for index, result in zip(indices, decoded):
+                    results[index] = result
+            except Exception as e:
+                request_trace.meta.setdefault("errors", []).append(str(e))
+                print(json.dumps({"error": f"Batch translation failed: {e}"}))
+
+        return results
+
+def parse_args(argv=None):
+    """
+    选项放在位置参数之前，调用方在文本前加 -- 分隔：translate.py [--trace] [--deadline-at T] -- <text> <src> <tgt> [deadline]，
+    这样以 - 开头的文本（包括 "--trace" 本身）也会原样作为待翻译文本
+    """
+    parser = argparse.ArgumentParser(description="Translate one text with the local NLLB model and print JSON")
+    parser.add_argument("text")
+    parser.add_argument("src_lang")
+    parser.add_argument("tgt_lang")
+    parser.add_argument("deadline", nargs="?", type=float, default=None,
+                        help="Per-request deadline in seconds, counted from process start (default: NLLB_DEADLINE_SECONDS)")
+    parser.add_argument("--deadline-at", type=float, default=None,
+                        help="Absolute deadline in epoch seconds (set by the caller when it received the request)")
+    # 不带 --trace 时为 None，按 NLLB_TRACE_SAMPLE_RATE 抽样
+    parser.add_argument("--trace", action="store_const", const=True, default=None,
+                        help="Trace this request and return traceFile in the output")
+    return parser.parse_args(argv)
+
+
 def main():
-    if len(sys.argv) != 4:
-        print(json.dumps({"error": "Usage: python translate.py <text> <src_lang> <tgt_lang>"}))
-        sys.exit(1)
-    
-    text = sys.argv[1]
-    src_lang = sys.argv[2]  
-    tgt_lang = sys.argv[3]
-    
-    translator = NLLBTranslator()
-    result = translator.translate(text, src_lang, tgt_lang)
-    
-    if result:
-        print(json.dumps({"translatedText": result}))
+    args = parse_args()
+
+    deadline = args.deadline
+    if args.deadline_at is not None:
+        # 换算成从进程启动算起的预算；已经过期时取极小值（0 表示不限制）
+        deadline = max(args.deadline_at - time.time() + (time.monotonic() - PROCESS_STARTED), 0.001)
+
+    # 每个请求一个进程，编译的图用不上第二次，NLLB_COMPILE 只对常驻进程生效
+    translator = NLLBTranslator(compile=False)
+    result = translator.translate_detailed(args.text, args.src_lang, args.tgt_lang,
+                                           deadline=deadline, trace=args.trace, started=PROCESS_STARTED)
+
+    # 截止时间内一个 token 都没生成时 translatedText 为空，仍作为降级结果返回
+    if result and (result["translatedText"] or result["degraded"]):
+        output = {"translatedText": result["translatedText"]}
+        if result["degraded"]:
+            output.update({
+                "degraded": True,
+                "partial": result["partial"],
+                "decoding": result["decoding"]
+            })
+        if "traceFile" in result:
+            output["traceFile"] = result["traceFile"]
+        print(json.dumps(output))
     else:
         print(json.dumps({"error": "Translation failed"}))
 
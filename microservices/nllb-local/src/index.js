@@ -46,16 +46,31 @@ async function registerRoutes() {
       })
     }
 
+    // 可选的截止时间（秒），不超过 NLLB_DEADLINE_SECONDS
+    const { deadline } = request.body
+    if (deadline !== undefined && !(typeof deadline === 'number' && deadline > 0)) {
+      return reply.code(400).send({
+        error: 'deadline must be a positive number of seconds'
+      })
+    }
+
     try {
       const startTime = Date.now()
-      const result = await translationService.translateText(text, sourceLanguage, targetLanguage)
+      const result = await translationService.translateText(text, sourceLanguage, targetLanguage, {
+        deadline,
+        trace: request.body.trace === true
+      })
       const processingTime = Date.now() - startTime
 
       // 获取翻译统计信息
       const stats = translationService.getTranslationStats(text, sourceLanguage, targetLanguage)
 
       return {
-        translatedText: result,
+        translatedText: result.translatedText,
+        degraded: result.degraded,
+        partial: result.partial,
+        decoding: result.decoding,
+        traceFile: result.traceFile,
         sourceLanguage,
         targetLanguage,
         processingTime,
@@ -148,11 +163,17 @@ async function registerRoutes() {
   })
 }
 
+// 注册插件和路由，返回未监听端口的实例（测试中用 inject 发请求）
+async function buildServer() {
+  await registerPlugins()
+  await registerRoutes()
+  return fastify
+}
+
 // 启动服务器
 async function start() {
   try {
-    await registerPlugins()
-    await registerRoutes()
+    await buildServer()
 
     const port = process.env.PORT || 8081
     const host = process.env.HOST || '0.0.0.0'
@@ -173,28 +194,32 @@ async function start() {
   }
 }
 
-// 优雅关闭
-process.on('SIGINT', async () => {
-  fastify.log.info('Received SIGINT, shutting down gracefully...')
-  await fastify.close()
-  process.exit(0)
-})
+if (require.main === module) {
+  // 优雅关闭
+  process.on('SIGINT', async () => {
+    fastify.log.info('Received SIGINT, shutting down gracefully...')
+    await fastify.close()
+    process.exit(0)
+  })
 
-process.on('SIGTERM', async () => {
-  fastify.log.info('Received SIGTERM, shutting down gracefully...')
-  await fastify.close()
-  process.exit(0)
-})
+  process.on('SIGTERM', async () => {
+    fastify.log.info('Received SIGTERM, shutting down gracefully...')
+    await fastify.close()
+    process.exit(0)
+  })
 
-// 错误处理
-process.on('uncaughtException', (error) => {
-  fastify.log.error('Uncaught Exception:', error)
-  process.exit(1)
-})
+  // 错误处理
+  process.on('uncaughtException', (error) => {
+    fastify.log.error('Uncaught Exception:', error)
+    process.exit(1)
+  })
 
-process.on('unhandledRejection', (reason, promise) => {
-  fastify.log.error('Unhandled Rejection at:', promise, 'reason:', reason)
-  process.exit(1)
-})
+  process.on('unhandledRejection', (reason, promise) => {
+    fastify.log.error('Unhandled Rejection at:', promise, 'reason:', reason)
+    process.exit(1)
+  })
+
+  start()
+}
 
-start()
+module.exports = { buildServer }
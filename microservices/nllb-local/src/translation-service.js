@@ -9,6 +9,11 @@ class NLLBTranslationService {
     this.modelPath = path.join(__dirname, '../models/nllb-600m')
     this.pythonScript = path.join(__dirname, '../scripts/translate.py')
     this.batchSize = parseInt(process.env.BATCH_SIZE || '4')
+    // 单次翻译的生成截止时间（秒），超时后Python端降级解码并返回部分结果
+    // 请求可以指定更短的截止时间，但不能超过该值（0 表示不限制）
+    this.deadlineSeconds = parseFloat(process.env.NLLB_DEADLINE_SECONDS || '0')
+    // 截止时间过后再等待的时间（毫秒），Python 进程仍未退出则强制结束并返回空的部分结果
+    this.deadlineGraceMs = parseInt(process.env.NLLB_DEADLINE_GRACE_MS || '1000')
     
     // NLLB语言代码映射
     this.languageMap = {
@@ -198,6 +203,11 @@ if __name__ == "__main__":
     main()
 `
 
+    // 仓库中已有 scripts/translate.py（含截止时间与降级解码），不要覆盖
+    if (fs.existsSync(this.pythonScript)) {
+      return
+    }
+
     const scriptDir = path.dirname(this.pythonScript)
     if (!fs.existsSync(scriptDir)) {
       fs.mkdirSync(scriptDir, { recursive: true })
@@ -253,13 +263,30 @@ if __name__ == "__main__":
   }
 
   /**
-   * 翻译单个文本
+   * 本次请求的截止时间（秒）：请求指定的值不超过 NLLB_DEADLINE_SECONDS，未指定时使用环境变量
+   */
+  resolveDeadline(requested) {
+    if (requested === undefined || requested === null) {
+      return this.deadlineSeconds
+    }
+    return this.deadlineSeconds > 0 ? Math.min(requested, this.deadlineSeconds) : requested
+  }
+
+  /**
+   * 翻译单个文本，返回 { translatedText, degraded, partial, decoding, traceFile }
+   * degraded 为 true 表示截止时间内降级解码，partial 为 true 表示译文被截断
+   * options.deadline 为本次请求的截止时间（秒），从收到请求时算起：Python 进程启动、加载模型的时间都计入预算，
+   * 超过截止时间 NLLB_DEADLINE_GRACE_MS 后进程仍未退出则强制结束
+   * options.trace 为 true 时追踪本次请求（translate.py --trace），追踪文件写入 NLLB_TRACE_DIR；
+   * 被追踪（包括抽样命中）的请求 traceFile 为追踪文件路径，否则为 null
    */
-  async translateText(text, sourceLanguage, targetLanguage) {
+  async translateText(text, sourceLanguage, targetLanguage, options = {}) {
     if (!this.modelLoaded) {
       throw new Error('Model not loaded')
     }
 
+    const startedAt = Date.now()
+
     try {
       const sourceCode = this.getNLLBLanguageCode(sourceLanguage)
       const targetCode = this.getNLLBLanguageCode(targetLanguage)
@@ -270,10 +297,28 @@ if __name__ == "__main__":
       console.log(`Language mapping: ${sourceLanguage} (${sourceCode}) -> ${targetLanguage} (${targetCode})`)
 
       return new Promise((resolve, reject) => {
-        const python = spawn('python', [this.pythonScript, text, sourceCode, targetCode])
+        // 选项放在 -- 之前，文本以 - 开头时不会被当成选项
+        const args = [this.pythonScript]
+        if (options.trace) {
+          args.push('--trace')
+        }
+        // 传绝对截止时间（epoch 秒），Python 端从中扣除进程启动和加载模型已经用掉的时间
+        const deadline = this.resolveDeadline(options.deadline)
+        if (deadline > 0) {
+          args.push('--deadline-at', String(startedAt / 1000 + deadline))
+        }
+        args.push('--', text, sourceCode, targetCode)
+        const python = spawn('python', args)
         
         let output = ''
         let error = ''
+        let timedOut = false
+        const killTimer = deadline > 0
+          ? setTimeout(() => {
+            timedOut = true
+            python.kill('SIGKILL')
+          }, Math.max(deadline * 1000 + this.deadlineGraceMs - (Date.now() - startedAt), 0))
+          : null
         
         python.stdout.on('data', (data) => {
           const chunk = data.toString()
@@ -288,12 +333,22 @@ if __name__ == "__main__":
         })
         
         python.on('close', (code) => {
+          clearTimeout(killTimer)
           console.log(`=== PYTHON PROCESS COMPLETED ===`)
           console.log(`Exit code: ${code}`)
           console.log(`Full stdout: ${output}`)
           console.log(`Full stderr: ${error}`)
           
-          if (code === 0) {
+          if (timedOut) {
+            console.warn(`⚠️  Python process killed after deadline (${deadline}s + ${this.deadlineGraceMs}ms)`)
+            resolve({
+              translatedText: '',
+              degraded: true,
+              partial: true,
+              decoding: null,
+              traceFile: null
+            })
+          } else if (code === 0) {
             try {
               const result = JSON.parse(output.trim())
               if (result.error) {
@@ -303,7 +358,19 @@ if __name__ == "__main__":
                 console.log(`=== TRANSLATION SUCCESS ===`)
                 console.log(`Translated text length: ${result.translatedText.length}`)
                 console.log(`Translated text: "${result.translatedText}"`)
-                resolve(result.translatedText)
+                if (result.degraded) {
+                  console.warn(`⚠️  Degraded translation (decoding: ${result.decoding}, partial: ${result.partial})`)
+                }
+                if (result.traceFile) {
+                  console.log(`Request trace: ${result.traceFile}`)
+                }
+                resolve({
+                  translatedText: result.translatedText,
+                  degraded: Boolean(result.degraded),
+                  partial: Boolean(result.partial),
+                  decoding: result.decoding || null,
+                  traceFile: result.traceFile || null
+                })
               }
             } catch (e) {
               console.log(`Failed to parse Python output: ${output}`)
@@ -316,6 +383,7 @@ if __name__ == "__main__":
         })
         
         python.on('error', (err) => {
+          clearTimeout(killTimer)
           reject(new Error(`Failed to start Python process: ${err.message}`))
         })
       })
@@ -346,9 +414,9 @@ if __name__ == "__main__":
         const batchResults = await Promise.all(
           batch.map(async (text) => {
             try {
-              const translatedText = await this.translateText(text, sourceLanguage, targetLanguage)
+              const result = await this.translateText(text, sourceLanguage, targetLanguage)
               return {
-                translatedText,
+                ...result,
                 sourceLanguage,
                 targetLanguage,
                 success: true
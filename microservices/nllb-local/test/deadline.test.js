@@ -0,0 +1,44 @@
+const { test } = require('node:test')
+const assert = require('node:assert')
+const fs = require('fs')
+const path = require('path')
+
+// 需要 npm install 后的 fastify 和一个可用的模型目录（NLLB_MODEL_DIR，默认 models/nllb-600m）
+const modelDir = process.env.NLLB_MODEL_DIR || path.join(__dirname, '../models/nllb-600m')
+let skip = false
+try {
+  require.resolve('fastify')
+} catch (error) {
+  skip = 'fastify is not installed'
+}
+if (!skip && !fs.existsSync(modelDir)) {
+  skip = `model directory ${modelDir} not found`
+}
+
+test('POST /translate 的 deadline 限制 Python 进程的总耗时（包括加载模型）', { skip }, async () => {
+  const translationService = require('../src/translation-service')
+  // 跳过预热（预热请求不带截止时间），每个请求仍然启动新的 Python 进程
+  translationService.initialize = async () => {
+    translationService.modelLoaded = true
+  }
+  const { buildServer } = require('../src/index')
+  const app = await buildServer()
+
+  const deadline = 1
+  const startTime = Date.now()
+  const response = await app.inject({
+    method: 'POST',
+    url: '/translate',
+    payload: { text: 'Hello world', sourceLanguage: 'en', targetLanguage: 'sw', deadline }
+  })
+  const elapsed = Date.now() - startTime
+  await app.close()
+
+  assert.strictEqual(response.statusCode, 200, response.body)
+  assert.ok(elapsed < deadline * 1000 + translationService.deadlineGraceMs + 500,
+    `request took ${elapsed}ms with a ${deadline}s deadline`)
+  const body = response.json()
+  assert.strictEqual(typeof body.translatedText, 'string')
+  // 1 秒内连 torch 都来不及导入完，结果只能是降级的部分译文
+  assert.strictEqual(body.degraded, true)
+})
@@ -1,10 +1,31 @@
 #!/usr/bin/env python3
+import argparse
+import hashlib
+import gzip
+import json
 import os
 import re
-import glob
+import subprocess
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from string import Formatter
+from xml.sax.saxutils import escape, quoteattr
 
-# Base directory
-base_dir = "/home/hwt/translation-low-source/frontend/app/[locale]"
+# Default frontend root (the repository's frontend/ directory); override with --root
+DEFAULT_ROOT = Path(__file__).resolve().parent / 'frontend'
+
+# Translation pages live under <root>/app/[locale]/<source>-to-<target>/page.tsx
+PAGES_DIR = Path('app') / '[locale]'
+
+# khmer-to-english and english-to-khmer are maintained by hand
+SKIP_PAGES = {'khmer-to-english', 'english-to-khmer'}
+
+# direction -> hash of the page.tsx the generator last wrote. A page whose bytes match neither this
+# nor the current output was edited by hand and is left alone unless --force is given
+PAGES_STATE_FILE = Path('lib') / 'generated' / 'page-hashes.json'
 
 # Language mappings for proper names and descriptions
 language_map = {
@@ -36,120 +57,106 @@ language_map = {
     'zulu': {'name': 'Zulu', 'native': 'isiZulu', 'code': 'zu'},
 }
 
-def generate_page_content(source_lang, target_lang, page_name):
-    """Generate the complete page content based on the template"""
+class Template:
+    """
+    A str.format-style template parsed once at import time.
+    render() only concatenates the literal chunks with the context values.
+    """
+    def __init__(self, text):
+        self.parts = [(literal, field) for literal, field, _, _ in Formatter().parse(text)]
     
-    source_info = language_map.get(source_lang, {'name': source_lang.title(), 'native': source_lang.title(), 'code': 'en'})
-    target_info = language_map.get(target_lang, {'name': target_lang.title(), 'native': target_lang.title(), 'code': 'en'})
-    
-    # Determine direction for content
-    if target_lang == 'english':
-        direction = f"{source_info['name']} to English"
-        direction_lower = f"{source_lang}-to-english"
-        source_display = f"{source_info['name']} ({source_info['native']})"
-        target_display = "English"
-        function_name = f"{source_lang.title()}ToEnglishPage"
-        faq_var = f"{source_lang}ToEnglishFAQs"
-    else:
-        direction = f"English to {target_info['name']}"
-        direction_lower = f"english-to-{target_lang}"
-        source_display = "English"
-        target_display = f"{target_info['name']} ({target_info['native']})"
-        function_name = f"EnglishTo{target_lang.title()}Page"
-        faq_var = f"englishTo{target_lang.title()}FAQs"
-    
-    # Generate FAQ content
-    if target_lang == 'english':
-        faqs = f"""const {faq_var} = [
+    def render(self, context):
+        return ''.join(literal + (str(context[field]) if field is not None else '')
+                       for literal, field in self.parts)
+
+FAQ_TO_ENGLISH = Template("""const {faq_var} = [
   {{
     question: "How accurate is the {direction} translation?",
-    answer: "Our AI-powered {source_info['name']}-English translator provides high-accuracy translations using advanced NLLB (No Language Left Behind) technology. The {source_info['name']} to English translation quality is excellent for most content types, including business documents, academic texts, and casual conversations. While our {source_info['name']}-English translator is very reliable, we recommend human review for critical legal or medical documents."
+    answer: "Our AI-powered {source_name}-English translator provides high-accuracy translations using advanced NLLB (No Language Left Behind) technology. The {source_name} to English translation quality is excellent for most content types, including business documents, academic texts, and casual conversations. While our {source_name}-English translator is very reliable, we recommend human review for critical legal or medical documents."
   }},
   {{
-    question: "Can I translate English text back to {source_info['name']} using this tool?",
-    answer: "Yes! Our translator supports bidirectional translation between {source_info['name']} and English. You can easily switch between {source_info['name']}-to-English and English-to-{source_info['name']} translation using the swap button. This makes it perfect for {source_info['name']} language learners and English speakers who need to communicate in {source_info['native']}."
+    question: "Can I translate English text back to {source_name} using this tool?",
+    answer: "Yes! Our translator supports bidirectional translation between {source_name} and English. You can easily switch between {source_name}-to-English and English-to-{source_name} translation using the swap button. This makes it perfect for {source_name} language learners and English speakers who need to communicate in {source_native}."
   }},
   {{
-    question: "Is the {source_info['name']}-English translator completely free to use?",
-    answer: "Yes, our {source_info['name']}-English translation service is completely free with no hidden costs. Short {source_info['name']} texts translate instantly, while longer {source_info['name']} documents use our queue system for registered users. You can translate up to 5,000 characters of {source_info['name']} text to English at no charge."
+    question: "Is the {source_name}-English translator completely free to use?",
+    answer: "Yes, our {source_name}-English translation service is completely free with no hidden costs. Short {source_name} texts translate instantly, while longer {source_name} documents use our queue system for registered users. You can translate up to 5,000 characters of {source_name} text to English at no charge."
   }},
   {{
     question: "What is the maximum length for {direction} translation?",
-    answer: "You can translate up to 5,000 characters of {source_info['name']} text to English at once. For {source_info['name']} texts over 1,000 characters, you'll need to sign in for queue processing. Shorter {source_info['name']} to English translations are processed instantly, making it ideal for quick {source_info['name']} phrase translations."
+    answer: "You can translate up to 5,000 characters of {source_name} text to English at once. For {source_name} texts over 1,000 characters, you'll need to sign in for queue processing. Shorter {source_name} to English translations are processed instantly, making it ideal for quick {source_name} phrase translations."
   }},
   {{
     question: "Do I need an account for long {direction} translations?",
-    answer: "For {source_info['name']} texts over 1,000 characters, yes. Creating a free account allows you to use our queue system for longer {source_info['name']}-English conversions and access your {source_info['native']} translation history. This is especially useful for translating {source_info['name']} documents, articles, or academic papers to English."
+    answer: "For {source_name} texts over 1,000 characters, yes. Creating a free account allows you to use our queue system for longer {source_name}-English conversions and access your {source_native} translation history. This is especially useful for translating {source_name} documents, articles, or academic papers to English."
   }}
-];"""
-    else:
-        faqs = f"""const {faq_var} = [
+];""")
+
+FAQ_FROM_ENGLISH = Template("""const {faq_var} = [
   {{
     question: "How accurate is the {direction} translation?",
-    answer: "Our AI-powered English to {target_info['name']} translator provides high-accuracy translations using advanced NLLB (No Language Left Behind) technology. The translation quality from English to {target_info['native']} is excellent for most content types, including business documents, academic texts, and casual conversations. While our English-{target_info['name']} translator is very reliable, we recommend human review for critical legal or medical documents requiring perfect {target_info['name']} translation."
+    answer: "Our AI-powered English to {target_name} translator provides high-accuracy translations using advanced NLLB (No Language Left Behind) technology. The translation quality from English to {target_native} is excellent for most content types, including business documents, academic texts, and casual conversations. While our English-{target_name} translator is very reliable, we recommend human review for critical legal or medical documents requiring perfect {target_name} translation."
   }},
   {{
-    question: "Can I translate {target_info['name']} text back to English using this tool?",
-    answer: "Yes! Our translator supports bidirectional translation between English and {target_info['name']}. You can easily switch between English-to-{target_info['name']} and {target_info['name']}-to-English translation using the swap button. This makes it perfect for English speakers learning {target_info['name']} and those who need to communicate effectively in {target_info['native']} language."
+    question: "Can I translate {target_name} text back to English using this tool?",
+    answer: "Yes! Our translator supports bidirectional translation between English and {target_name}. You can easily switch between English-to-{target_name} and {target_name}-to-English translation using the swap button. This makes it perfect for English speakers learning {target_name} and those who need to communicate effectively in {target_native} language."
   }},
   {{
-    question: "Is the English-{target_info['name']} conversion tool completely free to use?",
-    answer: "Yes, our English-{target_info['name']} translation service is completely free with no hidden costs. Short English texts translate to {target_info['name']} instantly, while longer English documents use our queue system for registered users. You can translate up to 5,000 characters of English text to {target_info['name']} at no charge."
+    question: "Is the English-{target_name} conversion tool completely free to use?",
+    answer: "Yes, our English-{target_name} translation service is completely free with no hidden costs. Short English texts translate to {target_name} instantly, while longer English documents use our queue system for registered users. You can translate up to 5,000 characters of English text to {target_name} at no charge."
   }},
   {{
     question: "What is the maximum length for {direction} translation?",
-    answer: "You can translate up to 5,000 characters of English text to {target_info['name']} at once. For English texts over 1,000 characters, you'll need to sign in for queue processing. Shorter English to {target_info['name']} translations are processed instantly, making it ideal for quick English phrase translations to {target_info['native']}."
+    answer: "You can translate up to 5,000 characters of English text to {target_name} at once. For English texts over 1,000 characters, you'll need to sign in for queue processing. Shorter English to {target_name} translations are processed instantly, making it ideal for quick English phrase translations to {target_native}."
   }},
   {{
     question: "Do I need an account for long {direction} translations?",
-    answer: "For English texts over 1,000 characters, yes. Creating a free account allows you to use our queue system for longer English-{target_info['name']} conversions and access your English-{target_info['name']} translation records. This is especially useful for translating English documents, articles, or academic papers to {target_info['name']} language."
+    answer: "For English texts over 1,000 characters, yes. Creating a free account allows you to use our queue system for longer English-{target_name} conversions and access your English-{target_name} translation records. This is especially useful for translating English documents, articles, or academic papers to {target_name} language."
   }}
-];"""
+];""")
 
-    # Generate HowTo steps
-    if target_lang == 'english':
-        howto_steps = f"""const howToSteps = [
+HOWTO_TO_ENGLISH = Template("""const howToSteps = [
   {{
-    name: "Enter your {source_info['name']} text for translation",
-    text: "Type or paste your {source_display} text into the source text box. Our {source_info['name']}-English translator supports up to 5,000 characters, making it perfect for translating {source_info['name']} documents, emails, or social media posts to English."
+    name: "Enter your {source_name} text for translation",
+    text: "Type or paste your {source_display} text into the source text box. Our {source_name}-English translator supports up to 5,000 characters, making it perfect for translating {source_name} documents, emails, or social media posts to English."
   }},
   {{
     name: "Select {direction} translation direction",
-    text: "Ensure '{source_info['name']}' is selected as the source language and 'English' as the target language. Use the swap button to switch between {source_info['name']}-to-English and English-to-{source_info['name']} translation modes as needed."
+    text: "Ensure '{source_name}' is selected as the source language and 'English' as the target language. Use the swap button to switch between {source_name}-to-English and English-to-{source_name} translation modes as needed."
   }},
   {{
-    name: "Start your {source_info['name']}-English conversion",
-    text: "Press the translate button to begin the {direction} translation process. Short {source_info['name']} texts translate instantly, while longer {source_info['name']} documents use our advanced queue processing system for optimal translation quality."
+    name: "Start your {source_name}-English conversion",
+    text: "Press the translate button to begin the {direction} translation process. Short {source_name} texts translate instantly, while longer {source_name} documents use our advanced queue processing system for optimal translation quality."
   }},
   {{
     name: "Review and use your English translation",
-    text: "Review the English translation results from your {source_info['name']} text. You can copy the translated English text, download it as a file, or save it to your {source_info['name']}-English conversion history for future reference."
+    text: "Review the English translation results from your {source_name} text. You can copy the translated English text, download it as a file, or save it to your {source_name}-English conversion history for future reference."
   }}
-];"""
-    else:
-        howto_steps = f"""const howToSteps = [
+];""")
+
+HOWTO_FROM_ENGLISH = Template("""const howToSteps = [
   {{
     name: "Enter your English text for translation",
-    text: "Type or paste your English text into the source text box. Our English-{target_info['name']} translator supports up to 5,000 characters, making it perfect for translating English documents, emails, or social media posts to {target_info['name']}."
+    text: "Type or paste your English text into the source text box. Our English-{target_name} translator supports up to 5,000 characters, making it perfect for translating English documents, emails, or social media posts to {target_name}."
   }},
   {{
     name: "Select {direction} translation direction",
-    text: "Ensure 'English' is selected as the source language and '{target_info['name']}' as the target language. Use the swap button to switch between English-to-{target_info['name']} and {target_info['name']}-to-English translation modes as needed."
+    text: "Ensure 'English' is selected as the source language and '{target_name}' as the target language. Use the swap button to switch between English-to-{target_name} and {target_name}-to-English translation modes as needed."
   }},
   {{
-    name: "Start your English-{target_info['name']} conversion",
+    name: "Start your English-{target_name} conversion",
     text: "Press the translate button to begin the {direction} translation process. Short English texts translate instantly, while longer English documents use our advanced queue processing system for optimal translation quality."
   }},
   {{
-    name: "Review and use your {target_info['name']} translation",
-    text: "Review the {target_info['name']} translation results from your English text. You can copy the translated {target_info['name']} text, download it as a file, or save it to your English-{target_info['name']} conversion history for future reference."
+    name: "Review and use your {target_name} translation",
+    text: "Review the {target_name} translation results from your English text. You can copy the translated {target_name} text, download it as a file, or save it to your English-{target_name} conversion history for future reference."
   }}
-];"""
+];""")
 
-    # Generate the complete file content
-    content = f"""import React from 'react'
+PAGE_TEMPLATE = Template("""import React from 'react'
 import {{ Metadata }} from 'next'
 import {{ EnhancedTextTranslator }} from '@/components/translation/enhanced-text-translator'
+import {{ fillJsonLd }} from '@/lib/json-ld'
 
 type Props = {{
   params: {{ locale: string }}
@@ -183,140 +190,22 @@ export async function generateMetadata({{ params }}: Props): Promise<Metadata> {
 
 {faqs}
 
-{howto_steps}
+// 预序列化的结构化数据（JSON-LD），渲染时只填入 locale
+const structuredData: string[][] = {structured_data}
 
 export default function {function_name}({{ params }}: Props) {{
   const {{ locale }} = params
   
-  // 优化的结构化数据 - 直接在JSX中渲染，确保SSR
-  const webApplicationStructuredData = {{
-    "@context": "https://schema.org",
-    "@type": "WebApplication",
-    "name": "{direction} Translator - LoReTrans",
-    "alternateName": "{direction} AI Translator",
-    "description": "Free AI-powered {direction} translation tool with queue processing, translation history, and support for long texts up to 5,000 characters.",
-    "url": `https://loretrans.com/${{locale}}/{direction_lower}`,
-    "applicationCategory": "UtilitiesApplication",
-    "operatingSystem": "Web Browser",
-    "browserRequirements": "Requires JavaScript",
-    "softwareVersion": "2.0",
-    "datePublished": "2025-01-01",
-    "dateModified": "2025-08-01",
-    "inLanguage": ["en", "{source_info['code'] if target_lang == 'english' else target_info['code']}"],
-    "isAccessibleForFree": true,
-    "creator": {{
-      "@type": "Organization",
-      "name": "LoReTrans",
-      "url": "https://loretrans.com",
-      "logo": "https://loretrans.com/logo.png"
-    }},
-    "provider": {{
-      "@type": "Organization", 
-      "name": "LoReTrans",
-      "url": "https://loretrans.com"
-    }},
-    "offers": {{
-      "@type": "Offer",
-      "price": "0",
-      "priceCurrency": "USD",
-      "availability": "https://schema.org/InStock",
-      "validFrom": "2025-01-01"
-    }},
-    "featureList": [
-      "AI-powered {direction} translation",
-      "Support for texts up to 5,000 characters", 
-      "Queue processing for long texts",
-      "Translation history tracking",
-      "Bidirectional {source_info['name']}-{target_info['name'] if target_lang != 'english' else 'English'} translation",
-      "Free unlimited usage"
-    ],
-    "aggregateRating": {{
-      "@type": "AggregateRating",
-      "ratingValue": "4.8",
-      "ratingCount": "1250",
-      "bestRating": "5",
-      "worstRating": "1"
-    }}
-  }};
-
-  const faqStructuredData = {{
-    "@context": "https://schema.org",
-    "@type": "FAQPage",
-    "mainEntity": {faq_var}.map(item => ({{
-      "@type": "Question",
-      "name": item.question,
-      "acceptedAnswer": {{
-        "@type": "Answer",
-        "text": item.answer
-      }}
-    }}))
-  }};
-
-  const howToStructuredData = {{
-    "@context": "https://schema.org",
-    "@type": "HowTo",
-    "name": "How to translate {source_display} to {target_display}",
-    "description": "Step-by-step guide to translate {source_display} text to {target_display} using our AI translator",
-    "step": howToSteps.map((step, index) => ({{
-      "@type": "HowToStep",
-      "position": index + 1,
-      "name": step.name,
-      "text": step.text
-    }}))
-  }};
-
-  const breadcrumbStructuredData = {{
-    "@context": "https://schema.org",
-    "@type": "BreadcrumbList",
-    "itemListElement": [
-      {{
-        "@type": "ListItem",
-        "position": 1,
-        "name": "Home",
-        "item": `https://loretrans.com/${{locale}}`
-      }},
-      {{
-        "@type": "ListItem",
-        "position": 2,
-        "name": "Translation Tools",
-        "item": `https://loretrans.com/${{locale}}/text-translate`
-      }},
-      {{
-        "@type": "ListItem",
-        "position": 3,
-        "name": "{direction}",
-        "item": `https://loretrans.com/${{locale}}/{direction_lower}`
-      }}
-    ]
-  }};
-  
   return (
     <>
       {{/* 结构化数据 - 确保SSR渲染 */}}
-      <script
-        type="application/ld+json"
-        dangerouslySetInnerHTML={{{{
-          __html: JSON.stringify(webApplicationStructuredData, null, 2)
-        }}}}
-      />
-      <script
-        type="application/ld+json"
-        dangerouslySetInnerHTML={{{{
-          __html: JSON.stringify(faqStructuredData, null, 2)
-        }}}}
-      />
-      <script
-        type="application/ld+json"
-        dangerouslySetInnerHTML={{{{
-          __html: JSON.stringify(howToStructuredData, null, 2)
-        }}}}
-      />
-      <script
-        type="application/ld+json"
-        dangerouslySetInnerHTML={{{{
-          __html: JSON.stringify(breadcrumbStructuredData, null, 2)
-        }}}}
-      />
+      {{structuredData.map((parts, index) => (
+        <script
+          key={{index}}
+          type="application/ld+json"
+          dangerouslySetInnerHTML={{{{ __html: fillJsonLd(parts, locale) }}}}
+        />
+      ))}}
       
       <main className="min-h-screen bg-background">
         {{/* Hero Section */}}
@@ -341,7 +230,7 @@ export default function {function_name}({{ params }}: Props) {{
                 </span>
                 <span className="flex items-center gap-2">
                   <span className="w-2 h-2 bg-blue-500 rounded-full"></span>
-                  Up to 5,000 {source_info['name']} characters
+                  Up to 5,000 {source_name} characters
                 </span>
                 <span className="flex items-center gap-2">
                   <span className="w-2 h-2 bg-purple-500 rounded-full"></span>
@@ -394,47 +283,824 @@ export default function {function_name}({{ params }}: Props) {{
       </main>
     </>
   )
-}}"""
+}}""")
+
+# Manifest mode: per-direction data lives in one JSON file and a single dynamic route renders every direction
+MANIFEST_FILE = Path('lib') / 'generated' / 'translation-pages.json'
+MANIFEST_IMPORT = '@/lib/generated/translation-pages.json'
+DYNAMIC_ROUTE_DIR = '[direction]'
+
+# Compile-time comparison for manifest mode: each module is transpiled with the frontend's own TypeScript
+# (ts.transpileModule, the per-module TSX -> JS step of a build) and the JSON manifest is parsed, timed in node.
+# Reads {"modules": {name: source}} on stdin, prints {name: median ms}; argv[1] is the frontend root
+COMPILE_TIMING_RUNS = 5
+COMPILE_TIMING_SCRIPT = """
+const ts = require(require.resolve('typescript', { paths: [process.argv[1]] }))
+const { modules, runs } = JSON.parse(require('fs').readFileSync(0, 'utf8'))
+const options = { compilerOptions: { jsx: ts.JsxEmit.ReactJSX, module: ts.ModuleKind.ESNext, target: ts.ScriptTarget.ES2017 } }
+const timings = {}
+for (const [name, source] of Object.entries(modules)) {
+  const samples = []
+  for (let run = 0; run < runs; run++) {
+    const start = process.hrtime.bigint()
+    if (name.endsWith('.json')) JSON.parse(source)
+    else ts.transpileModule(source, { ...options, fileName: name })
+    samples.push(Number(process.hrtime.bigint() - start) / 1e6)
+  }
+  samples.sort((a, b) => a - b)
+  timings[name] = samples[Math.floor(runs / 2)]
+}
+process.stdout.write(JSON.stringify(timings))
+"""
+
+# Fields only needed to build the JSON-LD, which the manifest already carries pre-serialized
+JSON_LD_ONLY_FIELDS = {'languageCode', 'pairTargetName', 'howToSteps'}
+
+# Placeholder for the locale inside pre-serialized JSON-LD
+LOCALE_SLOT = '\x00locale\x00'
+
+# Characters escaped so inline JSON-LD cannot close the <script> tag early
+JSON_LD_ESCAPES = {'<': '\\u003c', '>': '\\u003e', '&': '\\u0026', '\u2028': '\\u2028', '\u2029': '\\u2029'}
+
+FAQ_ENTRY = re.compile(r'question: "(.*?)",\n    answer: "(.*?)"')
+HOWTO_ENTRY = re.compile(r'name: "(.*?)",\n    text: "(.*?)"')
+
+MANIFEST_ROUTE_PAGE = Template("""import React from 'react'
+import {{ Metadata }} from 'next'
+import {{ notFound }} from 'next/navigation'
+import {{ EnhancedTextTranslator }} from '@/components/translation/enhanced-text-translator'
+import {{ fillJsonLd }} from '@/lib/json-ld'
+import translationPages from '{manifest_import}'
+
+// Generated by update_all_translation_pages.py --mode manifest, do not edit by hand
+
+type TranslationPageData = {{
+  direction: string
+  directionLower: string
+  sourceLang: string
+  targetLang: string
+  sourceName: string
+  sourceDisplay: string
+  targetDisplay: string
+  title: string
+  socialTitle: string
+  description: string
+  socialDescription: string
+  keywords: string[]
+  faqs: {{ question: string; answer: string }}[]
+  // 预序列化的 JSON-LD，在 locale 位置切开
+  jsonLd: string[][]
+}}
+
+type Props = {{
+  params: {{ locale: string; direction: string }}
+}}
+
+const pages = translationPages as Record<string, TranslationPageData>
+
+export const dynamicParams = false
+
+export function generateStaticParams() {{
+  return Object.keys(pages).map(direction => ({{ direction }}))
+}}
+
+export async function generateMetadata({{ params }}: Props): Promise<Metadata> {{
+  const {{ locale, direction }} = params
+  const page = pages[direction]
+  if (!page) {{
+    return {{}}
+  }}
+  
+  return {{
+    title: page.title,
+    description: page.description,
+    keywords: page.keywords,
+    openGraph: {{
+      title: page.socialTitle,
+      description: page.socialDescription,
+      url: `https://loretrans.com/${{locale}}/${{page.directionLower}}`,
+      siteName: 'LoReTrans',
+      locale: 'en_US',
+      type: 'website',
+    }},
+    twitter: {{
+      card: 'summary_large_image',
+      title: page.socialTitle,
+      description: page.socialDescription,
+    }},
+    alternates: {{
+      canonical: `https://loretrans.com/${{locale}}/${{page.directionLower}}`,
+    }},
+  }}
+}}
+
+export default function TranslationDirectionPage({{ params }}: Props) {{
+  const {{ locale, direction }} = params
+  const page = pages[direction]
+  if (!page) {{
+    notFound()
+  }}
+  
+  return (
+    <>
+      {{/* 结构化数据 - 确保SSR渲染 */}}
+      {{page.jsonLd.map((parts, index) => (
+        <script
+          key={{index}}
+          type="application/ld+json"
+          dangerouslySetInnerHTML={{{{ __html: fillJsonLd(parts, locale) }}}}
+        />
+      ))}}
+      
+      <main className="min-h-screen bg-background">
+        {{/* Hero Section */}}
+        <section className="pt-32 pb-16 bg-gradient-to-br from-blue-50 via-white to-purple-50">
+          <div className="container mx-auto px-4">
+            <div className="max-w-4xl mx-auto text-center space-y-8">
+              <div className="space-y-4">
+                <h1 className="text-4xl md:text-6xl font-bold text-gray-900 leading-tight">
+                  {{page.direction}}
+                  <span className="block text-blue-600">AI Translator</span>
+                </h1>
+                <p className="text-xl text-gray-600 max-w-2xl mx-auto">
+                  Translate {{page.sourceDisplay}} to {{page.targetDisplay}} instantly with our AI-powered translator. Convert {{page.sourceDisplay}} text to {{page.targetDisplay}} with high accuracy.
+                  Perfect for {{page.sourceDisplay}} documents, emails, and conversations. Support for long {{page.sourceDisplay}} texts, queue processing, and translation history.
+                </p>
+              </div>
+              
+              <div className="flex flex-wrap justify-center gap-4 text-sm text-gray-500">
+                <span className="flex items-center gap-2">
+                  <span className="w-2 h-2 bg-green-500 rounded-full"></span>
+                  Free {{page.sourceDisplay}} translation
+                </span>
+                <span className="flex items-center gap-2">
+                  <span className="w-2 h-2 bg-blue-500 rounded-full"></span>
+                  Up to 5,000 {{page.sourceName}} characters
+                </span>
+                <span className="flex items-center gap-2">
+                  <span className="w-2 h-2 bg-purple-500 rounded-full"></span>
+                  {{page.sourceDisplay}} queue processing
+                </span>
+                <span className="flex items-center gap-2">
+                  <span className="w-2 h-2 bg-orange-500 rounded-full"></span>
+                  {{page.sourceDisplay}} translation history
+                </span>
+              </div>
+            </div>
+          </div>
+        </section>
+
+        {{/* Enhanced Translation Tool */}}
+        <section className="py-16">
+          <div className="container mx-auto px-4">
+            <EnhancedTextTranslator 
+              defaultSourceLang={{page.sourceLang}}
+              defaultTargetLang={{page.targetLang}}
+              pageTitle={{`${{page.direction}} Translation`}}
+            />
+          </div>
+        </section>
+
+        {{/* FAQ Section */}}
+        <section className="py-16 bg-gray-50">
+          <div className="container mx-auto px-4">
+            <div className="max-w-4xl mx-auto">
+              <div className="text-center mb-12">
+                <h2 className="text-3xl font-bold text-gray-900 mb-4">
+                  Frequently Asked Questions
+                </h2>
+                <p className="text-lg text-gray-600">
+                  Everything you need to know about our {{page.direction}} translator and translation process
+                </p>
+              </div>
+              
+              <div className="space-y-8">
+                {{page.faqs.map((faq, index) => (
+                  <div key={{index}} className="bg-white rounded-lg p-6 shadow-sm border border-gray-100">
+                    <h3 className="text-lg font-semibold text-gray-900 mb-3">{{faq.question}}</h3>
+                    <p className="text-gray-600 leading-relaxed">{{faq.answer}}</p>
+                  </div>
+                ))}}
+              </div>
+            </div>
+          </div>
+        </section>
+      </main>
+    </>
+  )
+}}
+""")
+
+# Sitemap shards for the translation directions, emitted in the same pass as the pages
+SITE_URL = 'https://loretrans.com'
+SITEMAP_DIR = Path('public') / 'sitemaps'
+SITEMAP_INDEX = 'translation-pages.xml'
+SITEMAP_SHARD = 'translation-pages-{}.xml.gz'
+SITEMAP_SHARD_GLOB = 'translation-pages-*.xml.gz'
+
+# direction -> {hash, lastmod}; committed so lastmod survives fresh checkouts
+SITEMAP_STATE_FILE = Path('lib') / 'generated' / 'sitemap-state.json'
+
+# Protocol limits per sitemap file: 50,000 URLs and 50 MB uncompressed
+SITEMAP_MAX_URLS = 50000
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024
+
+# Interface locales are read from the next-intl routing config; x-default points at the default locale
+LOCALES_SOURCE = Path('lib') / 'navigation.ts'
+LOCALES_PATTERN = re.compile(r"export const locales = \[([^\]]*)\]")
+DEFAULT_LOCALE = 'en'
+
+SITEMAP_URLSET_OPEN = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                       '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+                       'xmlns:xhtml="http://www.w3.org/1999/xhtml">\n')
+SITEMAP_URLSET_CLOSE = '</urlset>\n'
+
+def page_matrix(languages=None):
+    """All translation directions from language_map: <lang>-to-english and english-to-<lang>"""
+    languages = language_map if languages is None else languages
+    pairs = [(lang, 'english') for lang in languages] + [('english', lang) for lang in languages]
+    return sorted(pairs, key=lambda pair: f"{pair[0]}-to-{pair[1]}")
+
+def page_context(source_lang, target_lang):
+    """Template variables for one translation direction"""
+    source_info = language_map.get(source_lang, {'name': source_lang.title(), 'native': source_lang.title(), 'code': 'en'})
+    target_info = language_map.get(target_lang, {'name': target_lang.title(), 'native': target_lang.title(), 'code': 'en'})
+    
+    context = {
+        'source_lang': source_lang,
+        'target_lang': target_lang,
+        'source_name': source_info['name'],
+        'source_native': source_info['native'],
+        'target_name': target_info['name'],
+        'target_native': target_info['native'],
+        'language_code': source_info['code'] if target_lang == 'english' else target_info['code'],
+        'pair_target_name': target_info['name'] if target_lang != 'english' else 'English',
+    }
+    
+    # Determine direction for content
+    if target_lang == 'english':
+        context.update(
+            direction=f"{source_info['name']} to English",
+            direction_lower=f"{source_lang}-to-english",
+            source_display=f"{source_info['name']} ({source_info['native']})",
+            target_display="English",
+            function_name=f"{source_lang.title()}ToEnglishPage",
+            faq_var=f"{source_lang}ToEnglishFAQs",
+        )
+    else:
+        context.update(
+            direction=f"English to {target_info['name']}",
+            direction_lower=f"english-to-{target_lang}",
+            source_display="English",
+            target_display=f"{target_info['name']} ({target_info['native']})",
+            function_name=f"EnglishTo{target_lang.title()}Page",
+            faq_var=f"englishTo{target_lang.title()}FAQs",
+        )
+    return context
+
+def generate_page_content(source_lang, target_lang, page_name):
+    """Generate the complete page content based on the template"""
+    context = page_context(source_lang, target_lang)
+    
+    # Generate FAQ content and the pre-serialized structured data
+    context['faqs'] = (FAQ_TO_ENGLISH if target_lang == 'english' else FAQ_FROM_ENGLISH).render(context)
+    context['structured_data'] = json.dumps(page_data(source_lang, target_lang)['jsonLd'], ensure_ascii=False)
+    
+    # Generate the complete file content
+    return PAGE_TEMPLATE.render(context)
 
-    return content
+def content_hash(data):
+    """SHA-256 of the page bytes"""
+    return hashlib.sha256(data).hexdigest()
 
-def update_translation_page(page_path):
-    """Update a single translation page"""
-    page_name = os.path.basename(os.path.dirname(page_path))
+def write_if_changed(path, data, check=False):
+    """
+    Write data (bytes) to path only if the content differs from what is on disk.
+    Returns 'created', 'changed' or 'unchanged'. With check=True nothing is written.
+    """
+    path = Path(path)
     
-    # Skip khmer-to-english and english-to-khmer as they're already done
-    if page_name in ['khmer-to-english', 'english-to-khmer']:
-        print(f"Skipping {page_name} (already updated)")
-        return
+    # Compare against the existing file so unchanged files keep their mtime (and the Next.js build cache)
+    if path.exists():
+        if content_hash(path.read_bytes()) == content_hash(data):
+            return 'unchanged'
+        status = 'changed'
+    else:
+        status = 'created'
+    
+    if not check:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+    
+    return status
+
+def update_translation_page(page_path, check=False, generated_hash=None, force=False):
+    """
+    Render a single translation page in memory and write it only if the content changed.
+    An existing page is only overwritten when it is unmodified generator output, i.e. its hash equals
+    generated_hash (what the generator last wrote); otherwise it was edited by hand and is reported as
+    'modified' and left untouched, unless force is set.
+    Returns (status, render_ms, digest) where status is 'created', 'changed', 'unchanged', 'modified'
+    or 'skipped' and digest is the content hash of the generated page (None when skipped).
+    With check=True nothing is written.
+    """
+    page_path = Path(page_path)
+    page_name = page_path.parent.name
+    
+    if page_name in SKIP_PAGES:
+        return 'skipped', 0.0, None
     
     # Parse the page name to get source and target languages
-    if '-to-' in page_name:
-        source_lang, target_lang = page_name.split('-to-')
-        
-        # Generate new content
-        new_content = generate_page_content(source_lang, target_lang, page_name)
-        
-        # Write the new content
-        with open(page_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-        
-        print(f"Updated {page_name}")
-
-def main():
+    if '-to-' not in page_name:
+        return 'skipped', 0.0, None
+    
+    source_lang, target_lang = page_name.split('-to-')
+    
+    # Generate new content
+    start = time.perf_counter()
+    new_content = generate_page_content(source_lang, target_lang, page_name).encode('utf-8')
+    render_ms = (time.perf_counter() - start) * 1000
+    digest = content_hash(new_content)
+    
+    on_disk = file_hash(page_path)
+    if on_disk not in (None, digest, generated_hash) and not force:
+        return 'modified', render_ms, digest
+    
+    return write_if_changed(page_path, new_content, check), render_ms, digest
+
+def file_hash(path):
+    """Content hash of a file on disk, None if it does not exist"""
+    path = Path(path)
+    return content_hash(path.read_bytes()) if path.exists() else None
+
+def page_data(source_lang, target_lang):
+    """Precomputed per-direction data for manifest mode (same texts as the per-file page)"""
+    context = page_context(source_lang, target_lang)
+    to_english = target_lang == 'english'
+    faqs = (FAQ_TO_ENGLISH if to_english else FAQ_FROM_ENGLISH).render(context)
+    howto_steps = (HOWTO_TO_ENGLISH if to_english else HOWTO_FROM_ENGLISH).render(context)
+    
+    direction = context['direction']
+    direction_lower = context['direction_lower']
+    source_display = context['source_display']
+    target_display = context['target_display']
+    summary = (f"Translate {source_display} to {target_display} instantly with our AI-powered translator. "
+               f"Convert {source_display} text to {target_display} with high accuracy.")
+    
+    data = {
+        'direction': direction,
+        'directionLower': direction_lower,
+        'sourceLang': source_lang,
+        'targetLang': target_lang,
+        'sourceName': context['source_name'],
+        'sourceDisplay': source_display,
+        'targetDisplay': target_display,
+        'languageCode': context['language_code'],
+        'pairTargetName': context['pair_target_name'],
+        'title': f"{direction} Translation - Free AI Translator | LoReTrans",
+        'socialTitle': f"{direction} Translation - Free AI Translator",
+        'description': f"{summary} Support for long texts up to 5,000 characters.",
+        'socialDescription': f"{summary} Support for long texts and queue processing.",
+        'keywords': [f"{direction} translation", direction_lower, f"{direction_lower} translator",
+                     f"free {direction_lower} translation", f"{source_lang} {target_lang} converter"],
+        'faqs': [{'question': q, 'answer': a} for q, a in FAQ_ENTRY.findall(faqs)],
+        'howToSteps': [{'name': n, 'text': t} for n, t in HOWTO_ENTRY.findall(howto_steps)],
+    }
+    data['jsonLd'] = [serialize_json_ld(document) for document in json_ld_documents(data)]
+    return data
+
+def json_ld_documents(data):
+    """WebApplication, FAQPage, HowTo and BreadcrumbList structured data; LOCALE_SLOT marks the locale"""
+    direction = data['direction']
+    page_url = f"https://loretrans.com/{LOCALE_SLOT}/{data['directionLower']}"
+    organization = {"@type": "Organization", "name": "LoReTrans", "url": "https://loretrans.com"}
+    return [
+        {
+            "@context": "https://schema.org",
+            "@type": "WebApplication",
+            "name": f"{direction} Translator - LoReTrans",
+            "alternateName": f"{direction} AI Translator",
+            "description": f"Free AI-powered {direction} translation tool with queue processing, translation history, "
+                           "and support for long texts up to 5,000 characters.",
+            "url": page_url,
+            "applicationCategory": "UtilitiesApplication",
+            "operatingSystem": "Web Browser",
+            "browserRequirements": "Requires JavaScript",
+            "softwareVersion": "2.0",
+            "datePublished": "2025-01-01",
+            "dateModified": "2025-08-01",
+            "inLanguage": ["en", data['languageCode']],
+            "isAccessibleForFree": True,
+            "creator": {**organization, "logo": "https://loretrans.com/logo.png"},
+            "provider": organization,
+            "offers": {
+                "@type": "Offer",
+                "price": "0",
+                "priceCurrency": "USD",
+                "availability": "https://schema.org/InStock",
+                "validFrom": "2025-01-01"
+            },
+            "featureList": [
+                f"AI-powered {direction} translation",
+                "Support for texts up to 5,000 characters",
+                "Queue processing for long texts",
+                "Translation history tracking",
+                f"Bidirectional {data['sourceName']}-{data['pairTargetName']} translation",
+                "Free unlimited usage"
+            ],
+            "aggregateRating": {
+                "@type": "AggregateRating",
+                "ratingValue": "4.8",
+                "ratingCount": "1250",
+                "bestRating": "5",
+                "worstRating": "1"
+            }
+        },
+        {
+            "@context": "https://schema.org",
+            "@type": "FAQPage",
+            "mainEntity": [
+                {"@type": "Question", "name": item['question'],
+                 "acceptedAnswer": {"@type": "Answer", "text": item['answer']}}
+                for item in data['faqs']
+            ]
+        },
+        {
+            "@context": "https://schema.org",
+            "@type": "HowTo",
+            "name": f"How to translate {data['sourceDisplay']} to {data['targetDisplay']}",
+            "description": f"Step-by-step guide to translate {data['sourceDisplay']} text to "
+                           f"{data['targetDisplay']} using our AI translator",
+            "step": [
+                {"@type": "HowToStep", "position": index + 1, "name": step['name'], "text": step['text']}
+                for index, step in enumerate(data['howToSteps'])
+            ]
+        },
+        {
+            "@context": "https://schema.org",
+            "@type": "BreadcrumbList",
+            "itemListElement": [
+                {"@type": "ListItem", "position": 1, "name": "Home",
+                 "item": f"https://loretrans.com/{LOCALE_SLOT}"},
+                {"@type": "ListItem", "position": 2, "name": "Translation Tools",
+                 "item": f"https://loretrans.com/{LOCALE_SLOT}/text-translate"},
+                {"@type": "ListItem", "position": 3, "name": direction, "item": page_url}
+            ]
+        },
+    ]
+
+def serialize_json_ld(document):
+    """
+    Minified JSON-LD split at the locale slot, safe to inline in a <script> tag;
+    the page joins the parts with the (escaped) locale at render time
+    """
+    serialized = json.dumps(document, ensure_ascii=False, separators=(',', ':'))
+    for char, escaped in JSON_LD_ESCAPES.items():
+        serialized = serialized.replace(char, escaped)
+    return serialized.split(json.dumps(LOCALE_SLOT)[1:-1])
+
+def build_manifest(matrix):
+    """direction -> page data for every generated (non hand-maintained) direction"""
+    return {f"{source}-to-{target}": {key: value for key, value in page_data(source, target).items()
+                                      if key not in JSON_LD_ONLY_FIELDS}
+            for source, target in matrix if f"{source}-to-{target}" not in SKIP_PAGES}
+
+def gzip_size(data):
+    return len(gzip.compress(data, compresslevel=9))
+
+def measure_compile_ms(root, modules):
+    """
+    name -> median milliseconds to transpile (or, for .json, parse) each module, or None when node or
+    the frontend's typescript package is not available (run npm install in the frontend first)
+    """
+    payload = json.dumps({'modules': modules, 'runs': COMPILE_TIMING_RUNS}, ensure_ascii=False)
+    try:
+        result = subprocess.run(['node', '-e', COMPILE_TIMING_SCRIPT, str(root)], input=payload,
+                                capture_output=True, text=True, encoding='utf-8', check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return json.loads(result.stdout)
+
+def generate_manifest(args, output_dir, matrix):
+    """
+    Manifest mode: write one minified JSON manifest plus a single [direction] route template,
+    optionally remove the per-direction page.tsx files it replaces, and report the size delta.
+    Returns (number of out-of-date outputs, direction -> hash of the content that serves it).
+    """
+    manifest = build_manifest(matrix)
+    manifest_bytes = json.dumps(manifest, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    route_bytes = MANIFEST_ROUTE_PAGE.render({'manifest_import': MANIFEST_IMPORT}).encode('utf-8')
+    
+    manifest_path = args.root / MANIFEST_FILE
+    route_path = output_dir / DYNAMIC_ROUTE_DIR / 'page.tsx'
+    outdated = 0
+    for path, data in ((manifest_path, manifest_bytes), (route_path, route_bytes)):
+        status = write_if_changed(path, data, args.check)
+        if status != 'unchanged':
+            outdated += 1
+        print(f"  {('out of date' if args.check and status != 'unchanged' else status):<10} {path}")
+    
+    # Per-file output for the same directions, for the size comparison and for pruning
+    per_file = {direction: generate_page_content(*direction.split('-to-'), direction).encode('utf-8')
+                for direction in manifest}
+    
+    # Static page directories take precedence over the dynamic route; only generated,
+    # unmodified page.tsx files are removed so hand edits are never lost
+    shadowed = []
+    removed = 0
+    for direction, content in per_file.items():
+        page_path = output_dir / direction / 'page.tsx'
+        if not page_path.exists():
+            continue
+        if args.prune and not args.check and content_hash(page_path.read_bytes()) == content_hash(content):
+            page_path.unlink()
+            removed += 1
+        else:
+            shadowed.append(direction)
+    
+    if removed:
+        print(f"Removed {removed} generated page.tsx files now served by {DYNAMIC_ROUTE_DIR}/page.tsx")
+    if shadowed:
+        print(f"{len(shadowed)} directions still have their own page.tsx and shadow the dynamic route"
+              f"{'' if args.prune else ' (use --prune to remove unmodified generated pages)'}: "
+              f"{', '.join(shadowed[:5])}{' ...' if len(shadowed) > 5 else ''}")
+    
+    # Build-size comparison: every page.tsx is a separate route module that Next.js compiles and bundles
+    per_file_bytes = sum(len(content) for content in per_file.values())
+    per_file_gzip = sum(gzip_size(content) for content in per_file.values())
+    manifest_total = len(manifest_bytes) + len(route_bytes)
+    manifest_gzip = gzip_size(manifest_bytes) + gzip_size(route_bytes)
+    
+    print(f"Per-file pages: {len(per_file)} route modules, {per_file_bytes / 1024:.1f} KB source, "
+          f"{per_file_gzip / 1024:.1f} KB gzipped")
+    print(f"Manifest mode:  1 route module + 1 JSON module, {manifest_total / 1024:.1f} KB source, "
+          f"{manifest_gzip / 1024:.1f} KB gzipped")
+    print(f"Delta: {1 - len(per_file)} route modules to compile, "
+          f"{(manifest_total - per_file_bytes) / 1024:+.1f} KB source ({manifest_total / per_file_bytes - 1:+.0%}), "
+          f"{(manifest_gzip - per_file_gzip) / 1024:+.1f} KB gzipped")
+    
+    # Compile-time comparison; without node/typescript the module count and source size above are the proxy
+    if not args.no_compile_timing:
+        timings = measure_compile_ms(args.root, {
+            **{f"{direction}/page.tsx": content.decode('utf-8') for direction, content in per_file.items()},
+            f"{DYNAMIC_ROUTE_DIR}/page.tsx": route_bytes.decode('utf-8'),
+            MANIFEST_FILE.name: manifest_bytes.decode('utf-8'),
+        })
+        if timings is None:
+            print("Compile time: not measured (needs node and typescript in the frontend's node_modules); "
+                  "compile work scales with the route module count and source size above")
+        else:
+            per_file_ms = sum(timings[f"{direction}/page.tsx"] for direction in per_file)
+            manifest_ms = timings[f"{DYNAMIC_ROUTE_DIR}/page.tsx"] + timings[MANIFEST_FILE.name]
+            print(f"Compile time (TypeScript transpile + JSON parse, median of {COMPILE_TIMING_RUNS}): "
+                  f"per-file {per_file_ms:.1f} ms, manifest {manifest_ms:.1f} ms, "
+                  f"delta {manifest_ms - per_file_ms:+.1f} ms"
+                  f"{f' ({manifest_ms / per_file_ms - 1:+.0%})' if per_file_ms else ''}")
+    
+    # A remaining page.tsx serves its direction; otherwise the manifest entry does
+    hashes = {}
+    for source, target in matrix:
+        direction = f"{source}-to-{target}"
+        page_path = output_dir / direction / 'page.tsx'
+        if page_path.exists():
+            hashes[direction] = file_hash(page_path)
+        elif direction in manifest:
+            entry = json.dumps(manifest[direction], ensure_ascii=False, separators=(',', ':'))
+            hashes[direction] = content_hash(entry.encode('utf-8'))
+    
+    return outdated, hashes
+
+def read_locales(root):
+    """Interface locales from lib/navigation.ts (the list the middleware routes)"""
+    source = (root / LOCALES_SOURCE).read_text(encoding='utf-8')
+    match = LOCALES_PATTERN.search(source)
+    if not match:
+        raise ValueError(f"Could not find 'export const locales = [...]' in {root / LOCALES_SOURCE}")
+    return re.findall(r"['\"]([^'\"]+)['\"]", match.group(1))
+
+def update_sitemap_state(state, hashes, today):
+    """
+    Carry lastmod forward for directions whose content hash is unchanged; new or changed
+    directions get today's date. Directions no longer generated are dropped.
+    Returns (new_state, number of directions whose lastmod moved).
+    """
+    new_state = {}
+    touched = 0
+    for direction, digest in sorted(hashes.items()):
+        previous = state.get(direction)
+        if previous and previous.get('hash') == digest:
+            new_state[direction] = previous
+        else:
+            new_state[direction] = {'hash': digest, 'lastmod': today}
+            touched += 1
+    return new_state, touched
+
+def sitemap_url(direction, locale, locales, lastmod):
+    """One <url> element with hreflang alternates for every locale plus x-default"""
+    alternates = [(locale_code, f"{SITE_URL}/{locale_code}/{direction}") for locale_code in locales]
+    alternates.append(('x-default', f"{SITE_URL}/{DEFAULT_LOCALE}/{direction}"))
+    links = ''.join(f'<xhtml:link rel="alternate" hreflang={quoteattr(hreflang)} href={quoteattr(href)}/>'
+                    for hreflang, href in alternates)
+    return (f"<url><loc>{escape(f'{SITE_URL}/{locale}/{direction}')}</loc>"
+            f"<lastmod>{lastmod}</lastmod>{links}</url>\n")
+
+def shard_urls(urls, max_urls=SITEMAP_MAX_URLS, max_bytes=SITEMAP_MAX_BYTES):
+    """Split (lastmod, xml) pairs into shards that stay under the URL-count and uncompressed-size limits"""
+    overhead = len(SITEMAP_URLSET_OPEN.encode('utf-8')) + len(SITEMAP_URLSET_CLOSE.encode('utf-8'))
+    shards = []
+    current = []
+    size = overhead
+    for lastmod, xml in urls:
+        length = len(xml.encode('utf-8'))
+        if current and (len(current) >= max_urls or size + length > max_bytes):
+            shards.append(current)
+            current = []
+            size = overhead
+        current.append((lastmod, xml))
+        size += length
+    if current:
+        shards.append(current)
+    return shards
+
+def generate_sitemap(args, hashes):
+    """
+    Write gzipped sitemap shards with hreflang alternates for every generated direction and locale,
+    plus a sitemap index. lastmod comes from the content hashes, so unchanged pages keep their date
+    and unchanged shards keep their bytes. Returns the number of out-of-date outputs.
+    """
+    locales = read_locales(args.root)
+    state_path = args.root / SITEMAP_STATE_FILE
+    state = json.loads(state_path.read_text(encoding='utf-8')) if state_path.exists() else {}
+    # With --languages only part of the matrix is regenerated; the other directions keep their entries
+    directions = {f"{source}-to-{target}" for source, target in page_matrix()}
+    carried = {direction: entry for direction, entry in state.items()
+               if direction in directions and direction not in hashes}
+    state, touched = update_sitemap_state(state, {d: h for d, h in hashes.items() if h},
+                                          time.strftime('%Y-%m-%d', time.gmtime()))
+    state = dict(sorted({**state, **carried}.items()))
+    
+    urls = [(entry['lastmod'], sitemap_url(direction, locale, locales, entry['lastmod']))
+            for direction, entry in state.items() for locale in locales]
+    shards = shard_urls(urls, args.sitemap_max_urls)
+    
+    sitemap_dir = args.root / SITEMAP_DIR
+    outputs = []
+    index_entries = []
+    for number, shard in enumerate(shards, 1):
+        name = SITEMAP_SHARD.format(number)
+        xml = SITEMAP_URLSET_OPEN + ''.join(xml for _, xml in shard) + SITEMAP_URLSET_CLOSE
+        # mtime=0 keeps the gzip bytes identical when the XML is, so unchanged shards are not rewritten
+        outputs.append((sitemap_dir / name, gzip.compress(xml.encode('utf-8'), compresslevel=9, mtime=0)))
+        index_entries.append(f"<sitemap><loc>{escape(f'{SITE_URL}/{SITEMAP_DIR.name}/{name}')}</loc>"
+                             f"<lastmod>{max(lastmod for lastmod, _ in shard)}</lastmod></sitemap>\n")
+    index = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+             '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+             + ''.join(index_entries) + '</sitemapindex>\n')
+    outputs.append((sitemap_dir / SITEMAP_INDEX, index.encode('utf-8')))
+    outputs.append((state_path, (json.dumps(state, ensure_ascii=False, indent=2) + '\n').encode('utf-8')))
+    
+    outdated = 0
+    for path, data in outputs:
+        status = write_if_changed(path, data, args.check)
+        if status != 'unchanged':
+            outdated += 1
+        print(f"  {('out of date' if args.check and status != 'unchanged' else status):<10} {path}")
+    
+    # Shards left over from a previous, larger run
+    current = {path for path, _ in outputs}
+    for path in sorted(sitemap_dir.glob(SITEMAP_SHARD_GLOB)):
+        if path not in current:
+            outdated += 1
+            if not args.check:
+                path.unlink()
+            print(f"  {('out of date' if args.check else 'removed'):<10} {path}")
+    
+    print(f"Sitemap: {len(urls)} URLs ({len(state)} directions x {len(locales)} locales) in {len(shards)} shard(s), "
+          f"lastmod updated for {touched} direction(s)")
+    return outdated
+
+def _update_page_task(task):
+    """
+    Process pool entry point: (page_path, check, generated_hash, force) -> (page_name, status, render_ms, digest)
+    """
+    page_path, check, generated_hash, force = task
+    status, render_ms, digest = update_translation_page(page_path, check, generated_hash, force)
+    return Path(page_path).parent.name, status, render_ms, digest
+
+def update_pages_state(state, results, directions):
+    """
+    New direction -> generated-hash record: pages the generator wrote or confirmed get the hash of the
+    current output; hand-edited pages keep their previous entry. Directions outside this run are carried.
+    """
+    new_state = {direction: digest for direction, digest in state.items() if direction not in directions}
+    for page_name, status, _, digest in results:
+        if status in ('created', 'changed', 'unchanged'):
+            new_state[page_name] = digest
+        elif status == 'modified' and page_name in state:
+            new_state[page_name] = state[page_name]
+    return dict(sorted(new_state.items()))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Regenerate all *-to-*/page.tsx translation pages")
+    parser.add_argument('--root', type=Path, default=DEFAULT_ROOT,
+                        help=f"Frontend root directory (default: {DEFAULT_ROOT})")
+    parser.add_argument('--output', type=Path, default=None,
+                        help="Directory that holds the <source>-to-<target>/ page directories "
+                             "(default: <root>/app/[locale])")
+    parser.add_argument('--languages', nargs='+', choices=sorted(language_map), metavar='LANG',
+                        help="Only generate pages for these languages (default: every language in language_map)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes (default: CPU count, 1 renders in-process)")
+    parser.add_argument('--mode', choices=['pages', 'manifest'], default='pages',
+                        help="pages: one page.tsx per direction; manifest: one JSON manifest plus a single "
+                             f"{DYNAMIC_ROUTE_DIR}/page.tsx route (default: pages)")
+    parser.add_argument('--prune', action='store_true',
+                        help="Manifest mode: delete per-direction page.tsx files that are unmodified generator output")
+    parser.add_argument('--check', action='store_true',
+                        help="Do not write anything; exit with status 1 if any page is out of date")
+    parser.add_argument('--force', action='store_true',
+                        help="Pages mode: also overwrite page.tsx files that were edited by hand")
+    parser.add_argument('--no-compile-timing', action='store_true',
+                        help="Manifest mode: skip timing the TypeScript transpile of both layouts (uses node)")
+    parser.add_argument('--no-sitemap', action='store_true',
+                        help=f"Do not update the translation page sitemap shards in <root>/{SITEMAP_DIR}")
+    parser.add_argument('--sitemap-max-urls', type=int, default=SITEMAP_MAX_URLS,
+                        help=f"Maximum URLs per sitemap shard (default: {SITEMAP_MAX_URLS}, the protocol limit)")
+    return parser.parse_args()
+
+def main(args):
     """Main function to update all translation pages"""
-    # Find all translation page files - escape the brackets in the path
-    pattern = "/home/hwt/translation-low-source/frontend/app/[[]locale]/*-to-*/page.tsx"
-    page_files = glob.glob(pattern)
+    output_dir = args.output or args.root / PAGES_DIR
+    matrix = page_matrix(args.languages)
+    
+    if args.mode == 'manifest':
+        print(f"{'Checking' if args.check else 'Generating'} translation page manifest for {len(matrix)} directions")
+        outdated, hashes = generate_manifest(args, output_dir, matrix)
+        if not args.no_sitemap:
+            outdated += generate_sitemap(args, hashes)
+        if args.check and outdated:
+            print(f"{outdated} manifest outputs are out of date, run update_all_translation_pages.py --mode manifest")
+            return 1
+        return 0
+    
+    pages_state_path = args.root / PAGES_STATE_FILE
+    pages_state = json.loads(pages_state_path.read_text(encoding='utf-8')) if pages_state_path.exists() else {}
+    tasks = [(str(output_dir / f"{source}-to-{target}" / 'page.tsx'), args.check,
+              pages_state.get(f"{source}-to-{target}"), args.force)
+             for source, target in matrix]
+    
+    print(f"{'Checking' if args.check else 'Generating'} {len(tasks)} translation pages in {output_dir}")
+    
+    started = time.perf_counter()
+    if args.workers > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            results = list(pool.map(_update_page_task, tasks, chunksize=max(1, len(tasks) // (args.workers * 4))))
+    else:
+        results = [_update_page_task(task) for task in tasks]
+    elapsed = time.perf_counter() - started
+    
+    counts = Counter()
+    hashes = {}
+    for page_name, status, render_ms, digest in results:
+        # Hand-maintained pages are listed in the sitemap with the hash of the file on disk
+        hand_edited = status in ('skipped', 'modified')
+        hashes[page_name] = file_hash(output_dir / page_name / 'page.tsx') if hand_edited else digest
+        counts[status] += 1
+        if status == 'skipped':
+            print(f"  skipped    {page_name}")
+        elif status == 'modified':
+            print(f"  modified   {page_name:<28} edited by hand, left untouched (--force overwrites)")
+        else:
+            label = 'out of date' if args.check and status != 'unchanged' else status
+            print(f"  {label:<10} {page_name:<28} {render_ms:7.2f} ms")
+    
+    rendered = [render_ms for _, status, render_ms, _ in results if status != 'skipped']
+    print(f"Created: {counts['created']}, changed: {counts['changed']}, unchanged: {counts['unchanged']}, "
+          f"edited by hand: {counts['modified']}, skipped: {counts['skipped']}")
+    
+    new_pages_state = update_pages_state(pages_state, results, {page_name for page_name, *_ in results})
+    pages_state_status = write_if_changed(
+        pages_state_path, (json.dumps(new_pages_state, indent=2) + '\n').encode('utf-8'), args.check)
+    if pages_state_status != 'unchanged':
+        print(f"  {('out of date' if args.check else pages_state_status):<10} {pages_state_path}")
+    if rendered:
+        print(f"Rendered {len(rendered)} pages in {sum(rendered):.1f} ms "
+              f"(avg {sum(rendered) / len(rendered):.2f} ms, max {max(rendered):.2f} ms), "
+              f"wall time {elapsed * 1000:.0f} ms with {args.workers} worker(s)")
     
-    print(f"Found {len(page_files)} translation pages to update")
+    sitemap_outdated = 0 if args.no_sitemap else generate_sitemap(args, hashes)
     
-    for page_file in sorted(page_files):
-        try:
-            update_translation_page(page_file)
-        except Exception as e:
-            print(f"Error updating {page_file}: {e}")
+    if args.check:
+        outdated = counts['created'] + counts['changed'] + sitemap_outdated + (pages_state_status != 'unchanged')
+        if outdated:
+            print(f"{outdated} translation pages or sitemap files are out of date, run update_all_translation_pages.py")
+            return 1
+        print("All translation pages are up to date")
+        return 0
     
     print("All translation pages updated!")
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main(parse_args()))